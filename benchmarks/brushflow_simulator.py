@@ -0,0 +1,282 @@
+import argparse
+import json
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.log import logger
+from app.plugins.brushflow import BrushConfig, BrushFlow
+from app.plugins.brushflow.evaluation_context import BrushEvaluationContext
+from app.schemas import ServiceInfo, TorrentInfo
+
+
+class SimulatedDownloader:
+    """
+    模拟下载器，基于录制的qBittorrent种子快照应答刷流插件的查询
+    """
+
+    DOWNLOADING_STATES = {
+        "downloading", "metaDL", "forcedMetaDL", "forcedDL", "stalledDL",
+        "checkingDL", "queuedDL", "pausedDL", "stoppedDL"
+    }
+
+    def __init__(self):
+        self.torrents: List[dict] = []
+        # 本轮模拟新增、尚未出现在快照中的种子
+        self.added_hashes: List[str] = []
+
+    @staticmethod
+    def is_inactive() -> bool:
+        return False
+
+    def get_torrents(self, ids: List[str] = None, **kwargs) -> tuple:
+        if ids is None:
+            return self.torrents, False
+        ids = set(ids)
+        return [torrent for torrent in self.torrents if torrent.get("hash") in ids], False
+
+    def get_completed_torrents(self, ids: List[str] = None, **kwargs) -> List[dict]:
+        torrents, _ = self.get_torrents(ids=ids)
+        return [torrent for torrent in torrents if (torrent.get("progress") or 0) >= 1]
+
+    def get_downloading_torrents(self, tags: str = None, **kwargs) -> List[Any]:
+        torrents = [torrent for torrent in self.torrents if torrent.get("state") in self.DOWNLOADING_STATES
+                    and (not tags or tags in [str(tag).strip() for tag in (torrent.get("tags") or "").split(",")])]
+        return torrents + self.added_hashes
+
+
+class SimulatedBrushFlow(BrushFlow):
+    """
+    使用模拟下载器、内存存储的刷流插件，不会访问站点、下载器或发送消息
+    """
+
+    def __init__(self, brush_config: BrushConfig):
+        super().__init__()
+        self._brush_config = brush_config
+        self._data: Dict[str, Any] = {}
+        self._simulated_downloader = SimulatedDownloader()
+        self._simulated_service = ServiceInfo(name="simulator", type="qbittorrent",
+                                              instance=self._simulated_downloader)
+
+    @property
+    def service_info(self) -> Optional[ServiceInfo]:
+        return self._simulated_service
+
+    @property
+    def downloader(self) -> Optional[SimulatedDownloader]:
+        return self._simulated_downloader
+
+    def get_data(self, key: str = None, plugin_id: str = None) -> Any:
+        return self._data.get(key)
+
+    def save_data(self, key: str, value: Any, plugin_id: str = None):
+        self._data[key] = value
+
+    def del_data(self, key: str, plugin_id: str = None):
+        self._data.pop(key, None)
+
+    def post_message(self, *args, **kwargs):
+        pass
+
+
+class BrushSimulator:
+    """
+    刷流规则离线模拟器，回放录制的站点种子列表及下载器快照，输出刷流/删种决策、做种体积变化及各规则耗时
+
+    录制文件格式：
+    {
+        "cycles": [
+            {
+                "time": 1700000000,                     // 录制时间，用于平移发布时间
+                "sites": {"站点名称": [{TorrentInfo}]},  // 当轮各站点浏览到的种子
+                "torrents": [{qBittorrent种子信息}]       // 当轮下载器快照，hash需与任务一致
+            }
+        ]
+    }
+    """
+
+    def __init__(self, config: dict, scale: int = 1, shift_pubdate: bool = True):
+        """
+        :param config: 插件配置，与插件配置页保存的配置一致
+        :param scale: 放大倍数，每个种子复制为多个不同的种子，用于压测评估性能
+        :param shift_pubdate: 是否按录制时间平移种子发布时间，使发布时间条件在回放时依旧有效
+        """
+        config = dict(config)
+        config.update({"notify": False, "except_subscribe": False, "delta_sync": False})
+        self._brush_config = BrushConfig(config=config)
+        self._plugin = SimulatedBrushFlow(brush_config=self._brush_config)
+        self._scale = max(scale, 1)
+        self._shift_pubdate = shift_pubdate
+        self._torrent_tasks: Dict[str, dict] = {}
+        # 规则 -> [调用次数, 总耗时]
+        self._timings: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        # 决策 -> 次数
+        self._decisions: Dict[str, int] = defaultdict(int)
+        self._trajectory: List[dict] = []
+
+    def __call(self, rule: str, name: str, **kwargs) -> Any:
+        """
+        调用插件的私有方法并记录耗时
+        """
+        method = getattr(self._plugin, f"_BrushFlow__{name}")
+        start_time = time.perf_counter()
+        try:
+            return method(**kwargs)
+        finally:
+            timing = self._timings[rule]
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start_time
+
+    def __record_decision(self, action: str, reason: Optional[str]):
+        # 去掉原因中的数值，便于按规则汇总
+        reason = re.sub(r"[\d.]+", "N", reason) if reason else "通过"
+        self._decisions[f"{action}：{reason}"] += 1
+
+    def __prepare_torrents(self, site_name: str, torrents: List[dict], cycle_time: Optional[float]) \
+            -> List[TorrentInfo]:
+        """
+        构建TorrentInfo，并按需平移发布时间、放大种子数量
+        """
+        offset = timedelta(seconds=time.time() - cycle_time) if cycle_time and self._shift_pubdate else None
+        result = []
+        for data in torrents:
+            data = dict(data, site_name=site_name)
+            if offset and data.get("pubdate"):
+                try:
+                    pubdate = datetime.strptime(data["pubdate"].replace("T", " ").replace("Z", ""),
+                                                "%Y-%m-%d %H:%M:%S")
+                    data["pubdate"] = (pubdate + offset).strftime("%Y-%m-%d %H:%M:%S")
+                except ValueError:
+                    pass
+            for index in range(self._scale):
+                scaled = dict(data)
+                if index:
+                    scaled["title"] = f"{data.get('title')}#{index}"
+                    scaled["page_url"] = f"{data.get('page_url')}#{index}" if data.get("page_url") else None
+                result.append(TorrentInfo(**scaled))
+        return result
+
+    def __simulate_brush(self, sites: Dict[str, List[dict]], cycle_time: Optional[float]):
+        """
+        模拟刷流，判断每个种子是否会被添加
+        """
+        downloader = self._plugin.downloader
+        torrents_size = self.__call("size", "calculate_seeding_torrents_size", torrent_tasks=self._torrent_tasks)
+        context = BrushEvaluationContext(
+            downloading_count_func=getattr(self._plugin, "_BrushFlow__get_downloading_count"))
+        for site_name, site_torrents in sites.items():
+            torrents = self.__prepare_torrents(site_name=site_name, torrents=site_torrents, cycle_time=cycle_time)
+            torrents.sort(key=lambda x: x.pubdate or '', reverse=True)
+            for torrent in torrents:
+                passed, reason = self.__call("pre_conditions", "evaluate_pre_conditions_for_brush",
+                                             include_network_conditions=False, context=context)
+                if not passed:
+                    self.__record_decision("停止刷流", reason)
+                    return
+                passed, reason = self.__call("size_condition", "evaluate_size_condition_for_brush",
+                                             torrents_size=torrents_size, add_torrent_size=torrent.size)
+                if passed:
+                    passed, reason = self.__call("brush_conditions", "evaluate_conditions_for_brush",
+                                                 torrent=torrent, torrent_tasks=self._torrent_tasks,
+                                                 context=context)
+                self.__record_decision("跳过种子" if not passed else "添加种子", reason)
+                if not passed:
+                    continue
+                torrent_hash = f"sim{len(self._torrent_tasks):037x}"
+                self._torrent_tasks[torrent_hash] = {
+                    "site_name": site_name,
+                    "title": torrent.title,
+                    "size": torrent.size,
+                    "page_url": torrent.page_url,
+                    "hit_and_run": torrent.hit_and_run,
+                    "freedate": torrent.freedate,
+                    "deleted": False,
+                    "time": time.time()
+                }
+                downloader.added_hashes.append(torrent_hash)
+                context.add_downloading()
+                torrents_size += torrent.size
+
+    def __simulate_delete(self, torrents: List[dict]):
+        """
+        模拟删种，基于下载器快照评估删除规则
+        """
+        downloader = self._plugin.downloader
+        downloader.torrents = torrents
+        snapshot_hashes = {torrent.get("hash") for torrent in torrents}
+        downloader.added_hashes = [torrent_hash for torrent_hash in downloader.added_hashes
+                                   if torrent_hash not in snapshot_hashes]
+
+        check_torrents = [torrent for torrent in torrents if torrent.get("hash") in self._torrent_tasks]
+        torrent_info_map = self.__call("snapshot", "build_torrent_info_map", torrents=check_torrents)
+        self.__call("snapshot", "update_torrent_tasks_state", torrent_info_map=torrent_info_map,
+                    torrent_tasks=self._torrent_tasks)
+        check_hashes = [torrent_hash for torrent_hash in torrent_info_map
+                        if not self._torrent_tasks[torrent_hash].get("deleted")]
+        if self._brush_config.proxy_delete and self._brush_config.delete_size_range:
+            delete_hashes = self.__call("proxy_delete", "delete_torrent_for_proxy", torrent_hashes=check_hashes,
+                                        torrent_info_map=torrent_info_map, torrent_tasks=self._torrent_tasks)
+        else:
+            delete_hashes = self.__call("delete_conditions", "delete_torrent_for_evaluate_conditions",
+                                        torrent_hashes=check_hashes, torrent_info_map=torrent_info_map,
+                                        torrent_tasks=self._torrent_tasks)
+        for torrent_hash in delete_hashes or []:
+            self._torrent_tasks[torrent_hash]["deleted"] = True
+            self._torrent_tasks[torrent_hash]["deleted_time"] = time.time()
+        self._decisions["删除种子"] += len(delete_hashes or [])
+        self._decisions["保留种子"] += len(check_hashes) - len(delete_hashes or [])
+
+    def run(self, recording: dict) -> dict:
+        """
+        回放录制数据，返回模拟报告
+        """
+        for index, cycle in enumerate(recording.get("cycles") or []):
+            self.__simulate_delete(torrents=cycle.get("torrents") or [])
+            self.__simulate_brush(sites=cycle.get("sites") or {}, cycle_time=cycle.get("time"))
+            seeding_size = self.__call("size", "calculate_seeding_torrents_size", torrent_tasks=self._torrent_tasks)
+            self._trajectory.append({
+                "cycle": index,
+                "tasks": len(self._torrent_tasks),
+                "seeding_size": seeding_size
+            })
+            logger.info(f"模拟第 {index + 1} 轮完成，任务数 {len(self._torrent_tasks)}，"
+                        f"做种体积 {seeding_size / 1024 ** 3:.1f} GB")
+
+        return {
+            "decisions": dict(sorted(self._decisions.items(), key=lambda item: item[1], reverse=True)),
+            "trajectory": self._trajectory,
+            "timings": {
+                rule: {"calls": calls, "total_ms": round(total * 1000, 3),
+                       "avg_us": round(total / calls * 1000 ** 2, 3) if calls else 0}
+                for rule, (calls, total) in self._timings.items()
+            }
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="站点刷流规则离线模拟器")
+    parser.add_argument("recording", help="录制文件路径")
+    parser.add_argument("--config", required=True, help="插件配置文件路径（JSON）")
+    parser.add_argument("--scale", type=int, default=1, help="种子数量放大倍数")
+    parser.add_argument("--no-shift-pubdate", action="store_true", help="不按录制时间平移种子发布时间")
+    parser.add_argument("--output", help="报告输出路径，默认输出到控制台")
+    args = parser.parse_args()
+
+    with open(args.recording, encoding="utf-8") as f:
+        recording = json.load(f)
+    with open(args.config, encoding="utf-8") as f:
+        config = json.load(f)
+
+    report = BrushSimulator(config=config, scale=args.scale, shift_pubdate=not args.no_shift_pubdate).run(recording)
+    report_text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report_text)
+    else:
+        print(report_text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import random
+import string
+from typing import Any, Dict, List, Set, Tuple
+
+from app.plugins.brushflow.subscribe_matcher import SubscribeTitleMatcher
+
+from timing import best_of, print_report, speedup
+
+# 种子标题常见的片段
+TITLE_PARTS = ["2160p", "1080p", "WEB-DL", "BluRay", "REMUX", "HDR", "DV", "H.265", "x264", "DDP5.1", "Atmos",
+               "AAC", "S01", "S02", "E01", "Complete", "iT", "NF", "AMZN", "DSNP", "HDTV"]
+
+
+def random_word(rng: random.Random, min_length: int = 3, max_length: int = 10) -> str:
+    return "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(min_length, max_length)))
+
+
+def random_cjk(rng: random.Random, min_length: int = 2, max_length: int = 8) -> str:
+    return "".join(chr(rng.randint(0x4e00, 0x9fa5)) for _ in range(rng.randint(min_length, max_length)))
+
+
+def generate_data(titles: int, texts: int, hit_rate: float, seed: int) -> Tuple[Set[str], List[Tuple[str, str]]]:
+    """
+    生成订阅标题（中英文名称及别名）及种子标题/描述，按命中率在部分种子中嵌入订阅标题
+    """
+    rng = random.Random(seed)
+    subscribe_titles: Set[str] = set()
+    while len(subscribe_titles) < titles:
+        if rng.random() < 0.5:
+            subscribe_titles.add(" ".join(random_word(rng) for _ in range(rng.randint(1, 4))))
+        else:
+            subscribe_titles.add(random_cjk(rng))
+    title_list = sorted(subscribe_titles)
+
+    torrents = []
+    for _ in range(texts):
+        name = ".".join(random_word(rng) for _ in range(rng.randint(2, 5)))
+        title = f"{name}.{rng.randint(1990, 2025)}.{'.'.join(rng.sample(TITLE_PARTS, 4))}-{random_word(rng)}"
+        description = f"{random_cjk(rng, 4, 12)} | {random_cjk(rng, 2, 6)} {random_word(rng)}"
+        if rng.random() < hit_rate:
+            if rng.random() < 0.5:
+                title = f"{rng.choice(title_list)} {title}"
+            else:
+                description = f"{description} {rng.choice(title_list)}"
+        torrents.append((title, description))
+    return subscribe_titles, torrents
+
+
+def filter_by_loop(subscribe_titles: Set[str], torrents: List[Tuple[str, str]]) -> List[bool]:
+    """
+    重构前的逐个订阅标题判断，作为结果比对的基准
+    """
+    return [any(subscribe_title in title or subscribe_title in description for subscribe_title in subscribe_titles)
+            for title, description in torrents]
+
+
+def filter_by_matcher(matcher: SubscribeTitleMatcher, torrents: List[Tuple[str, str]]) -> List[bool]:
+    return [matcher.first_match(title, description) is not None for title, description in torrents]
+
+
+def run(titles: int, texts: int, hit_rate: float, repeat: int, seed: int) -> Dict[str, Any]:
+    subscribe_titles, torrents = generate_data(titles=titles, texts=texts, hit_rate=hit_rate, seed=seed)
+
+    build_time, matcher = best_of(lambda: SubscribeTitleMatcher(titles=subscribe_titles), repeat)
+    loop_time, expected = best_of(lambda: filter_by_loop(subscribe_titles, torrents), repeat)
+    matcher_time, actual = best_of(lambda: filter_by_matcher(matcher, torrents), repeat)
+    if actual != expected:
+        raise AssertionError("自动机与逐个判断的匹配结果不一致")
+
+    return {
+        "titles": len(subscribe_titles),
+        "texts": len(torrents),
+        "matched": sum(actual),
+        "build_ms": round(build_time * 1000, 1),
+        "loop_ms": round(loop_time * 1000, 1),
+        "matcher_ms": round(matcher_time * 1000, 1),
+        "speedup": speedup(loop_time, matcher_time)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="订阅标题匹配性能测试")
+    parser.add_argument("--titles", type=int, default=1500, help="订阅标题数量（含别名）")
+    parser.add_argument("--texts", type=int, default=500, help="种子数量")
+    parser.add_argument("--hit-rate", type=float, default=0.1, help="命中订阅的种子比例")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最短耗时")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    report = run(titles=args.titles, texts=args.texts, hit_rate=args.hit_rate, repeat=args.repeat, seed=args.seed)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import json
+import random
+from typing import Any, Dict, List
+
+from app.plugins.brushflow.task_store import BrushTaskStore
+
+from timing import print_report
+
+
+class SimulatedClock:
+    """
+    模拟时钟，每个检查周期前进固定秒数
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingPlugin:
+    """
+    记录写入次数的插件，替代数据库中的插件数据
+    """
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.transactions = 0
+
+    def get_data(self, key: str = None):
+        return self.data.get(key) if key else []
+
+    def save_data(self, key: str, value: Any):
+        self.data[key] = value
+        self.transactions += 1
+
+    def del_data(self, key: str):
+        self.data.pop(key, None)
+        self.transactions += 1
+
+
+class RecordingTaskStore(BrushTaskStore):
+    """
+    批量写入记为一次事务，不访问数据库
+    """
+
+    def _save_batch(self, items: Dict[str, dict], chunk_size: int = 500):
+        self._plugin.data.update(items)
+        self._plugin.transactions += 1
+
+
+def generate_tasks(count: int) -> Dict[str, dict]:
+    """
+    生成刷流任务，字段与插件保存的任务一致
+    """
+    return {
+        f"{index:040x}": {
+            "site": index % 20,
+            "site_name": f"site{index % 20}",
+            "title": f"Some.Torrent.Title.{index}.2024.1080p.WEB-DL.H.265.DDP5.1-GROUP",
+            "size": 1 << 30,
+            "pubdate": "2024-01-01 00:00:00",
+            "description": "某个种子的副标题 | 中字",
+            "page_url": f"https://example.com/details.php?id={index}",
+            "ratio": 0,
+            "downloaded": 0,
+            "uploaded": 0,
+            "seeding_time": 0,
+            "deleted": False,
+            "time": 0
+        } for index in range(count)
+    }
+
+
+def check_cycle(tasks: Dict[str, dict], rng: random.Random, delete_rate: float, interval: int):
+    """
+    模拟一次检查：刷新活动任务的统计字段，并按比例删除任务
+    """
+    for task in tasks.values():
+        if task["deleted"]:
+            continue
+        task["uploaded"] += rng.randint(1, 1 << 20)
+        task["downloaded"] = task["size"]
+        task["seeding_time"] += interval
+        task["ratio"] = task["uploaded"] / task["size"]
+        if rng.random() < delete_rate:
+            task["deleted"] = True
+
+
+def run(tasks: int, cycles: int, interval: int, volatile_interval: int, delete_rate: float,
+        seed: int) -> List[Dict[str, Any]]:
+    # 重构前：每个周期以整个字典保存一次
+    rng = random.Random(seed)
+    blob_tasks = generate_tasks(tasks)
+    blob_rows = []
+    for _ in range(cycles):
+        check_cycle(blob_tasks, rng, delete_rate, interval)
+        blob_rows.append((1, len(json.dumps(blob_tasks, ensure_ascii=False).encode("utf-8"))))
+
+    # 任务存储：仅写入变化的任务，统计字段按间隔延迟写入
+    rng = random.Random(seed)
+    clock = SimulatedClock()
+    plugin = RecordingPlugin()
+    store = RecordingTaskStore(plugin, "torrents", volatile_interval=volatile_interval, clock=clock)
+    store.tasks.update(generate_tasks(tasks))
+    store.flush(force=True)
+    rows = []
+    for cycle in range(cycles):
+        clock.now += interval
+        check_cycle(store.tasks, rng, delete_rate, interval)
+        plugin.transactions = 0
+        written_count, written_bytes = store.flush()
+        blob_count, blob_bytes = blob_rows[cycle]
+        rows.append({
+            "cycle": cycle + 1,
+            "blob_written_count": blob_count,
+            "blob_written_bytes": blob_bytes,
+            "store_written_count": written_count,
+            "store_written_bytes": written_bytes,
+            "store_transactions": plugin.transactions
+        })
+    if store.tasks != blob_tasks:
+        raise AssertionError("任务存储与整体保存的任务数据不一致")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="刷流任务存储：整体保存与按任务增量保存的写入量对比")
+    parser.add_argument("--tasks", type=int, default=3000, help="任务数")
+    parser.add_argument("--cycles", type=int, default=24, help="检查周期数")
+    parser.add_argument("--interval", type=int, default=300, help="检查周期间隔（秒）")
+    parser.add_argument("--volatile-interval", type=int, default=1800, help="统计字段的最短写入间隔（秒）")
+    parser.add_argument("--delete-rate", type=float, default=0.002, help="每个周期活动任务被删除的比例")
+    parser.add_argument("--seed", type=int, default=2024, help="随机种子")
+    args = parser.parse_args()
+
+    rows = run(tasks=args.tasks, cycles=args.cycles, interval=args.interval,
+               volatile_interval=args.volatile_interval, delete_rate=args.delete_rate, seed=args.seed)
+    columns = list(rows[0])
+    print("\t".join(columns))
+    for row in rows:
+        print("\t".join(str(row[column]) for column in columns))
+
+    blob_bytes = sum(row["blob_written_bytes"] for row in rows)
+    store_bytes = sum(row["store_written_bytes"] for row in rows)
+    print_report({
+        "tasks": args.tasks,
+        "cycles": args.cycles,
+        "blob_written_count": sum(row["blob_written_count"] for row in rows),
+        "blob_written_mb": round(blob_bytes / 1024 / 1024, 2),
+        "store_written_count": sum(row["store_written_count"] for row in rows),
+        "store_written_mb": round(store_bytes / 1024 / 1024, 2),
+        "store_transactions": sum(row["store_transactions"] for row in rows),
+        "bytes_ratio": round(blob_bytes / store_bytes, 2) if store_bytes else None
+    })
+
+
+if __name__ == "__main__":
+    main()
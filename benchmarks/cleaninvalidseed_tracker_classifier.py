@@ -0,0 +1,146 @@
+import argparse
+import random
+from typing import Any, Dict, List, Tuple
+
+from app.plugins.cleaninvalidseed.tracker_classifier import TrackerClassifier, get_tracker_domain
+from app.utils.string import StringUtils
+
+from timing import best_of, print_report, speedup
+
+# qB tracker 状态：0 禁用、1 未联系、2 工作中、3 更新中、4 未工作
+ERROR_MSGS = ["torrent not registered with this tracker", "Torrent not registered with this tracker",
+              "unregistered torrent", "Unregistered torrent", "torrent banned"]
+WORKING_MSGS = ["", "success", "Tracker is working"]
+
+
+class SyntheticState:
+
+    def __init__(self, is_paused: bool):
+        self.is_paused = is_paused
+
+
+class SyntheticTorrent:
+    """
+    模拟qB种子，仅包含分类逻辑用到的字段
+    """
+
+    def __init__(self, index: int, trackers: List[dict], is_paused: bool):
+        self.hash = f"{index:040x}"
+        self.name = f"Synthetic.Torrent.{index}.1080p.WEB-DL"
+        self.category = "brush" if index % 7 == 0 else ""
+        self.tags = "站点辅种" if index % 5 == 0 else ""
+        self.trackers = trackers
+        self.state_enum = SyntheticState(is_paused)
+
+
+def generate_torrents(count: int = 20000, sites: int = 60, seed: int = 0) -> List[SyntheticTorrent]:
+    """
+    生成模拟种子：每个种子包含DHT/PeX/LSD三个伪tracker及1~3个站点tracker，
+    部分站点整体不可用，部分种子被站点删除
+    """
+    rng = random.Random(seed)
+    # 同一站点的种子使用相同的 announce 地址（同一passkey）
+    announce_urls = [f"https://tracker{i}.example{i % 9}.org/announce.php?passkey={rng.getrandbits(64):016x}"
+                     for i in range(sites)]
+    # 整站未工作的站点，其种子不能判定为失效
+    down_sites = set(rng.sample(range(sites), max(sites // 10, 1)))
+    pseudo_trackers = [{"url": f"** [{name}] **", "tier": -1, "status": 2, "msg": ""}
+                       for name in ("DHT", "PeX", "LSD")]
+    torrents = []
+    for index in range(count):
+        trackers = list(pseudo_trackers)
+        removed = rng.random() < 0.1
+        for site in rng.sample(range(sites), rng.randint(1, 3)):
+            url = announce_urls[site]
+            if site in down_sites:
+                status, msg = 4, rng.choice(ERROR_MSGS + ["timed out"])
+            elif removed:
+                status, msg = 4, rng.choice(ERROR_MSGS)
+            else:
+                status, msg = rng.choice([2, 2, 2, 3, 1]), rng.choice(WORKING_MSGS)
+            trackers.append({"url": url, "tier": 0, "status": status, "msg": msg})
+        torrents.append(SyntheticTorrent(index=index, trackers=trackers, is_paused=rng.random() < 0.05))
+    return torrents
+
+
+def classify_two_pass(torrents: List[Any], error_msgs: List[str]) -> Tuple[List[Tuple[Any, str, str]], int, List[Any]]:
+    """
+    重构前的两轮遍历实现，作为结果比对的基准
+    """
+    temp_invalid_torrents = []
+    tracker_not_working_torrents = []
+    working_tracker_set = set()
+    for torrent in torrents:
+        is_invalid = True
+        is_tracker_working = False
+        for tracker in torrent.trackers:
+            if tracker.get("tier") == -1:
+                continue
+            tracker_domian = StringUtils.get_url_netloc((tracker.get("url")))[1]
+            if (tracker.get("status") == 2) or (tracker.get("status") == 3):
+                is_tracker_working = True
+            if not ((tracker.get("status") == 4) and (tracker.get("msg") in error_msgs)):
+                is_invalid = False
+                working_tracker_set.add(tracker_domian)
+        if is_invalid:
+            temp_invalid_torrents.append(torrent)
+        elif not is_tracker_working:
+            if not torrent.state_enum.is_paused:
+                tracker_not_working_torrents.append(torrent)
+
+    invalid_torrents = []
+    for torrent in temp_invalid_torrents:
+        for tracker in torrent.trackers:
+            if tracker.get("tier") == -1:
+                continue
+            tracker_domian = StringUtils.get_url_netloc((tracker.get("url")))[1]
+            if tracker_domian in working_tracker_set:
+                invalid_torrents.append((torrent, tracker_domian, tracker.get("msg")))
+                break
+    return invalid_torrents, len(temp_invalid_torrents), tracker_not_working_torrents
+
+
+def summarize(result: Tuple[List[Tuple[Any, str, str]], int, List[Any]]) -> tuple:
+    invalid_torrents, temp_invalid_count, tracker_not_working_torrents = result
+    return ([(torrent.hash, domain, msg) for torrent, domain, msg in invalid_torrents],
+            temp_invalid_count,
+            [torrent.hash for torrent in tracker_not_working_torrents])
+
+
+def run(count: int, sites: int, repeat: int, seed: int) -> Dict[str, Any]:
+    torrents = generate_torrents(count=count, sites=sites, seed=seed)
+    classifier = TrackerClassifier(error_msgs=ERROR_MSGS)
+
+    two_pass_time, expected = best_of(lambda: classify_two_pass(torrents, ERROR_MSGS), repeat)
+    # 每轮清空域名缓存，与插件每次执行时首次解析的开销一致
+    single_pass_time, actual = best_of(lambda: (get_tracker_domain.cache_clear(),
+                                                classifier.classify(torrents))[1], repeat)
+    if summarize(actual) != summarize(expected):
+        raise AssertionError("单次遍历与两轮遍历的分类结果不一致")
+
+    invalid_torrents, temp_invalid_count, tracker_not_working_torrents = actual
+    return {
+        "torrents": count,
+        "invalid": len(invalid_torrents),
+        "temp_invalid": temp_invalid_count,
+        "tracker_not_working": len(tracker_not_working_torrents),
+        "two_pass_ms": round(two_pass_time * 1000, 1),
+        "single_pass_ms": round(single_pass_time * 1000, 1),
+        "speedup": speedup(two_pass_time, single_pass_time)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="失效做种分类性能测试")
+    parser.add_argument("--count", type=int, default=20000, help="模拟种子数量")
+    parser.add_argument("--sites", type=int, default=60, help="模拟站点数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最短耗时")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    report = run(count=args.count, sites=args.sites, repeat=args.repeat, seed=args.seed)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
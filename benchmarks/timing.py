@@ -0,0 +1,31 @@
+import time
+from typing import Any, Callable, Dict, Tuple
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """
+    多次运行取最短耗时
+    :return: (最短耗时（秒）, 最后一次运行的结果)
+    """
+    best, result = None, None
+    for _ in range(max(repeat, 1)):
+        start_time = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def speedup(baseline: float, current: float) -> Any:
+    """
+    计算加速比
+    """
+    return round(baseline / current, 2) if current else None
+
+
+def print_report(report: Dict[str, Any]):
+    """
+    逐行输出测试结果
+    """
+    for key, value in report.items():
+        print(f"{key}: {value}")
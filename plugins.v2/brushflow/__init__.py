@@ -1,9 +1,11 @@
 import base64
+import heapq
 import json
 import random
 import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from typing import Any, List, Dict, Tuple, Optional, Union, Set
 from urllib.parse import urlparse, parse_qs, unquote, parse_qsl, urlencode, urlunparse
@@ -25,6 +27,13 @@ from app.log import logger
 from app.modules.qbittorrent import Qbittorrent
 from app.modules.transmission import Transmission
 from app.plugins import _PluginBase
+from app.plugins.brushflow.bandwidth_sampler import BandwidthSampler
+from app.plugins.brushflow.evaluation_context import BrushEvaluationContext, parse_pubdate
+from app.plugins.brushflow.subscribe_matcher import SubscribeTitleMatcher
+from app.plugins.brushflow.task_index import BrushTaskIndex
+from app.plugins.brushflow.task_store import BrushTaskStore
+from app.plugins.brushflow.torrent_fetcher import StageMetrics, TorrentFetcher
+from app.plugins.brushflow.torrent_mirror import TorrentStateMirror
 from app.schemas import NotificationType, TorrentInfo, MediaType, ServiceInfo
 from app.schemas.types import EventType
 from app.utils.http import RequestUtils
@@ -79,6 +88,7 @@ class BrushConfig:
         self.qb_category = config.get("qb_category")
         self.site_hr_active = config.get("site_hr_active", False)
         self.site_skip_tips = config.get("site_skip_tips", False)
+        self.delta_sync = config.get("delta_sync", False)
 
         self.brush_tag = "刷流"
         # 站点独立配置
@@ -259,7 +269,7 @@ class BrushFlow(_PluginBase):
     # 插件图标
     plugin_icon = "brush.jpg"
     # 插件版本
-    plugin_version = "4.3.3"
+    plugin_version = "4.3.18"
     # 插件作者
     plugin_author = "jxxghp,InfinityPacer"
     # 作者主页
@@ -277,15 +287,43 @@ class BrushFlow(_PluginBase):
     _task_brush_enable = False
     # 订阅缓存信息
     _subscribe_infos = None
+    # 订阅标题匹配器
+    _subscribe_matcher: Optional[SubscribeTitleMatcher] = None
     # Brush定时
     _brush_interval = 10
     # Check定时
     _check_interval = 5
+    # 并发获取站点种子的最大线程数
+    _browse_workers = 5
+    # 单个站点获取种子的超时时间（秒）
+    _browse_timeout = 120
+    # 并发获取种子文件的最大线程数
+    _download_workers = 4
+    # 同一站点两次获取种子文件的最小间隔（秒）
+    _download_interval = 0.5
     # 退出事件
     _event = threading.Event()
     _scheduler = None
     # tabs
     _tabs = None
+    # 刷流任务存储
+    _torrent_store: BrushTaskStore = None
+    # 未纳入刷流管理的任务存储
+    _unmanaged_store: BrushTaskStore = None
+    # 已归档的任务存储
+    _archived_store: BrushTaskStore = None
+    # 带宽采样器
+    _bandwidth_sampler: Optional[BandwidthSampler] = None
+    # 下载器种子状态镜像
+    _torrent_mirror: Optional[TorrentStateMirror] = None
+    # 种子文件获取器
+    _torrent_fetcher: Optional[TorrentFetcher] = None
+    # 刷流任务排序索引
+    _task_index: Optional[BrushTaskIndex] = None
+    # 详情页表格数据缓存 (数据版本, 表格数据)
+    _page_items_cache: Optional[Tuple[int, List[dict]]] = None
+    # 归档任务汇总数据缓存 (数据版本, 汇总数据)
+    _archived_statistic_cache: Optional[Tuple[int, Dict[str, int]]] = None
 
     # endregion
 
@@ -293,6 +331,22 @@ class BrushFlow(_PluginBase):
 
         self._task_brush_enable = False
 
+        # 重新加载配置前写入延迟保存的统计数据
+        for store in (self._torrent_store, self._unmanaged_store, self._archived_store):
+            if store:
+                store.flush(force=True)
+        self._torrent_store = BrushTaskStore(plugin=self, namespace="torrents")
+        self._unmanaged_store = BrushTaskStore(plugin=self, namespace="unmanaged")
+        self._archived_store = BrushTaskStore(plugin=self, namespace="archived")
+        self._torrent_mirror = TorrentStateMirror()
+        if self._torrent_fetcher:
+            self._torrent_fetcher.close()
+        self._torrent_fetcher = TorrentFetcher(max_workers=self._download_workers,
+                                               site_interval=self._download_interval)
+        self._task_index = BrushTaskIndex(store=self._torrent_store)
+        self._page_items_cache = None
+        self._archived_statistic_cache = None
+
         if not config:
             logger.info("站点刷流任务出错，无法获取插件配置")
             return False
@@ -350,6 +404,11 @@ class BrushFlow(_PluginBase):
         if not self.service_info:
             return
 
+        # 配置了带宽限制时，启动后台带宽采样
+        if brush_config.enabled and (brush_config.maxupspeed or brush_config.maxdlspeed):
+            self._bandwidth_sampler = BandwidthSampler(sample_func=self.__sample_bandwidth)
+            self._bandwidth_sampler.start()
+
         # 检查是否启用了一次性任务
         if brush_config.onlyonce:
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
@@ -411,7 +470,47 @@ class BrushFlow(_PluginBase):
         pass
 
     def get_api(self) -> List[Dict[str, Any]]:
-        pass
+        """
+        获取插件API
+        [{
+            "path": "/xx",
+            "endpoint": self.xxx,
+            "methods": ["GET", "POST"],
+            "summary": "API说明"
+        }]
+        """
+        return [{
+            "path": "/torrents",
+            "endpoint": self.get_torrents,
+            "methods": ["GET"],
+            "auth": "bear",
+            "summary": "刷流任务明细",
+            "description": "分页查询刷流任务明细，支持按站点、状态筛选及排序",
+        }]
+
+    def get_torrents(self, page: int = 1, count: int = 50, sort: str = "time", desc: bool = True,
+                     site: str = None, status: str = None) -> schemas.Response:
+        """
+        分页查询刷流任务明细，可由API调用
+        :param page: 页码，从1开始
+        :param count: 每页数量
+        :param sort: 排序字段：time/site/title/size/uploaded/downloaded/ratio
+        :param desc: 是否倒序
+        :param site: 站点名称
+        :param status: 状态：active 正常，deleted 已删除
+        """
+        if not self._task_index:
+            return schemas.Response(success=False, message="插件未初始化")
+        page = max(page, 1)
+        count = min(max(count, 1), 500)
+        total, tasks = self._task_index.query(page=page, count=count, sort=sort, desc=desc,
+                                              site=site, status=status)
+        return schemas.Response(success=True, data={
+            "total": total,
+            "page": page,
+            "count": count,
+            "items": [{"hash": task_hash, **self.__format_task_item(task)} for task_hash, task in tasks]
+        })
 
     def get_service(self) -> List[Dict[str, Any]]:
         """
@@ -1638,6 +1737,22 @@ class BrushFlow(_PluginBase):
                                                         }
                                                     }
                                                 ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 4
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VSwitch',
+                                                        'props': {
+                                                            'model': 'delta_sync',
+                                                            'label': '增量同步种子状态（实验性功能）',
+                                                        }
+                                                    }
+                                                ]
                                             }
                                         ]
                                     }
@@ -1814,6 +1929,7 @@ class BrushFlow(_PluginBase):
             "brush_sequential": False,
             "proxy_delete": False,
             "del_no_free": False,
+            "delta_sync": False,
             "freeleech": "free",
             "hr": "yes",
             "enable_site_config": False,
@@ -1822,7 +1938,7 @@ class BrushFlow(_PluginBase):
 
     def get_page(self) -> List[dict]:
         # 种子明细
-        torrents = self.get_data("torrents") or {}
+        torrents = self._torrent_store.tasks
 
         if not torrents:
             return [
@@ -1834,10 +1950,6 @@ class BrushFlow(_PluginBase):
                     }
                 }
             ]
-        else:
-            data_list = torrents.values()
-            # 按time倒序排序
-            data_list = sorted(data_list, key=lambda x: x.get("time") or 0, reverse=True)
 
         # 表格标题
         headers = [
@@ -1849,18 +1961,14 @@ class BrushFlow(_PluginBase):
             {'title': '分享率', 'key': 'ratio', 'sortable': True},
             {'title': '状态', 'key': 'status', 'sortable': True},
         ]
-        # 种子数据明细
-        items = [
-            {
-                'site': data.get("site_name"),
-                'title': data.get("title"),
-                'size': StringUtils.str_filesize(data.get("size")),
-                'uploaded': StringUtils.str_filesize(data.get("uploaded") or 0),
-                'downloaded': StringUtils.str_filesize(data.get("downloaded") or 0),
-                'ratio': round(data.get('ratio') or 0, 2),
-                'status': "已删除" if data.get("deleted") else "正常"
-            } for data in data_list
-        ]
+        # 种子数据明细，按time倒序排序，数据未变化时复用缓存
+        version = self._torrent_store.version
+        if self._page_items_cache and self._page_items_cache[0] == version:
+            items = self._page_items_cache[1]
+        else:
+            _, data_list = self._task_index.query(page=0, sort="time", desc=True)
+            items = [self.__format_task_item(data) for _, data in data_list]
+            self._page_items_cache = (version, items)
 
         # 拼装页面
         return [
@@ -1906,11 +2014,35 @@ class BrushFlow(_PluginBase):
             }
         ]
 
+    @staticmethod
+    def __format_task_item(data: dict) -> dict:
+        """
+        格式化刷流任务明细数据
+        """
+        return {
+            'site': data.get("site_name"),
+            'title': data.get("title"),
+            'size': StringUtils.str_filesize(data.get("size")),
+            'uploaded': StringUtils.str_filesize(data.get("uploaded") or 0),
+            'downloaded': StringUtils.str_filesize(data.get("downloaded") or 0),
+            'ratio': round(data.get('ratio') or 0, 2),
+            'status': "已删除" if data.get("deleted") else "正常"
+        }
+
     def stop_service(self):
         """
         退出插件
         """
         try:
+            if self._bandwidth_sampler:
+                self._bandwidth_sampler.stop()
+                self._bandwidth_sampler = None
+            if self._torrent_fetcher:
+                self._torrent_fetcher.close()
+            # 写入延迟保存的统计数据
+            for store in (self._torrent_store, self._unmanaged_store, self._archived_store):
+                if store:
+                    store.flush(force=True)
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
                 if self._scheduler.running:
@@ -1939,7 +2071,7 @@ class BrushFlow(_PluginBase):
         with lock:
             logger.info(f"开始执行刷流任务 ...")
 
-            torrent_tasks: Dict[str, dict] = self.get_data("torrents") or {}
+            torrent_tasks: Dict[str, dict] = self._torrent_store.tasks
             torrents_size = self.__calculate_seeding_torrents_size(torrent_tasks=torrent_tasks)
 
             # 判断能否通过保种体积前置条件
@@ -1949,8 +2081,11 @@ class BrushFlow(_PluginBase):
                 logger.info(f"刷流任务执行完成")
                 return
 
+            # 本次刷流周期的条件评估上下文
+            context = BrushEvaluationContext(downloading_count_func=self.__get_downloading_count)
+
             # 判断能否通过刷流前置条件
-            pre_condition_passed, reason = self.__evaluate_pre_conditions_for_brush()
+            pre_condition_passed, reason = self.__evaluate_pre_conditions_for_brush(context=context)
             self.__log_brush_conditions(passed=pre_condition_passed, reason=reason)
             if not pre_condition_passed:
                 logger.info(f"刷流任务执行完成")
@@ -1971,38 +2106,137 @@ class BrushFlow(_PluginBase):
 
             logger.info(f"即将针对站点 {', '.join(site.name for site in site_infos)} 开始刷流")
 
-            # 获取订阅标题
-            subscribe_titles = self.__get_subscribe_titles()
+            # 获取订阅标题匹配器
+            subscribe_matcher = self.__get_subscribe_matcher()
 
-            # 处理所有站点
-            for site in site_infos:
-                # 如果站点刷流没有正确响应，说明没有通过前置条件，其他站点也不需要继续刷流了
-                if not self.__brush_site_torrents(siteid=site.id, torrent_tasks=torrent_tasks,
-                                                  statistic_info=statistic_info,
-                                                  subscribe_titles=subscribe_titles):
-                    logger.info(f"站点 {site.name} 刷流中途结束，停止后续刷流")
+            # 按批次并发获取站点的种子，批次大小受剩余下载数额度限制，避免访问无法新增任务的站点
+            index = 0
+            while index < len(site_infos):
+                if index and not self.__evaluate_browse_conditions(torrent_tasks=torrent_tasks, context=context):
+                    break
+                batch_size = self.__get_browse_batch_size(context=context)
+                batch_sites = site_infos[index:index + batch_size]
+                index += len(batch_sites)
+                site_torrents = self.__browse_sites_torrents(site_infos=batch_sites)
+
+                # 按站点顺序依次处理，保证结果与顺序刷流一致
+                stopped = False
+                for site in batch_sites:
+                    # 如果站点刷流没有正确响应，说明没有通过前置条件，其他站点也不需要继续刷流了
+                    if not self.__brush_site_torrents(siteinfo=site, torrents=site_torrents.get(site.id),
+                                                      torrent_tasks=torrent_tasks,
+                                                      statistic_info=statistic_info,
+                                                      subscribe_matcher=subscribe_matcher,
+                                                      context=context):
+                        logger.info(f"站点 {site.name} 刷流中途结束，停止后续刷流")
+                        stopped = True
+                        break
+                    else:
+                        logger.info(f"站点 {site.name} 刷流完成")
+                if stopped:
                     break
-                else:
-                    logger.info(f"站点 {site.name} 刷流完成")
 
             # 保存数据
-            self.save_data("torrents", torrent_tasks)
+            self._torrent_store.flush()
             # 保存统计数据
             self.save_data("statistic", statistic_info)
             logger.info(f"刷流任务执行完成")
 
-    def __brush_site_torrents(self, siteid, torrent_tasks: Dict[str, dict], statistic_info: Dict[str, int],
-                              subscribe_titles: Set[str]) -> bool:
+    def __evaluate_browse_conditions(self, torrent_tasks: Dict[str, dict],
+                                     context: Optional[BrushEvaluationContext] = None) -> bool:
         """
-        针对站点进行刷流
+        获取下一批站点的种子前，重新判断保种体积及下载数前置条件
         """
-        siteinfo = SiteOper().get(siteid)
-        if not siteinfo:
-            logger.warning(f"站点不存在：{siteid}")
-            return True
+        torrents_size = self.__calculate_seeding_torrents_size(torrent_tasks=torrent_tasks)
+        size_condition_passed, reason = self.__evaluate_size_condition_for_brush(torrents_size=torrents_size)
+        if not size_condition_passed:
+            self.__log_brush_conditions(passed=size_condition_passed, reason=reason)
+            return False
+        pre_condition_passed, reason = self.__evaluate_pre_conditions_for_brush(include_network_conditions=False,
+                                                                                context=context)
+        if not pre_condition_passed:
+            self.__log_brush_conditions(passed=pre_condition_passed, reason=reason)
+            return False
+        return True
+
+    def __get_browse_batch_size(self, context: Optional[BrushEvaluationContext] = None) -> int:
+        """
+        每批并发获取种子的站点数，不超过剩余的同时下载任务数额度
+        """
+        batch_size = max(self._browse_workers, 1)
+        brush_config = self.__get_brush_config()
+        if brush_config.maxdlcount:
+            downloading_count = context.downloading_count if context else self.__get_downloading_count()
+            remaining = int(brush_config.maxdlcount) - downloading_count
+            batch_size = min(batch_size, max(remaining, 1))
+        return batch_size
 
-        logger.info(f"开始获取站点 {siteinfo.name} 的新种子 ...")
-        torrents = TorrentsChain().browse(domain=siteinfo.domain)
+    def __browse_sites_torrents(self, site_infos: List[Any]) -> Dict[int, List[TorrentInfo]]:
+        """
+        并发获取站点的种子列表，单个站点超时或异常时不影响其他站点
+        """
+        site_torrents: Dict[int, List[TorrentInfo]] = {}
+        if not site_infos:
+            return site_torrents
+
+        # 记录每个站点开始获取的时间，用于计算单个站点的超时
+        start_times: Dict[int, float] = {}
+        # 超时或因插件停止而放弃的站点
+        abandoned_sites: List[str] = []
+
+        def browse_site(site) -> List[TorrentInfo]:
+            start_times[site.id] = time.time()
+            logger.info(f"开始获取站点 {site.name} 的新种子 ...")
+            indexer = SitesHelper().get_indexer(site.domain)
+            if not indexer:
+                logger.warning(f"站点 {site.name} 未获取到站点索引信息")
+                return []
+            # 请求超时不超过单站点超时，放弃等待的线程也能随请求超时结束
+            indexer = dict(indexer)
+            indexer["timeout"] = min(int(indexer.get("timeout") or self._browse_timeout), self._browse_timeout)
+            return TorrentsChain().refresh_torrents(site=indexer)
+
+        executor = ThreadPoolExecutor(max_workers=min(self._browse_workers, len(site_infos)),
+                                      thread_name_prefix="BrushFlow-Browse")
+        try:
+            futures: Dict[Future, Any] = {executor.submit(browse_site, site): site for site in site_infos}
+            pending = set(futures)
+            while pending and not self._event.is_set():
+                done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    site = futures[future]
+                    try:
+                        site_torrents[site.id] = future.result() or []
+                    except Exception as e:
+                        logger.error(f"站点 {site.name} 获取种子失败，错误详情: {e}")
+                # 超时的站点不再等待，其结果将被丢弃
+                now = time.time()
+                for future in list(pending):
+                    site = futures[future]
+                    start_time = start_times.get(site.id)
+                    if start_time and now - start_time > self._browse_timeout:
+                        logger.warning(f"站点 {site.name} 获取种子超过 {self._browse_timeout} 秒，跳过该站点")
+                        future.cancel()
+                        pending.discard(future)
+                        abandoned_sites.append(site.name)
+            # 插件停止时未完成的站点
+            abandoned_sites.extend(futures[future].name for future in pending)
+        finally:
+            # 不等待超时的线程结束，避免拖慢整个刷流周期，线程将在请求超时后结束
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if abandoned_sites:
+            logger.warning(f"本次放弃获取种子的站点：{', '.join(abandoned_sites)}")
+
+        return site_torrents
+
+    def __brush_site_torrents(self, siteinfo: Any, torrents: Optional[List[TorrentInfo]],
+                              torrent_tasks: Dict[str, dict], statistic_info: Dict[str, int],
+                              subscribe_matcher: SubscribeTitleMatcher,
+                              context: Optional[BrushEvaluationContext] = None) -> bool:
+        """
+        针对站点进行刷流
+        """
         if not torrents:
             logger.info(f"站点 {siteinfo.name} 没有获取到种子")
             return True
@@ -2014,7 +2248,8 @@ class BrushFlow(_PluginBase):
 
         # 排除包含订阅的种子
         if brush_config.except_subscribe:
-            torrents = self.__filter_torrents_contains_subscribe(torrents=torrents, subscribe_titles=subscribe_titles)
+            torrents = self.__filter_torrents_contains_subscribe(torrents=torrents,
+                                                                 subscribe_matcher=subscribe_matcher)
 
         # 按发布日期降序排列
         torrents.sort(key=lambda x: x.pubdate or '', reverse=True)
@@ -2023,34 +2258,92 @@ class BrushFlow(_PluginBase):
 
         logger.info(f"正在准备种子刷流，数量 {len(torrents)}")
 
-        # 过滤种子
-        for torrent in torrents:
-            # 判断能否通过刷流前置条件
-            pre_condition_passed, reason = self.__evaluate_pre_conditions_for_brush(include_network_conditions=False)
-            self.__log_brush_conditions(passed=pre_condition_passed, reason=reason)
-            if not pre_condition_passed:
-                return False
+        pre_condition_passed = True
+        # 本站点已选中的种子（站点+标题、站点+详情页），同一批次中重复出现的种子只添加一次
+        accepted_keys: Set[tuple] = set()
+        # 当前待筛选种子的位置
+        index = 0
+
+        while index < len(torrents):
+            # 通过条件的种子，稍后统一获取种子文件并批量添加下载任务
+            brush_torrents: List[TorrentInfo] = []
+            pre_condition_passed = True
+
+            # 过滤种子
+            while index < len(torrents):
+                torrent = torrents[index]
+                # 判断能否通过刷流前置条件，待添加的种子同样计入下载任务数
+                pre_condition_passed, reason = self.__evaluate_pre_conditions_for_brush(
+                    include_network_conditions=False, pending_count=len(brush_torrents), context=context)
+                self.__log_brush_conditions(passed=pre_condition_passed, reason=reason)
+                if not pre_condition_passed:
+                    break
+                index += 1
 
-            logger.debug(f"种子详情：{torrent}")
+                logger.debug(f"种子详情：{torrent}")
 
-            # 判断能否通过保种体积刷流条件
-            size_condition_passed, reason = self.__evaluate_size_condition_for_brush(torrents_size=torrents_size,
-                                                                                     add_torrent_size=torrent.size)
-            self.__log_brush_conditions(passed=size_condition_passed, reason=reason, torrent=torrent)
-            if not size_condition_passed:
-                continue
+                # 判断能否通过保种体积刷流条件
+                size_condition_passed, reason = self.__evaluate_size_condition_for_brush(
+                    torrents_size=torrents_size, add_torrent_size=torrent.size)
+                self.__log_brush_conditions(passed=size_condition_passed, reason=reason, torrent=torrent)
+                if not size_condition_passed:
+                    continue
 
-            # 判断能否通过刷流条件
-            condition_passed, reason = self.__evaluate_conditions_for_brush(torrent=torrent,
-                                                                            torrent_tasks=torrent_tasks)
-            self.__log_brush_conditions(passed=condition_passed, reason=reason, torrent=torrent)
-            if not condition_passed:
-                continue
+                # 本批次中已选中的相同种子
+                torrent_keys = self.__get_torrent_task_keys(torrent)
+                if accepted_keys & torrent_keys:
+                    self.__log_brush_conditions(passed=False, reason="重复种子", torrent=torrent)
+                    continue
+
+                # 判断能否通过刷流条件
+                condition_passed, reason = self.__evaluate_conditions_for_brush(torrent=torrent,
+                                                                                torrent_tasks=torrent_tasks,
+                                                                                context=context)
+                self.__log_brush_conditions(passed=condition_passed, reason=reason, torrent=torrent)
+                if not condition_passed:
+                    continue
+
+                brush_torrents.append(torrent)
+                accepted_keys |= torrent_keys
+                torrents_size += torrent.size
+
+            if not brush_torrents:
+                break
+
+            # 批量添加下载任务，添加失败的种子归还保种体积及下载数额度
+            failed_torrents = self.__add_brush_torrents(siteinfo=siteinfo, torrents=brush_torrents,
+                                                        torrent_tasks=torrent_tasks, statistic_info=statistic_info,
+                                                        brush_config=brush_config, context=context)
+            if not failed_torrents:
+                break
+            for torrent in failed_torrents:
+                torrents_size -= torrent.size
+                accepted_keys -= self.__get_torrent_task_keys(torrent)
+            logger.info(f"站点 {siteinfo.name} 有 {len(failed_torrents)} 个种子添加失败，继续筛选剩余种子")
+
+        return pre_condition_passed
 
-            # 添加下载任务
-            hash_string = self.__download(torrent=torrent)
+    @staticmethod
+    def __get_torrent_task_keys(torrent: TorrentInfo) -> Set[tuple]:
+        """
+        种子去重键，与刷流条件中的重复种子判断一致
+        """
+        keys = {("title", torrent.site_name, torrent.title)}
+        if torrent.page_url:
+            keys.add(("page_url", torrent.site_name, torrent.page_url))
+        return keys
+
+    def __add_brush_torrents(self, siteinfo: Any, torrents: List[TorrentInfo], torrent_tasks: Dict[str, dict],
+                             statistic_info: Dict[str, int], brush_config: BrushConfig,
+                             context: Optional[BrushEvaluationContext] = None) -> List[TorrentInfo]:
+        """
+        批量添加下载任务并保存任务信息，返回添加失败的种子
+        """
+        failed_torrents: List[TorrentInfo] = []
+        for torrent, hash_string in self.__download_torrents(siteinfo=siteinfo, torrents=torrents):
             if not hash_string:
                 logger.warning(f"{torrent.title} 添加刷流任务失败！")
+                failed_torrents.append(torrent)
                 continue
 
             # 触发刷流下载时间并保存任务信息
@@ -2099,12 +2392,13 @@ class BrushFlow(_PluginBase):
             torrent_tasks[hash_string] = torrent_task
 
             # 统计数据
-            torrents_size += torrent.size
+            if context:
+                context.add_downloading()
             statistic_info["count"] += 1
             logger.info(f"站点 {siteinfo.name}，新增刷流种子下载：{torrent.title}|{torrent.description}")
             self.__send_add_message(torrent)
 
-        return True
+        return failed_torrents
 
     def __evaluate_size_condition_for_brush(self, torrents_size: float,
                                             add_torrent_size: float = 0.0) -> Tuple[bool, Optional[str]]:
@@ -2151,13 +2445,21 @@ class BrushFlow(_PluginBase):
 
         return True, None
 
-    def __evaluate_pre_conditions_for_brush(self, include_network_conditions: bool = True) \
+    def __evaluate_pre_conditions_for_brush(self, include_network_conditions: bool = True, pending_count: int = 0,
+                                            context: Optional[BrushEvaluationContext] = None) \
             -> Tuple[bool, Optional[str]]:
         """
         前置过滤不符合条件的种子
+        :param include_network_conditions: 是否检查带宽条件
+        :param pending_count: 已通过条件、尚未添加到下载器的种子数量
+        :param context: 刷流周期的评估上下文，存在时使用其中缓存的下载任务数
         """
+
+        def get_downloading_count() -> int:
+            return context.downloading_count if context else self.__get_downloading_count()
+
         reasons = [
-            ("maxdlcount", lambda config: self.__get_downloading_count() >= int(config),
+            ("maxdlcount", lambda config: get_downloading_count() + pending_count >= int(config),
              lambda config: f"当前同时下载任务数已达到最大值 {config}，暂时停止新增任务")
         ]
 
@@ -2183,7 +2485,9 @@ class BrushFlow(_PluginBase):
 
         return True, None
 
-    def __evaluate_conditions_for_brush(self, torrent, torrent_tasks) -> Tuple[bool, Optional[str]]:
+    def __evaluate_conditions_for_brush(self, torrent, torrent_tasks,
+                                        context: Optional[BrushEvaluationContext] = None) \
+            -> Tuple[bool, Optional[str]]:
         """
         过滤不符合条件的种子
         """
@@ -2258,7 +2562,8 @@ class BrushFlow(_PluginBase):
         # e.g.2: 用户UTC，站点UTC+8，timezone_offset应为-8，种子在UTC 0:00/UTC+8 8:00发布：
         #        1:17 - 8:00 - (-8:00) = 1:17；1小时17分为正确的发布时间与当前的时间差
         # timezone_offset为后加功能，默认为0，方便后续更多与时间相关的功能开发，之前在单独站点配置中使用pubtime计算过时区偏移的用户也不受影响
-        pubdate_minutes = self.__get_pubminutes(torrent.pubdate) - brush_config.timezone_offset
+        pubdate_minutes = (context.get_pubminutes(torrent.pubdate) if context
+                           else self.__get_pubminutes(torrent.pubdate)) - brush_config.timezone_offset
         # 已支持独立站点配置，取消单独适配站点时区逻辑，可通过配置项「pubtime」自行适配
         # pubdate_minutes = self.__adjust_site_pubminutes(pubdate_minutes, torrent)
         if brush_config.pubtime:
@@ -2300,11 +2605,11 @@ class BrushFlow(_PluginBase):
 
         with lock:
             logger.info("开始检查刷流下载任务 ...")
-            torrent_tasks: Dict[str, dict] = self.get_data("torrents") or {}
-            unmanaged_tasks: Dict[str, dict] = self.get_data("unmanaged") or {}
+            torrent_tasks: Dict[str, dict] = self._torrent_store.tasks
+            unmanaged_tasks: Dict[str, dict] = self._unmanaged_store.tasks
 
             downloader = self.downloader
-            seeding_torrents, error = downloader.get_torrents()
+            seeding_torrents, error = self.__get_seeding_torrents(torrent_hashes=list(torrent_tasks.keys()))
             if error:
                 logger.warning("连接下载器出错，将在下个时间周期重试")
                 return
@@ -2325,11 +2630,15 @@ class BrushFlow(_PluginBase):
             # 获取到当前所有做种数据中需要被检查的种子数据
             check_torrents = [seeding_torrents_dict[th] for th in torrent_check_hashes if th in seeding_torrents_dict]
 
+            # 本轮检查的种子信息快照，后续的状态更新及删除规则均基于该快照计算
+            torrent_info_map = self.__build_torrent_info_map(torrents=check_torrents)
+
             # 先更新刷流任务的最新状态，上下传，分享率
-            self.__update_torrent_tasks_state(torrents=check_torrents, torrent_tasks=torrent_tasks)
+            self.__update_torrent_tasks_state(torrent_info_map=torrent_info_map, torrent_tasks=torrent_tasks)
 
             # 更新刷流任务列表中在下载器中删除的种子为删除状态
-            self.__update_undeleted_torrents_missing_in_downloader(torrent_tasks, torrent_check_hashes, check_torrents)
+            self.__update_undeleted_torrents_missing_in_downloader(torrent_tasks, torrent_check_hashes,
+                                                                   torrent_info_map)
 
             # 根据配置的标签进行种子排除
             if check_torrents:
@@ -2359,16 +2668,19 @@ class BrushFlow(_PluginBase):
                 need_delete_hashes = []
 
                 # 如果配置了动态删除以及删种阈值，则根据动态删种进行分组处理
+                check_hashes = [self.__get_hash(torrent) for torrent in check_torrents]
                 if brush_config.proxy_delete and brush_config.delete_size_range:
                     logger.info("已开启动态删种，按系统默认动态删种条件开始检查任务")
-                    proxy_delete_hashes = self.__delete_torrent_for_proxy(torrents=check_torrents,
+                    proxy_delete_hashes = self.__delete_torrent_for_proxy(torrent_hashes=check_hashes,
+                                                                          torrent_info_map=torrent_info_map,
                                                                           torrent_tasks=torrent_tasks) or []
                     need_delete_hashes.extend(proxy_delete_hashes)
                 # 否则均认为是没有开启动态删种
                 else:
                     logger.info("没有开启动态删种，按用户设置删种条件开始检查任务")
-                    not_proxy_delete_hashes = self.__delete_torrent_for_evaluate_conditions(torrents=check_torrents,
-                                                                                            torrent_tasks=torrent_tasks) or []
+                    not_proxy_delete_hashes = self.__delete_torrent_for_evaluate_conditions(
+                        torrent_hashes=check_hashes, torrent_info_map=torrent_info_map,
+                        torrent_tasks=torrent_tasks) or []
                     need_delete_hashes.extend(not_proxy_delete_hashes)
 
                 if need_delete_hashes:
@@ -2386,23 +2698,33 @@ class BrushFlow(_PluginBase):
 
             self.__update_and_save_statistic_info(torrent_tasks)
 
-            self.save_data("torrents", torrent_tasks)
+            self._torrent_store.flush()
 
             logger.info("刷流下载任务检查完成")
 
-    def __update_torrent_tasks_state(self, torrents: List[Any], torrent_tasks: Dict[str, dict]):
+    def __build_torrent_info_map(self, torrents: List[Any]) -> Dict[str, dict]:
         """
-        更新刷流任务的最新状态，上下传，分享率
+        构建种子信息快照，按种子Hash索引，每个检查周期只计算一次
         """
+        torrent_info_map = {}
         for torrent in torrents:
-            torrent_hash = self.__get_hash(torrent)
+            torrent_info = self.__get_torrent_info(torrent)
+            torrent_hash = torrent_info.get("hash")
+            if torrent_hash:
+                torrent_info_map[torrent_hash] = torrent_info
+        return torrent_info_map
+
+    @staticmethod
+    def __update_torrent_tasks_state(torrent_info_map: Dict[str, dict], torrent_tasks: Dict[str, dict]):
+        """
+        更新刷流任务的最新状态，上下传，分享率
+        """
+        for torrent_hash, torrent_info in torrent_info_map.items():
             torrent_task = torrent_tasks.get(torrent_hash, None)
             # 如果找不到种子任务，说明不在管理的种子范围内，直接跳过
             if not torrent_task:
                 continue
 
-            torrent_info = self.__get_torrent_info(torrent)
-
             # 更新上传量、下载量
             torrent_task.update({
                 "downloaded": torrent_info.get("downloaded"),
@@ -2464,8 +2786,8 @@ class BrushFlow(_PluginBase):
                     logger.info(f"站点 {torrent_task.get('site_name')}，"
                                 f"刷流任务种子移除：{torrent_task.get('title')}|{torrent_task.get('description')}")
 
-        self.save_data("torrents", torrent_tasks)
-        self.save_data("unmanaged", unmanaged_tasks)
+        self._torrent_store.flush()
+        self._unmanaged_store.flush()
 
         # 发送汇总消息
         if added_tasks:
@@ -2479,15 +2801,14 @@ class BrushFlow(_PluginBase):
                                                             reason="在下载器中找到已标记删除的刷流任务对应的种子信息",
                                                             torrent_tasks=reset_tasks)
 
-    def __group_torrents_by_proxy_delete(self, torrents: List[Any], torrent_tasks: Dict[str, dict]):
+    def __group_torrents_by_proxy_delete(self, torrent_hashes: List[str], torrent_tasks: Dict[str, dict]):
         """
         根据是否启用动态删种进行分组
         """
-        proxy_delete_torrents = []
-        not_proxy_delete_torrents = []
+        proxy_delete_hashes = []
+        not_proxy_delete_hashes = []
 
-        for torrent in torrents:
-            torrent_hash = self.__get_hash(torrent)
+        for torrent_hash in torrent_hashes:
             torrent_task = torrent_tasks.get(torrent_hash, None)
 
             # 如果找不到种子任务，说明不在管理的种子范围内，直接跳过
@@ -2498,11 +2819,11 @@ class BrushFlow(_PluginBase):
 
             brush_config = self.__get_brush_config(site_name)
             if brush_config.proxy_delete:
-                proxy_delete_torrents.append(torrent)
+                proxy_delete_hashes.append(torrent_hash)
             else:
-                not_proxy_delete_torrents.append(torrent)
+                not_proxy_delete_hashes.append(torrent_hash)
 
-        return proxy_delete_torrents, not_proxy_delete_torrents
+        return proxy_delete_hashes, not_proxy_delete_hashes
 
     def __evaluate_conditions_for_delete(self, site_name: str, torrent_info: dict, torrent_task: dict) \
             -> Tuple[bool, str]:
@@ -2604,25 +2925,23 @@ class BrushFlow(_PluginBase):
 
         return True, reason
 
-    def __delete_torrent_for_evaluate_conditions(self, torrents: List[Any], torrent_tasks: Dict[str, dict],
-                                                 proxy_delete: bool = False) -> List:
+    def __delete_torrent_for_evaluate_conditions(self, torrent_hashes: List[str], torrent_info_map: Dict[str, dict],
+                                                 torrent_tasks: Dict[str, dict], proxy_delete: bool = False) -> List:
         """
         根据条件删除种子并获取已删除列表
         """
         delete_hashes = []
 
-        for torrent in torrents:
-            torrent_hash = self.__get_hash(torrent)
+        for torrent_hash in torrent_hashes:
             torrent_task = torrent_tasks.get(torrent_hash, None)
+            torrent_info = torrent_info_map.get(torrent_hash, None)
             # 如果找不到种子任务，说明不在管理的种子范围内，直接跳过
-            if not torrent_task:
+            if not torrent_task or not torrent_info:
                 continue
             site_name = torrent_task.get("site_name", "")
             torrent_title = torrent_task.get("title", "")
             torrent_desc = torrent_task.get("description", "")
 
-            torrent_info = self.__get_torrent_info(torrent)
-
             # 删除种子的具体实现可能会根据实际情况略有不同
             should_delete, reason = self.__evaluate_conditions_for_delete(site_name=site_name,
                                                                           torrent_info=torrent_info,
@@ -2638,18 +2957,19 @@ class BrushFlow(_PluginBase):
 
         return delete_hashes
 
-    def __delete_torrent_for_evaluate_proxy_pre_conditions(self, torrents: List[Any],
+    def __delete_torrent_for_evaluate_proxy_pre_conditions(self, torrent_hashes: List[str],
+                                                           torrent_info_map: Dict[str, dict],
                                                            torrent_tasks: Dict[str, dict]) -> List:
         """
         根据动态删除前置条件排除H&R种子后删除种子并获取已删除列表
         """
         delete_hashes = []
 
-        for torrent in torrents:
-            torrent_hash = self.__get_hash(torrent)
+        for torrent_hash in torrent_hashes:
             torrent_task = torrent_tasks.get(torrent_hash, None)
+            torrent_info = torrent_info_map.get(torrent_hash, None)
             # 如果找不到种子任务，说明不在管理的种子范围内，直接跳过
-            if not torrent_task:
+            if not torrent_task or not torrent_info:
                 continue
 
             # 如果是H&R种子，前置条件中不进行处理
@@ -2660,8 +2980,6 @@ class BrushFlow(_PluginBase):
             torrent_title = torrent_task.get("title", "")
             torrent_desc = torrent_task.get("description", "")
 
-            torrent_info = self.__get_torrent_info(torrent)
-
             # 删除种子的具体实现可能会根据实际情况略有不同
             should_delete, reason = self.__evaluate_proxy_pre_conditions_for_delete(site_name=site_name,
                                                                                     torrent_info=torrent_info,
@@ -2676,7 +2994,8 @@ class BrushFlow(_PluginBase):
 
         return delete_hashes
 
-    def __delete_torrent_for_proxy(self, torrents: List[Any], torrent_tasks: Dict[str, dict]) -> List:
+    def __delete_torrent_for_proxy(self, torrent_hashes: List[str], torrent_info_map: Dict[str, dict],
+                                   torrent_tasks: Dict[str, dict]) -> List:
         """
         动态删除种子，删除规则如下；
         - 不管做种体积是否超过设定的动态删除阈值，默认优先执行排除H&R种子后满足「下载超时时间」的种子
@@ -2692,9 +3011,6 @@ class BrushFlow(_PluginBase):
         if not (brush_config.proxy_delete and brush_config.delete_size_range):
             return []
 
-        # 获取种子信息Map
-        torrent_info_map = {self.__get_hash(torrent): self.__get_torrent_info(torrent=torrent) for torrent in torrents}
-
         # 计算当前总做种体积
         total_torrent_size = self.__calculate_seeding_torrents_size(torrent_tasks=torrent_tasks)
 
@@ -2702,15 +3018,17 @@ class BrushFlow(_PluginBase):
             f"当前做种体积 {self.__bytes_to_gb(total_torrent_size):.1f} GB，正在准备计算满足动态前置删除条件的种子")
 
         # 执行排除H&R种子后满足前置删除条件的种子
-        pre_delete_hashes = self.__delete_torrent_for_evaluate_proxy_pre_conditions(torrents=torrents,
-                                                                                    torrent_tasks=torrent_tasks) or []
+        pre_delete_hashes = self.__delete_torrent_for_evaluate_proxy_pre_conditions(
+            torrent_hashes=torrent_hashes, torrent_info_map=torrent_info_map, torrent_tasks=torrent_tasks) or []
 
         # 如果存在前置删除种子，这里进行额外判断，总做种体积排除前置删除种子的体积
         if pre_delete_hashes:
-            pre_delete_total_size = sum(torrent_info_map[self.__get_hash(torrent)].get("total_size", 0)
-                                        for torrent in torrents if self.__get_hash(torrent) in pre_delete_hashes)
+            pre_delete_total_size = self.__sum_torrents_size(torrent_hashes=pre_delete_hashes,
+                                                             torrent_info_map=torrent_info_map)
             total_torrent_size = total_torrent_size - pre_delete_total_size
-            torrents = [torrent for torrent in torrents if self.__get_hash(torrent) not in pre_delete_hashes]
+            pre_delete_hash_set = set(pre_delete_hashes)
+            torrent_hashes = [torrent_hash for torrent_hash in torrent_hashes
+                              if torrent_hash not in pre_delete_hash_set]
             logger.info(
                 f"满足动态删除前置条件的种子共 {len(pre_delete_hashes)} 个，体积 {self.__bytes_to_gb(pre_delete_total_size):.1f} GB，"
                 f"删除种子后，当前做种体积 {self.__bytes_to_gb(total_torrent_size):.1f} GB")
@@ -2740,47 +3058,48 @@ class BrushFlow(_PluginBase):
         need_delete_hashes.extend(pre_delete_hashes)
 
         # 即使开了动态删除，但是也有可能部分站点单独设置了关闭，这里根据种子托管进行分组，先处理不需要托管的种子，按设置的规则进行删除
-        proxy_delete_torrents, not_proxy_delete_torrents = self.__group_torrents_by_proxy_delete(torrents=torrents,
-                                                                                                 torrent_tasks=torrent_tasks)
-        logger.info(f"托管种子数 {len(proxy_delete_torrents)}，未托管种子数 {len(not_proxy_delete_torrents)}")
-        if not_proxy_delete_torrents:
-            not_proxy_delete_hashes = self.__delete_torrent_for_evaluate_conditions(torrents=not_proxy_delete_torrents,
-                                                                                    torrent_tasks=torrent_tasks) or []
-            need_delete_hashes.extend(not_proxy_delete_hashes)
-            total_torrent_size -= sum(
-                torrent_info_map[self.__get_hash(torrent)].get("total_size", 0) for torrent in not_proxy_delete_torrents
-                if self.__get_hash(torrent) in not_proxy_delete_hashes)
+        proxy_delete_hashes, not_proxy_delete_hashes = self.__group_torrents_by_proxy_delete(
+            torrent_hashes=torrent_hashes, torrent_tasks=torrent_tasks)
+        logger.info(f"托管种子数 {len(proxy_delete_hashes)}，未托管种子数 {len(not_proxy_delete_hashes)}")
+        if not_proxy_delete_hashes:
+            deleted_hashes = self.__delete_torrent_for_evaluate_conditions(torrent_hashes=not_proxy_delete_hashes,
+                                                                           torrent_info_map=torrent_info_map,
+                                                                           torrent_tasks=torrent_tasks) or []
+            need_delete_hashes.extend(deleted_hashes)
+            total_torrent_size -= self.__sum_torrents_size(torrent_hashes=deleted_hashes,
+                                                           torrent_info_map=torrent_info_map)
 
         # 如果删除非托管种子后仍未达到最小体积要求，则处理托管种子
-        if total_torrent_size > min_size and proxy_delete_torrents:
-            proxy_delete_hashes = self.__delete_torrent_for_evaluate_conditions(torrents=proxy_delete_torrents,
-                                                                                torrent_tasks=torrent_tasks,
-                                                                                proxy_delete=True) or []
-            need_delete_hashes.extend(proxy_delete_hashes)
-            total_torrent_size -= sum(
-                torrent_info_map[self.__get_hash(torrent)].get("total_size", 0) for torrent in proxy_delete_torrents if
-                self.__get_hash(torrent) in proxy_delete_hashes)
+        if total_torrent_size > min_size and proxy_delete_hashes:
+            deleted_hashes = self.__delete_torrent_for_evaluate_conditions(torrent_hashes=proxy_delete_hashes,
+                                                                           torrent_info_map=torrent_info_map,
+                                                                           torrent_tasks=torrent_tasks,
+                                                                           proxy_delete=True) or []
+            need_delete_hashes.extend(deleted_hashes)
+            total_torrent_size -= self.__sum_torrents_size(torrent_hashes=deleted_hashes,
+                                                           torrent_info_map=torrent_info_map)
 
         # 在完成初始删除步骤后，如果总体积仍然超过最小阈值，则进一步找到已完成种子并排除HR种子后按做种时间正序进行删除
         if total_torrent_size > min_size:
             # 重新计算当前的种子列表，排除已删除的种子
-            remaining_hashes = list(
-                {self.__get_hash(torrent) for torrent in proxy_delete_torrents} - set(need_delete_hashes))
+            remaining_hashes = list(set(proxy_delete_hashes) - set(need_delete_hashes))
             # 这里根据排除后的种子列表，再次从下载器中找到已完成的任务
             downloader = self.downloader
-            completed_torrents = downloader.get_completed_torrents(ids=remaining_hashes)
+            completed_torrents = downloader.get_completed_torrents(ids=remaining_hashes) or []
             remaining_hashes = {self.__get_hash(torrent) for torrent in completed_torrents}
-            remaining_torrents = [(_hash, torrent_info_map[_hash]) for _hash in remaining_hashes]
 
-            # 准备一个列表，用于存放满足条件的种子，即非HR种子且有明确做种时间
-            filtered_torrents = [(_hash, info['seeding_time']) for _hash, info in remaining_torrents if
-                                 not torrent_tasks[_hash].get("hit_and_run", False)]
-            sorted_torrents = sorted(filtered_torrents, key=lambda x: x[1], reverse=True)
+            # 使用堆按做种时间从长到短依次取出满足条件的种子，即非HR种子且有明确做种时间
+            seeding_time_heap = [(-torrent_info_map[_hash].get("seeding_time", 0), _hash)
+                                 for _hash in remaining_hashes
+                                 if _hash in torrent_info_map and _hash in torrent_tasks
+                                 and not torrent_tasks[_hash].get("hit_and_run", False)]
+            heapq.heapify(seeding_time_heap)
 
             # 进行额外的删除操作，直到满足最小阈值或没有更多种子可删除
-            for torrent_hash, _ in sorted_torrents:
+            while seeding_time_heap:
                 if total_torrent_size <= min_size:
                     break
+                _, torrent_hash = heapq.heappop(seeding_time_heap)
                 torrent_task = torrent_tasks.get(torrent_hash, None)
                 torrent_info = torrent_info_map.get(torrent_hash, None)
                 if not torrent_task or not torrent_info:
@@ -2816,13 +3135,21 @@ class BrushFlow(_PluginBase):
         # 返回所有需要删除的种子的哈希列表
         return need_delete_hashes
 
-    def __update_undeleted_torrents_missing_in_downloader(self, torrent_tasks, torrent_check_hashes, torrents):
+    @staticmethod
+    def __sum_torrents_size(torrent_hashes: List[str], torrent_info_map: Dict[str, dict]) -> float:
+        """
+        根据种子信息快照计算指定种子的总体积
+        """
+        return sum(torrent_info_map[torrent_hash].get("total_size") or 0
+                   for torrent_hash in set(torrent_hashes) if torrent_hash in torrent_info_map)
+
+    def __update_undeleted_torrents_missing_in_downloader(self, torrent_tasks, torrent_check_hashes,
+                                                          torrent_info_map: Dict[str, dict]):
         """
         处理已经被删除，但是任务记录中还没有被标记删除的种子
         """
         # 先通过获取的全量种子，判断已经被删除，但是任务记录中还没有被标记删除的种子
-        torrent_all_hashes = self.__get_all_hashes(torrents)
-        missing_hashes = [hash_value for hash_value in torrent_check_hashes if hash_value not in torrent_all_hashes]
+        missing_hashes = [hash_value for hash_value in torrent_check_hashes if hash_value not in torrent_info_map]
         undeleted_hashes = [hash_value for hash_value in missing_hashes if not torrent_tasks[hash_value].get("deleted")]
 
         if not undeleted_hashes:
@@ -2886,14 +3213,22 @@ class BrushFlow(_PluginBase):
         """
         更新并保存统计信息
         """
-        total_count, total_uploaded, total_downloaded, total_deleted = 0, 0, 0, 0
         active_uploaded, active_downloaded, active_count, total_unarchived = 0, 0, 0, 0
 
         statistic_info = self.__get_statistic_info()
-        archived_tasks = self.get_data("archived") or {}
-        combined_tasks = {**torrent_tasks, **archived_tasks}
+        archived_tasks = self._archived_store.tasks
+
+        # 归档任务的汇总数据仅在归档数据变化时重新计算，这里只需累加未归档的任务
+        archived_statistic = self.__get_archived_statistic()
+        total_count = archived_statistic.get("count")
+        total_deleted = archived_statistic.get("deleted")
+        total_uploaded = archived_statistic.get("uploaded")
+        total_downloaded = archived_statistic.get("downloaded")
 
-        for task in combined_tasks.values():
+        for task_hash, task in torrent_tasks.items():
+            if task_hash in archived_tasks:
+                continue
+            total_count += 1
             if task.get("deleted", False):
                 total_deleted += 1
             total_downloaded += task.get("downloaded", 0)
@@ -2909,7 +3244,6 @@ class BrushFlow(_PluginBase):
                 total_unarchived += 1
 
         # 更新统计信息
-        total_count = len(combined_tasks)
         statistic_info.update({
             "uploaded": total_uploaded,
             "downloaded": total_downloaded,
@@ -2929,7 +3263,25 @@ class BrushFlow(_PluginBase):
                     f"总下载量：{StringUtils.str_filesize(total_downloaded)}")
 
         self.save_data("statistic", statistic_info)
-        self.save_data("torrents", torrent_tasks)
+        self._torrent_store.flush()
+
+    def __get_archived_statistic(self) -> Dict[str, int]:
+        """
+        获取归档任务的汇总数据，仅在归档数据版本变化时重新计算
+        """
+        archived_tasks = self._archived_store.tasks
+        version = self._archived_store.version
+        if self._archived_statistic_cache and self._archived_statistic_cache[0] == version:
+            return self._archived_statistic_cache[1]
+
+        archived_statistic = {
+            "count": len(archived_tasks),
+            "deleted": sum(1 for task in archived_tasks.values() if task.get("deleted", False)),
+            "uploaded": sum(task.get("uploaded", 0) for task in archived_tasks.values()),
+            "downloaded": sum(task.get("downloaded", 0) for task in archived_tasks.values())
+        }
+        self._archived_statistic_cache = (version, archived_statistic)
+        return archived_statistic
 
     def __get_brush_config(self, sitename: str = None) -> BrushConfig:
         """
@@ -3048,6 +3400,7 @@ class BrushFlow(_PluginBase):
             "enable_site_config": brush_config.enable_site_config,
             "site_config": brush_config.site_config,
             "del_no_free": brush_config.del_no_free,
+            "delta_sync": brush_config.delta_sync,
             "_tabs": self._tabs
         }
 
@@ -3055,7 +3408,8 @@ class BrushFlow(_PluginBase):
         self.update_config(config_mapping)
 
     @staticmethod
-    def __get_redict_url(url: str, proxies: str = None, ua: str = None, cookie: str = None) -> Optional[str]:
+    def __get_redict_url(url: str, proxies: str = None, ua: str = None, cookie: str = None,
+                         session: Any = None) -> Optional[str]:
         """
         获取下载链接， url格式：[base64]url
         """
@@ -3085,7 +3439,8 @@ class BrushFlow(_PluginBase):
                     ua=ua,
                     proxies=proxies,
                     cookies=cookie,
-                    headers=headers
+                    headers=headers,
+                    session=session
                 ).get_res(url, params=req_params.get('params'))
             else:
                 # POST请求
@@ -3093,7 +3448,8 @@ class BrushFlow(_PluginBase):
                     ua=ua,
                     proxies=proxies,
                     cookies=cookie,
-                    headers=headers
+                    headers=headers,
+                    session=session
                 ).post_res(url, params=req_params.get('params'))
             if not res:
                 return None
@@ -3143,42 +3499,124 @@ class BrushFlow(_PluginBase):
             logger.error(f"Error while resetting downloader URL for torrent: {torrent_url}. Error: {str(e)}")
             return torrent_url
 
-    def __download(self, torrent: TorrentInfo) -> Optional[str]:
+    def __download_torrents(self, siteinfo: Any, torrents: List[TorrentInfo]) \
+            -> List[Tuple[TorrentInfo, Optional[str]]]:
         """
-        添加下载任务
+        批量添加下载任务，先通过站点会话并发获取种子文件，再依次提交到下载器，返回种子及对应的Hash
+        """
+        if not torrents:
+            return []
+
+        metrics = StageMetrics()
+        fetcher = self._torrent_fetcher or TorrentFetcher(max_workers=self._download_workers,
+                                                          site_interval=self._download_interval)
+
+        def prepare(torrent: TorrentInfo, session: Any) -> Optional[Tuple[Any, Optional[str]]]:
+            start_time = time.perf_counter()
+            torrent_url, cookies = self.__resolve_download_url(torrent=torrent, site_key=siteinfo.id,
+                                                               session=session)
+            metrics.record("解析", time.perf_counter() - start_time)
+            if not torrent_url:
+                return None
+            if torrent_url.startswith("magnet"):
+                return torrent_url, cookies
+            start_time = time.perf_counter()
+            torrent_content = self.__fetch_torrent_content(torrent=torrent, torrent_url=torrent_url,
+                                                           cookies=cookies, site_key=siteinfo.id, session=session)
+            metrics.record("获取", time.perf_counter() - start_time)
+            return torrent_content, cookies
+
+        start_time = time.perf_counter()
+        prepared = fetcher.map(site_key=siteinfo.id, items=torrents, func=prepare)
+        fetch_elapsed = time.perf_counter() - start_time
+
+        results = []
+        start_time = time.perf_counter()
+        for torrent, item in zip(torrents, prepared):
+            if not item:
+                results.append((torrent, None))
+                continue
+            torrent_content, cookies = item
+            add_start_time = time.perf_counter()
+            torrent_hash = self.__add_torrent(torrent=torrent, torrent_content=torrent_content, cookies=cookies)
+            metrics.record("添加", time.perf_counter() - add_start_time)
+            results.append((torrent, torrent_hash))
+        add_elapsed = time.perf_counter() - start_time
+
+        logger.info(f"站点 {siteinfo.name} 批量下载种子 {len(torrents)} 个，"
+                    f"成功 {len([result for result in results if result[1]])} 个，"
+                    f"获取种子文件耗时 {fetch_elapsed:.2f} 秒，提交下载器耗时 {add_elapsed:.2f} 秒")
+        logger.debug(f"站点 {siteinfo.name} 下载种子分阶段耗时：{metrics.summary()}")
+        return results
+
+    def __resolve_download_url(self, torrent: TorrentInfo, site_key: Any, session: Any = None) \
+            -> Tuple[Optional[str], Optional[str]]:
+        """
+        获取种子的实际下载地址及下载时使用的Cookie
         """
         if not torrent.enclosure:
             logger.error(f"获取下载链接失败：{torrent.title}")
-            return None
+            return None, None
 
         brush_config = self.__get_brush_config(torrent.site_name)
 
-        # 上传限速
-        up_speed = int(brush_config.up_speed) if brush_config.up_speed else None
-        # 下载限速
-        down_speed = int(brush_config.dl_speed) if brush_config.dl_speed else None
-        # 保存地址
-        download_dir = brush_config.save_path or None
         # 获取下载链接
-        torrent_content = torrent.enclosure
+        torrent_url = torrent.enclosure
         # proxies
         proxies = settings.PROXY if torrent.site_proxy else None
         # cookie
         cookies = torrent.site_cookie
-        if torrent_content.startswith("["):
-            torrent_content = self.__get_redict_url(url=torrent_content,
-                                                    proxies=proxies,
-                                                    ua=torrent.site_ua,
-                                                    cookie=cookies)
+        if torrent_url.startswith("["):
+            if self._torrent_fetcher:
+                self._torrent_fetcher.acquire(site_key)
+            torrent_url = self.__get_redict_url(url=torrent_url,
+                                                proxies=proxies,
+                                                ua=torrent.site_ua,
+                                                cookie=cookies,
+                                                session=session)
             # 目前馒头请求实际种子时，不能传入Cookie
             cookies = None
-        if not torrent_content:
+        if not torrent_url:
             logger.error(f"获取下载链接失败：{torrent.title}")
-            return None
+            return None, None
 
         if brush_config.site_skip_tips:
-            torrent_content = self.__reset_download_url(torrent_url=torrent_content, site_id=torrent.site)
-            logger.debug(f"站点 {torrent.site_name} 已启用自动跳过提示，种子下载地址更新为 {torrent_content}")
+            torrent_url = self.__reset_download_url(torrent_url=torrent_url, site_id=torrent.site)
+            logger.debug(f"站点 {torrent.site_name} 已启用自动跳过提示，种子下载地址更新为 {torrent_url}")
+
+        return torrent_url, cookies
+
+    def __fetch_torrent_content(self, torrent: TorrentInfo, torrent_url: str, cookies: Optional[str],
+                                site_key: Any, session: Any = None) -> Any:
+        """
+        请求种子文件到内存，失败时返回种子地址，由下载器自行下载
+        """
+        if self._torrent_fetcher:
+            self._torrent_fetcher.acquire(site_key)
+        response = RequestUtils(cookies=cookies,
+                                proxies=settings.PROXY if torrent.site_proxy else None,
+                                ua=torrent.site_ua,
+                                session=session).get_res(url=torrent_url)
+        if response and response.ok:
+            return response.content
+        logger.error("尝试通过MP下载种子失败，继续尝试传递种子地址到下载器进行下载")
+        return torrent_url
+
+    def __add_torrent(self, torrent: TorrentInfo, torrent_content: Any, cookies: Optional[str]) -> Optional[str]:
+        """
+        添加下载任务
+        """
+        if not torrent_content:
+            return None
+
+        brush_config = self.__get_brush_config(torrent.site_name)
+
+        # 上传限速
+        up_speed = int(brush_config.up_speed) if brush_config.up_speed else None
+        # 下载限速
+        down_speed = int(brush_config.dl_speed) if brush_config.dl_speed else None
+        # 保存地址
+        download_dir = brush_config.save_path or None
 
         downloader = self.downloader
         if not downloader:
@@ -3191,57 +3629,36 @@ class BrushFlow(_PluginBase):
             down_speed = down_speed * 1024 if down_speed else None
             # 生成随机Tag
             tag = StringUtils.generate_random_str(10)
-            # 如果开启代理下载以及种子地址不是磁力地址，则请求种子到内存再传入下载器
-            if not torrent_content.startswith("magnet"):
-                response = RequestUtils(cookies=cookies,
-                                        proxies=proxies,
-                                        ua=torrent.site_ua).get_res(url=torrent_content)
-                if response and response.ok:
-                    torrent_content = response.content
-                else:
-                    logger.error("尝试通过MP下载种子失败，继续尝试传递种子地址到下载器进行下载")
-            if torrent_content:
-                state = downloader.add_torrent(content=torrent_content,
-                                               download_dir=download_dir,
-                                               cookie=cookies,
-                                               category=brush_config.qb_category,
-                                               tag=["已整理", brush_config.brush_tag, tag],
-                                               upload_limit=up_speed,
-                                               download_limit=down_speed)
-                if not state:
+            state = downloader.add_torrent(content=torrent_content,
+                                           download_dir=download_dir,
+                                           cookie=cookies,
+                                           category=brush_config.qb_category,
+                                           tag=["已整理", brush_config.brush_tag, tag],
+                                           upload_limit=up_speed,
+                                           download_limit=down_speed)
+            if not state:
+                return None
+            else:
+                # 获取种子Hash
+                torrent_hash = downloader.get_torrent_id_by_tag(tags=tag)
+                if not torrent_hash:
+                    logger.error(f"{brush_config.downloader} 获取种子Hash失败，详细信息请查看 README")
                     return None
-                else:
-                    # 获取种子Hash
-                    torrent_hash = downloader.get_torrent_id_by_tag(tags=tag)
-                    if not torrent_hash:
-                        logger.error(f"{brush_config.downloader} 获取种子Hash失败，详细信息请查看 README")
-                        return None
-                    return torrent_hash
-            return None
+                return torrent_hash
 
         elif downloader_helper.is_downloader("transmission", service=self.service_info):
-            # 如果开启代理下载以及种子地址不是磁力地址，则请求种子到内存再传入下载器
-            if not torrent_content.startswith("magnet"):
-                response = RequestUtils(cookies=cookies,
-                                        proxies=proxies,
-                                        ua=torrent.site_ua).get_res(url=torrent_content)
-                if response and response.ok:
-                    torrent_content = response.content
-                else:
-                    logger.error("尝试通过MP下载种子失败，继续尝试传递种子地址到下载器进行下载")
-            if torrent_content:
-                torrent = downloader.add_torrent(content=torrent_content,
-                                                 download_dir=download_dir,
-                                                 cookie=cookies,
-                                                 labels=["已整理", brush_config.brush_tag])
-                if not torrent:
-                    return None
-                else:
-                    if brush_config.up_speed or brush_config.dl_speed:
-                        downloader.change_torrent(hash_string=torrent.hashString,
-                                                  upload_limit=up_speed,
-                                                  download_limit=down_speed)
-                    return torrent.hashString
+            torrent = downloader.add_torrent(content=torrent_content,
+                                             download_dir=download_dir,
+                                             cookie=cookies,
+                                             labels=["已整理", brush_config.brush_tag])
+            if not torrent:
+                return None
+            else:
+                if brush_config.up_speed or brush_config.dl_speed:
+                    downloader.change_torrent(hash_string=torrent.hashString,
+                                              upload_limit=up_speed,
+                                              download_limit=down_speed)
+                return torrent.hashString
         return None
 
     def __qb_torrents_reannounce(self, torrent_hashes: List[str]):
@@ -3273,27 +3690,6 @@ class BrushFlow(_PluginBase):
             print(str(e))
             return ""
 
-    def __get_all_hashes(self, torrents):
-        """
-        获取torrents列表中所有种子的Hash值
-
-        :param torrents: 包含种子信息的列表
-        :return: 包含所有Hash值的列表
-        """
-        try:
-            all_hashes = []
-            for torrent in torrents:
-                # 根据下载器类型获取Hash值
-                hash_value = torrent.get("hash") if DownloaderHelper().is_downloader("qbittorrent",
-                                                                                     service=self.service_info) \
-                    else torrent.hashString
-                if hash_value:
-                    all_hashes.append(hash_value)
-            return all_hashes
-        except Exception as e:
-            print(str(e))
-            return []
-
     def __get_label(self, torrent: Any):
         """
         获取种子标签
@@ -3571,49 +3967,48 @@ class BrushFlow(_PluginBase):
         获取任务中的种子总大小
         """
         # 读取种子记录
-        task_info = self.get_data("torrents") or {}
+        task_info = self._torrent_store.tasks
         if not task_info:
             return 0
         total_size = sum([task.get("size") or 0 for task in task_info.values()])
         return total_size
 
-    def __get_average_bandwidth(self, sample_count: int = 5, interval: float = 3.0) \
-            -> Tuple[Optional[float], Optional[float]]:
-        """
-        多次采样上传和下载带宽，取平均值
-        """
-        upload_speeds = []
-        download_speeds = []
-        start_time = time.time()
-        for _ in range(sample_count):
-            downloader_info = self.__get_downloader_info()
-            if downloader_info:
-                upload_speeds.append(downloader_info.upload_speed or 0)
-                download_speeds.append(downloader_info.download_speed or 0)
-            # 采样间隔
-            time.sleep(interval)
-        end_time = time.time()
-        total_duration = end_time - start_time
-        if not upload_speeds or not download_speeds:
-            return None, None
-        avg_upload_speed = sum(upload_speeds) / len(upload_speeds) if upload_speeds else 0
-        avg_download_speed = sum(download_speeds) / len(download_speeds) if download_speeds else 0
-        logger.debug(f"平均上传带宽 {StringUtils.str_filesize(avg_upload_speed)}, "
-                     f"平均下载带宽 {StringUtils.str_filesize(avg_download_speed)}, "
-                     f"采样次数={sample_count}, 时长={total_duration:.2f} 秒")
+    def __get_average_bandwidth(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        获取后台采样的平均上传和下载带宽，尚无采样数据时立即采样一次
+        """
+        sampler = self._bandwidth_sampler
+        if not sampler:
+            return self.__sample_bandwidth() or (None, None)
+        avg_upload_speed, avg_download_speed = sampler.get_average()
+        if avg_upload_speed is None or avg_download_speed is None:
+            sampler.sample()
+            avg_upload_speed, avg_download_speed = sampler.get_average()
+        if avg_upload_speed is not None and avg_download_speed is not None:
+            logger.debug(f"平均上传带宽 {StringUtils.str_filesize(avg_upload_speed)}, "
+                         f"平均下载带宽 {StringUtils.str_filesize(avg_download_speed)}")
         return avg_upload_speed, avg_download_speed
 
+    def __sample_bandwidth(self) -> Optional[Tuple[float, float]]:
+        """
+        采样一次当前的上传和下载带宽
+        """
+        downloader_info = self.__get_downloader_info()
+        if not downloader_info:
+            return None
+        return downloader_info.upload_speed or 0, downloader_info.download_speed or 0
+
     def __get_downloader_info(self) -> schemas.DownloaderInfo:
         """
-        获取下载器实时信息（所有下载器）
+        获取下载器实时信息（刷流下载器）
         """
         ret_info = schemas.DownloaderInfo()
 
-        downloader = self.downloader
-        if not downloader:
+        brush_config = self.__get_brush_config()
+        if not brush_config or not brush_config.downloader:
             return ret_info
 
-        transfer_infos = self.chain.run_module("downloader_info")
+        transfer_infos = self.chain.run_module("downloader_info", downloader=brush_config.downloader)
         if transfer_infos:
             for transfer_info in transfer_infos:
                 ret_info.download_speed += transfer_info.download_speed
@@ -3623,6 +4018,27 @@ class BrushFlow(_PluginBase):
 
         return ret_info
 
+    def __get_seeding_torrents(self, torrent_hashes: List[str]) -> Tuple[List[Any], bool]:
+        """
+        获取下载器中的种子，开启增量同步时从种子状态镜像中获取，同步失败则回退为全量获取
+        """
+        brush_config = self.__get_brush_config()
+        downloader = self.downloader
+        if not downloader:
+            return [], True
+
+        if brush_config.delta_sync and self._torrent_mirror:
+            is_qbittorrent = DownloaderHelper().is_downloader("qbittorrent", service=self.service_info)
+            torrents = self._torrent_mirror.sync(downloader=downloader, is_qbittorrent=is_qbittorrent,
+                                                 ids=torrent_hashes)
+            if torrents is not None:
+                logger.debug(f"已增量同步下载器种子状态，当前镜像种子数 {len(torrents)}")
+                return torrents, False
+            logger.warning("增量同步下载器种子状态失败，回退为全量获取")
+
+        torrents, error = downloader.get_torrents()
+        return torrents or [], error
+
     def __get_downloading_count(self) -> int:
         """
         获取正在下载的任务数量
@@ -3633,6 +4049,15 @@ class BrushFlow(_PluginBase):
             if not downloader:
                 return 0
 
+            if brush_config.delta_sync and self._torrent_mirror:
+                is_qbittorrent = DownloaderHelper().is_downloader("qbittorrent", service=self.service_info)
+                torrent_hashes = [torrent_hash for torrent_hash, task in self._torrent_store.tasks.items()
+                                  if not task.get("deleted")]
+                if self._torrent_mirror.sync(downloader=downloader, is_qbittorrent=is_qbittorrent,
+                                             ids=torrent_hashes) is not None:
+                    return self._torrent_mirror.get_downloading_count(is_qbittorrent=is_qbittorrent,
+                                                                      tag=brush_config.brush_tag)
+
             torrents = downloader.get_downloading_torrents(tags=brush_config.brush_tag)
             if torrents is None:
                 logger.warning("获取下载数量失败，可能是下载器连接发生异常")
@@ -3648,16 +4073,12 @@ class BrushFlow(_PluginBase):
         """
         将字符串转换为时间，并计算与当前时间差）（分钟）
         """
-        try:
-            if not pubdate:
-                return 0
-            pubdate = pubdate.replace("T", " ").replace("Z", "")
-            pubdate = datetime.strptime(pubdate, "%Y-%m-%d %H:%M:%S")
-            now = datetime.now()
-            return (now - pubdate).total_seconds() // 60
-        except Exception as e:
-            logger.error(f"发布时间 {pubdate} 获取分钟失败，错误详情: {e}")
+        if not pubdate:
+            return 0
+        parsed = parse_pubdate(pubdate)
+        if not parsed:
             return 0
+        return (datetime.now() - parsed).total_seconds() // 60
 
     @staticmethod
     def __adjust_site_pubminutes(pub_minutes: float, torrent: TorrentInfo) -> float:
@@ -3761,8 +4182,20 @@ class BrushFlow(_PluginBase):
         unique_titles = {title for titles in self._subscribe_infos.values() for title in titles}
         return unique_titles
 
+    def __get_subscribe_matcher(self) -> SubscribeTitleMatcher:
+        """
+        获取订阅标题匹配器，仅当订阅标题发生变化时才重新构建
+        """
+        subscribe_titles = self.__get_subscribe_titles()
+        if self._subscribe_matcher is None or self._subscribe_matcher.titles != subscribe_titles:
+            start_time = time.time()
+            self._subscribe_matcher = SubscribeTitleMatcher(titles=subscribe_titles)
+            logger.debug(f"订阅标题匹配器已重建，标题数 {len(subscribe_titles)}，"
+                         f"耗时 {(time.time() - start_time) * 1000:.1f} 毫秒")
+        return self._subscribe_matcher
+
     @staticmethod
-    def __filter_torrents_contains_subscribe(torrents: Any, subscribe_titles: Set[str]):
+    def __filter_torrents_contains_subscribe(torrents: Any, subscribe_matcher: SubscribeTitleMatcher):
         # 初始化两个列表，一个用于收集未被排除的种子，一个用于记录被排除的种子
         included_torrents = []
         excluded_torrents = []
@@ -3773,10 +4206,11 @@ class BrushFlow(_PluginBase):
             title = torrent.title or ''
             description = torrent.description or ''
 
-            if any(subscribe_title in title or subscribe_title in description for subscribe_title in subscribe_titles):
+            subscribe_title = subscribe_matcher.first_match(title, description)
+            if subscribe_title:
                 # 如果种子的标题或描述包含订阅标题中的任一项，则记录为被排除
                 excluded_torrents.append(torrent)
-                logger.info(f"命中订阅内容，排除种子：{title}|{description}")
+                logger.info(f"命中订阅内容 {subscribe_title}，排除种子：{title}|{description}")
             else:
                 # 否则，收集为未被排除的种子
                 included_torrents.append(torrent)
@@ -3833,7 +4267,7 @@ class BrushFlow(_PluginBase):
             return
 
         # 用于存储已删除的数据
-        archived_tasks: Dict[str, dict] = self.get_data("archived") or {}
+        archived_tasks: Dict[str, dict] = self._archived_store.tasks
 
         current_time = time.time()
         archive_threshold_seconds = self._brush_config.auto_archive_days * 86400  # 将天数转换为秒数
@@ -3861,16 +4295,16 @@ class BrushFlow(_PluginBase):
         for key in keys_to_delete:
             del torrent_tasks[key]
 
-        self.save_data("archived", archived_tasks)
+        self._archived_store.flush()
 
     def __clear_tasks(self):
         """
         清除统计数据
         彻底重置所有刷流数据，如当前还存在正在做种的刷流任务，待定时检查任务执行后，会自动纳入刷流管理
         """
-        self.save_data("torrents", {})
-        self.save_data("archived", {})
-        self.save_data("unmanaged", {})
+        self._torrent_store.clear()
+        self._archived_store.clear()
+        self._unmanaged_store.clear()
         self.save_data("statistic", {})
 
     def __get_statistic_info(self) -> Dict[str, int]:
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, Tuple
+
+from app.log import logger
+
+
+class BandwidthSampler:
+    """
+    下载器带宽后台采样器，持续维护最近若干次的上传、下载速度
+    """
+
+    def __init__(self, sample_func: Callable[[], Optional[Tuple[float, float]]],
+                 sample_count: int = 5, interval: float = 3.0):
+        """
+        :param sample_func: 采样函数，返回 (上传速度, 下载速度)，单位 Byte/s，获取失败时返回 None
+        :param sample_count: 滑动窗口内保留的采样次数
+        :param interval: 采样间隔（秒）
+        """
+        self._sample_func = sample_func
+        self._sample_count = sample_count
+        self._interval = interval
+        self._samples = deque(maxlen=sample_count)
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self):
+        """
+        启动后台采样
+        """
+        if self.running:
+            return
+        self._event.clear()
+        self._thread = threading.Thread(target=self.__run, name="BrushFlow-BandwidthSampler", daemon=True)
+        self._thread.start()
+        logger.debug(f"带宽采样服务启动，采样次数 {self._sample_count}，采样间隔 {self._interval} 秒")
+
+    def stop(self):
+        """
+        停止后台采样
+        """
+        self._event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self._interval + 1)
+        self._thread = None
+        with self._lock:
+            self._samples.clear()
+
+    def __run(self):
+        while not self._event.is_set():
+            self.sample()
+            self._event.wait(self._interval)
+
+    def sample(self):
+        """
+        执行一次采样并加入滑动窗口
+        """
+        try:
+            speeds = self._sample_func()
+        except Exception as e:
+            logger.error(f"带宽采样失败，错误详情: {e}")
+            return
+        if not speeds:
+            return
+        with self._lock:
+            self._samples.append((time.time(), speeds[0] or 0, speeds[1] or 0))
+
+    def get_average(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        获取滑动窗口内的平均上传、下载速度，窗口内没有有效采样时返回 (None, None)
+        """
+        # 超过两个完整窗口时长的采样视为过期，避免采样异常时沿用旧数据
+        expire_time = time.time() - self._sample_count * self._interval * 2
+        with self._lock:
+            samples = [sample for sample in self._samples if sample[0] >= expire_time]
+        if not samples:
+            return None, None
+        avg_upload_speed = sum(sample[1] for sample in samples) / len(samples)
+        avg_download_speed = sum(sample[2] for sample in samples) / len(samples)
+        return avg_upload_speed, avg_download_speed
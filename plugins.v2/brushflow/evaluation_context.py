@@ -0,0 +1,56 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Optional
+
+from app.log import logger
+
+
+@lru_cache(maxsize=4096)
+def parse_pubdate(pubdate: str) -> Optional[datetime]:
+    """
+    解析种子发布时间，解析结果会被缓存，解析失败时返回 None
+    """
+    try:
+        return datetime.strptime(pubdate.replace("T", " ").replace("Z", ""), "%Y-%m-%d %H:%M:%S")
+    except Exception as e:
+        logger.error(f"发布时间 {pubdate} 获取分钟失败，错误详情: {e}")
+        return None
+
+
+class BrushEvaluationContext:
+    """
+    单次刷流周期内的条件评估上下文，缓存下载任务数及当前时间，避免每个种子都请求下载器
+    """
+
+    def __init__(self, downloading_count_func: Callable[[], int]):
+        """
+        :param downloading_count_func: 获取下载器中正在下载的任务数量的函数，仅在首次使用时调用
+        """
+        self._downloading_count_func = downloading_count_func
+        self._downloading_count: Optional[int] = None
+        # 同一周期内统一使用相同的当前时间计算发布时间差
+        self.now = datetime.now()
+
+    @property
+    def downloading_count(self) -> int:
+        if self._downloading_count is None:
+            self._downloading_count = self._downloading_count_func() or 0
+        return self._downloading_count
+
+    def add_downloading(self, count: int = 1):
+        """
+        新增下载任务后在本地更新下载任务数
+        """
+        if self._downloading_count is not None:
+            self._downloading_count += count
+
+    def get_pubminutes(self, pubdate: Optional[str]) -> float:
+        """
+        计算发布时间与当前时间的差（分钟）
+        """
+        if not pubdate:
+            return 0
+        parsed = parse_pubdate(pubdate)
+        if not parsed:
+            return 0
+        return (self.now - parsed).total_seconds() // 60
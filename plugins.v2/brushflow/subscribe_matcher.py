@@ -0,0 +1,83 @@
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+
+class SubscribeTitleMatcher:
+    """
+    订阅标题多模式匹配（Aho-Corasick 自动机），一次遍历即可找出文本中包含的所有订阅标题
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        self.titles: FrozenSet[str] = frozenset(title for title in titles if title)
+        # 状态转移表
+        self._goto: List[Dict[str, int]] = [{}]
+        # 失败指针
+        self._fail: List[int] = [0]
+        # 每个状态可匹配到的订阅标题（已合并失败指针链上的结果）
+        self._outputs: List[FrozenSet[str]] = [frozenset()]
+        self.__build()
+
+    def __build(self):
+        # 构建字典树
+        outputs: List[Set[str]] = [set()]
+        for title in self.titles:
+            state = 0
+            for char in title:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(title)
+
+        # 广度优先构建失败指针
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._outputs = [frozenset(output) for output in outputs]
+
+    def __next_state(self, state: int, char: str) -> int:
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(char, 0)
+
+    def search(self, text: Optional[str]) -> Set[str]:
+        """
+        返回文本中包含的所有订阅标题
+        """
+        matches = set()
+        if not text or not self.titles:
+            return matches
+        state = 0
+        for char in text:
+            state = self.__next_state(state, char)
+            if self._outputs[state]:
+                matches.update(self._outputs[state])
+        return matches
+
+    def first_match(self, *texts: Optional[str]) -> Optional[str]:
+        """
+        返回任一文本中最先命中的订阅标题，没有命中时返回 None
+        """
+        if not self.titles:
+            return None
+        for text in texts:
+            if not text:
+                continue
+            state = 0
+            for char in text:
+                state = self.__next_state(state, char)
+                if self._outputs[state]:
+                    return next(iter(self._outputs[state]))
+        return None
@@ -0,0 +1,77 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.plugins.brushflow.task_store import BrushTaskStore
+
+
+class BrushTaskIndex:
+    """
+    刷流任务排序索引，仅在任务数据版本变化时重新构建，用于分页查询
+    """
+
+    # 支持的排序字段及取值方法
+    SORT_KEYS: Dict[str, Callable[[dict], Any]] = {
+        "time": lambda task: task.get("time") or 0,
+        "site": lambda task: task.get("site_name") or "",
+        "title": lambda task: task.get("title") or "",
+        "size": lambda task: task.get("size") or 0,
+        "uploaded": lambda task: task.get("uploaded") or 0,
+        "downloaded": lambda task: task.get("downloaded") or 0,
+        "ratio": lambda task: task.get("ratio") or 0,
+    }
+
+    def __init__(self, store: BrushTaskStore):
+        self._store = store
+        self._version: Optional[int] = None
+        # 排序字段 -> 按升序排列的任务Hash
+        self._sorted: Dict[str, List[str]] = {}
+
+    def __sorted_hashes(self, sort: str) -> List[str]:
+        """
+        获取指定字段升序排列的任务Hash，数据版本变化时使全部索引失效
+        """
+        if self._version != self._store.version:
+            self._sorted = {}
+            self._version = self._store.version
+        hashes = self._sorted.get(sort)
+        if hashes is None:
+            tasks = self._store.tasks
+            key_func = self.SORT_KEYS[sort]
+            hashes = sorted(list(tasks.keys()), key=lambda task_hash: key_func(tasks.get(task_hash) or {}))
+            self._sorted[sort] = hashes
+        return hashes
+
+    def query(self, page: int = 1, count: int = 50, sort: str = "time", desc: bool = True,
+              site: str = None, status: str = None) -> Tuple[int, List[Tuple[str, dict]]]:
+        """
+        分页查询任务
+        :param page: 页码，从1开始，小于1时返回全部
+        :param count: 每页数量
+        :param sort: 排序字段
+        :param desc: 是否倒序
+        :param site: 按站点名称筛选
+        :param status: 按状态筛选，active 正常，deleted 已删除
+        :return: 符合条件的总数，当前页的 (Hash, 任务) 列表
+        """
+        if sort not in self.SORT_KEYS:
+            sort = "time"
+        hashes = self.__sorted_hashes(sort)
+        tasks = self._store.tasks
+        offset = (page - 1) * count if page > 0 else 0
+        limit = count if page > 0 else None
+
+        total = 0
+        items = []
+        for task_hash in (reversed(hashes) if desc else hashes):
+            task = tasks.get(task_hash)
+            if not task:
+                continue
+            if site and task.get("site_name") != site:
+                continue
+            if status == "deleted" and not task.get("deleted"):
+                continue
+            if status == "active" and task.get("deleted"):
+                continue
+            if total >= offset and (limit is None or len(items) < limit):
+                items.append((task_hash, task))
+            total += 1
+        return total, items
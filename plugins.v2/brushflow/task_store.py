@@ -0,0 +1,185 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.db import SessionFactory
+from app.db.models import PluginData
+from app.log import logger
+
+
+class BrushTaskStore:
+    """
+    刷流任务存储，每个任务以独立的键持久化，保存时仅写入发生变化的任务
+    """
+
+    # 每次检查都会刷新的统计字段，仅这些字段变化时按间隔延迟写入
+    VOLATILE_FIELDS = ("downloaded", "uploaded", "ratio", "seeding_time")
+
+    def __init__(self, plugin: Any, namespace: str, volatile_interval: float = 1800,
+                 clock: Callable[[], float] = time.time):
+        """
+        :param plugin: 插件实例，用于调用 get_data/save_data/del_data
+        :param namespace: 存储命名空间，如 torrents、unmanaged、archived
+        :param volatile_interval: 仅统计字段变化的任务的最短写入间隔（秒）
+        :param clock: 时间函数，离线模拟时可传入模拟时钟
+        """
+        self._plugin = plugin
+        self._namespace = namespace
+        self._prefix = f"{namespace}:"
+        self._lock = threading.RLock()
+        # 内存中的任务数据，外部直接读写
+        self._tasks: Optional[Dict[str, dict]] = None
+        # 最近一次持久化时的任务副本，用于比对变化
+        self._shadow: Dict[str, dict] = {}
+        # 数据版本，每次持久化的数据发生变化时递增，用于索引等缓存失效
+        self._version = 0
+        self._volatile_interval = volatile_interval
+        self._clock = clock
+        self._volatile_flush_time = clock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def tasks(self) -> Dict[str, dict]:
+        """
+        获取任务数据，首次访问时从数据库加载
+        """
+        with self._lock:
+            if self._tasks is None:
+                self.__load()
+            return self._tasks
+
+    def __load(self):
+        """
+        从数据库加载任务，兼容旧版本整体保存的数据
+        """
+        tasks: Dict[str, dict] = {}
+        shadow: Dict[str, dict] = {}
+        for plugin_data in self._plugin.get_data() or []:
+            key = getattr(plugin_data, "key", None)
+            if not key or not key.startswith(self._prefix):
+                continue
+            value = plugin_data.value
+            # 4.3.15 批量写入时以JSON字符串保存，读取后不加入副本，下次保存时改写为与 save_data 一致的格式
+            encoded = isinstance(value, str)
+            if encoded:
+                try:
+                    value = json.loads(value)
+                except Exception as e:
+                    logger.error(f"解析刷流任务数据 {key} 失败，错误详情: {e}")
+                    continue
+            if isinstance(value, dict):
+                task_hash = key[len(self._prefix):]
+                tasks[task_hash] = value
+                if not encoded:
+                    shadow[task_hash] = dict(value)
+
+        self._tasks = tasks
+        self._shadow = shadow
+
+        # 迁移旧版本以整个字典保存的数据
+        legacy_tasks = self._plugin.get_data(self._namespace)
+        if isinstance(legacy_tasks, dict):
+            logger.info(f"正在迁移刷流任务数据 {self._namespace}，共 {len(legacy_tasks)} 条")
+            for task_hash, task in legacy_tasks.items():
+                self._tasks.setdefault(task_hash, task)
+            self.flush()
+            self._plugin.del_data(self._namespace)
+
+    @classmethod
+    def __stable_fields(cls, task: dict) -> dict:
+        """
+        去除统计字段后的任务数据
+        """
+        return {key: value for key, value in task.items() if key not in cls.VOLATILE_FIELDS}
+
+    def flush(self, force: bool = False) -> Tuple[int, int]:
+        """
+        持久化发生变化的任务，返回写入的任务数及写入数据量（字节）
+        仅统计字段变化的任务按间隔批量写入，避免每个检查周期重写所有活动任务
+        :param force: 立即写入所有变化，如插件停止时
+        """
+        with self._lock:
+            if self._tasks is None:
+                return 0, 0
+
+            now = self._clock()
+            volatile_due = force or now - self._volatile_flush_time >= self._volatile_interval
+            written_count, written_bytes, deferred_count = 0, 0, 0
+            # 键 -> 待写入的任务数据
+            dirty_tasks: Dict[str, dict] = {}
+            for task_hash, task in self._tasks.items():
+                shadow = self._shadow.get(task_hash)
+                if shadow == task:
+                    continue
+                if not volatile_due and shadow is not None \
+                        and self.__stable_fields(shadow) == self.__stable_fields(task):
+                    deferred_count += 1
+                    continue
+                dirty_tasks[f"{self._prefix}{task_hash}"] = task
+                self._shadow[task_hash] = dict(task)
+
+            if dirty_tasks:
+                self._save_batch(dirty_tasks)
+                written_count += len(dirty_tasks)
+                written_bytes += sum(len(json.dumps(task, ensure_ascii=False).encode("utf-8"))
+                                     for task in dirty_tasks.values())
+
+            for task_hash in set(self._shadow) - set(self._tasks):
+                self._plugin.del_data(f"{self._prefix}{task_hash}")
+                del self._shadow[task_hash]
+                written_count += 1
+
+            if volatile_due:
+                self._volatile_flush_time = now
+            # 延迟写入的统计数据在内存中已变化，同样需要使索引等缓存失效
+            if written_count or deferred_count:
+                self._version += 1
+            if written_count:
+                logger.debug(f"刷流任务数据 {self._namespace} 共 {len(self._tasks)} 条，"
+                             f"本次写入 {written_count} 条，数据量 {written_bytes} 字节，"
+                             f"延迟写入统计数据 {deferred_count} 条")
+            return written_count, written_bytes
+
+    def _save_batch(self, items: Dict[str, dict], chunk_size: int = 500):
+        """
+        在同一个数据库会话中批量写入任务，失败时改为逐条写入
+        与 save_data 写入相同的格式：插件ID为插件类名，任务数据直接写入JSON字段
+        """
+        if len(items) == 1:
+            for key, value in items.items():
+                self._plugin.save_data(key, value)
+            return
+        plugin_id = self._plugin.__class__.__name__
+        try:
+            with SessionFactory() as db:
+                keys = list(items)
+                existing: Dict[str, PluginData] = {}
+                for i in range(0, len(keys), chunk_size):
+                    rows = db.query(PluginData) \
+                        .filter(PluginData.plugin_id == plugin_id, PluginData.key.in_(keys[i:i + chunk_size])) \
+                        .all()
+                    for row in rows:
+                        existing[row.key] = row
+                for key, value in items.items():
+                    row = existing.get(key)
+                    if row:
+                        row.value = dict(value)
+                    else:
+                        db.add(PluginData(plugin_id=plugin_id, key=key, value=dict(value)))
+                db.commit()
+        except Exception as e:
+            logger.warn(f"批量保存刷流任务数据 {self._namespace} 失败：{str(e)}，改为逐条保存")
+            for key, value in items.items():
+                self._plugin.save_data(key, value)
+
+    def clear(self):
+        """
+        清空任务数据
+        """
+        with self._lock:
+            self.tasks.clear()
+            self.flush(force=True)
@@ -0,0 +1,115 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+import requests
+
+from app.log import logger
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class TorrentFetcher:
+    """
+    种子文件并发获取，每个站点复用一个保持连接的会话，并限制同一站点的请求间隔
+    """
+
+    def __init__(self, max_workers: int = 4, site_interval: float = 0.5):
+        """
+        :param max_workers: 同一批次并发获取的最大线程数
+        :param site_interval: 同一站点两次请求之间的最小间隔（秒）
+        """
+        self._max_workers = max_workers
+        self._site_interval = site_interval
+        self._lock = threading.Lock()
+        self._sessions: Dict[Any, requests.Session] = {}
+        # 站点 -> (限速锁, 下一次允许请求的时间)
+        self._site_locks: Dict[Any, threading.Lock] = {}
+        self._next_times: Dict[Any, float] = {}
+
+    def get_session(self, site_key: Any) -> requests.Session:
+        """
+        获取站点的会话，不存在时创建
+        """
+        with self._lock:
+            session = self._sessions.get(site_key)
+            if session is None:
+                session = requests.Session()
+                self._sessions[site_key] = session
+            return session
+
+    def acquire(self, site_key: Any):
+        """
+        等待直至可以向站点发起下一次请求
+        """
+        with self._lock:
+            site_lock = self._site_locks.setdefault(site_key, threading.Lock())
+        with site_lock:
+            wait_time = self._next_times.get(site_key, 0) - time.monotonic()
+            if wait_time > 0:
+                time.sleep(wait_time)
+            self._next_times[site_key] = time.monotonic() + self._site_interval
+
+    def map(self, site_key: Any, items: List[T], func: Callable[[T, requests.Session], R]) -> List[Optional[R]]:
+        """
+        并发处理同一站点的多个任务，结果顺序与输入一致，单个任务异常时结果为 None
+        :param site_key: 站点标识，用于区分会话及限速
+        :param items: 待处理的任务
+        :param func: 处理函数，参数为任务及站点会话，函数内每次请求站点前需调用 acquire
+        """
+        if not items:
+            return []
+        session = self.get_session(site_key)
+
+        def run(item: T) -> Optional[R]:
+            try:
+                return func(item, session)
+            except Exception as e:
+                logger.error(f"获取种子文件失败，错误详情: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(items)),
+                                thread_name_prefix="BrushFlow-Fetch") as executor:
+            return list(executor.map(run, items))
+
+    def close(self):
+        """
+        关闭所有会话
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                try:
+                    session.close()
+                except Exception as e:
+                    logger.debug(f"关闭站点会话失败，错误详情: {e}")
+            self._sessions.clear()
+            self._site_locks.clear()
+            self._next_times.clear()
+
+
+class StageMetrics:
+    """
+    分阶段耗时统计
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 阶段 -> [次数, 总耗时, 最大耗时]
+        self._stages: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            stat = self._stages.setdefault(stage, [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+
+    def summary(self) -> str:
+        """
+        输出各阶段的次数、平均及最大耗时
+        """
+        with self._lock:
+            return "，".join(f"{stage} {int(count)} 次，平均 {total / count * 1000:.0f} ms，最大 {peak * 1000:.0f} ms"
+                            for stage, (count, total, peak) in self._stages.items() if count)
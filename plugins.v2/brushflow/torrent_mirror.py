@@ -0,0 +1,96 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.log import logger
+
+
+class TorrentStateMirror:
+    """
+    下载器种子状态的内存镜像，qBittorrent 通过 sync/maindata 增量同步，Transmission 仅拉取指定种子的必要字段
+    """
+
+    # qBittorrent 中视为正在下载的状态，与 WebUI 中「下载中」筛选保持一致
+    QB_DOWNLOADING_STATES = {
+        "downloading", "metaDL", "forcedMetaDL", "forcedDL", "stalledDL",
+        "checkingDL", "queuedDL", "pausedDL", "stoppedDL"
+    }
+    # Transmission 中视为正在下载的状态
+    TR_DOWNLOADING_STATES = {"downloading", "download pending"}
+    # Transmission 需要获取的字段
+    TR_FIELDS = [
+        "id", "hashString", "name", "status", "labels", "percentDone", "totalSize", "uploadRatio",
+        "addedDate", "doneDate", "activityDate"
+    ]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # qBittorrent 增量同步的响应ID
+        self._rid = 0
+        self._torrents: Dict[str, Any] = {}
+
+    def sync(self, downloader: Any, is_qbittorrent: bool, ids: List[str] = None) -> Optional[List[Any]]:
+        """
+        同步种子状态并返回镜像中的种子列表，同步失败时返回 None
+        :param downloader: 下载器实例
+        :param is_qbittorrent: 是否为 qBittorrent
+        :param ids: Transmission 需要同步的种子Hash，qBittorrent 忽略该参数
+        """
+        with self._lock:
+            try:
+                if is_qbittorrent:
+                    self.__sync_qbittorrent(downloader)
+                else:
+                    self.__sync_transmission(downloader, ids)
+            except Exception as e:
+                logger.error(f"同步下载器种子状态失败，错误详情: {e}")
+                self._rid = 0
+                return None
+            return list(self._torrents.values())
+
+    def __sync_qbittorrent(self, downloader: Any):
+        qbc = getattr(downloader, "qbc", None)
+        if not qbc:
+            raise ConnectionError("qBittorrent 未连接")
+        maindata = qbc.sync_maindata(rid=self._rid)
+        if maindata.get("full_update"):
+            self._torrents = {}
+        for torrent_hash, torrent in (maindata.get("torrents") or {}).items():
+            state = self._torrents.get(torrent_hash)
+            if state is None:
+                state = {"hash": torrent_hash}
+                self._torrents[torrent_hash] = state
+            state.update(torrent)
+        for torrent_hash in maindata.get("torrents_removed") or []:
+            self._torrents.pop(torrent_hash, None)
+        self._rid = maindata.get("rid") or 0
+
+    def __sync_transmission(self, downloader: Any, ids: List[str] = None):
+        trc = getattr(downloader, "trc", None)
+        if not trc:
+            raise ConnectionError("Transmission 未连接")
+        if not ids:
+            self._torrents = {}
+            return
+        torrents = trc.get_torrents(ids=ids, arguments=self.TR_FIELDS) or []
+        self._torrents = {torrent.hashString: torrent for torrent in torrents}
+
+    def get_downloading_count(self, is_qbittorrent: bool, tag: str = None) -> int:
+        """
+        获取镜像中正在下载的种子数量
+        """
+        with self._lock:
+            count = 0
+            for torrent in self._torrents.values():
+                if is_qbittorrent:
+                    if torrent.get("state") not in self.QB_DOWNLOADING_STATES:
+                        continue
+                    if tag and tag not in [str(t).strip() for t in (torrent.get("tags") or "").split(",")]:
+                        continue
+                else:
+                    status = getattr(torrent.status, "value", torrent.status)
+                    if status not in self.TR_DOWNLOADING_STATES:
+                        continue
+                    if tag and tag not in (torrent.labels or []):
+                        continue
+                count += 1
+            return count
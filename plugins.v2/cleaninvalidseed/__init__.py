@@ -12,6 +12,8 @@ from app.core.event import eventmanager, Event
 from app.helper.downloader import DownloaderHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.cleaninvalidseed.path_index import ContentPathIndex, get_tree_size, get_tree_sizes
+from app.plugins.cleaninvalidseed.tracker_classifier import TrackerClassifier
 from app.schemas import NotificationType
 from app.schemas import ServiceInfo
 from app.schemas.types import EventType
@@ -26,7 +28,7 @@ class CleanInvalidSeed(_PluginBase):
     # 插件图标
     plugin_icon = "clean_a.png"
     # 插件版本
-    plugin_version = "2.0"
+    plugin_version = "2.3"
     # 插件作者
     plugin_author = "DzAvril"
     # 作者主页
@@ -347,10 +349,6 @@ class CleanInvalidSeed(_PluginBase):
                 continue
             logger.info(f"开始清理 {downloader_name} 无效做种...")
             all_torrents = self.get_all_torrents(service)
-            temp_invalid_torrents = []
-            # tracker未工作，但暂时不能判定为失效做种，需人工判断
-            tracker_not_working_torrents = []
-            working_tracker_set = set()
             exclude_categories = (
                 self._exclude_categories.split("\n") if self._exclude_categories else []
             )
@@ -360,38 +358,11 @@ class CleanInvalidSeed(_PluginBase):
             custom_msgs = (
                 self._custom_error_msg.split("\n") if self._custom_error_msg else []
             )
-            error_msgs = self._error_msg + custom_msgs
-            # 第一轮筛选出所有未工作的种子
-            for torrent in all_torrents:
-                trackers = torrent.trackers
-                is_invalid = True
-                is_tracker_working = False
-                for tracker in trackers:
-                    if tracker.get("tier") == -1:
-                        continue
-                    tracker_domian = StringUtils.get_url_netloc((tracker.get("url")))[1]
-                    # 有一个tracker工作即为有效做种
-                    if (tracker.get("status") == 2) or (tracker.get("status") == 3):
-                        is_tracker_working = True
-
-                    if not (
-                            (tracker.get("status") == 4) and (tracker.get("msg") in error_msgs)
-                    ):
-                        is_invalid = False
-                        working_tracker_set.add(tracker_domian)
-
-                    if self._more_logs:
-                        logger.info(
-                            f"处理 [{torrent.name}] tracker [{tracker_domian}]: 分类: [{torrent.category}], 标签: [{torrent.tags}], 状态: [{tracker.get('status')}], msg: [{tracker.get('msg')}], is_invalid: [{is_invalid}], is_working: [{is_tracker_working}]")
-                if is_invalid:
-                    temp_invalid_torrents.append(torrent)
-                elif not is_tracker_working:
-                    # 排除已暂停的种子
-                    if not torrent.state_enum.is_paused:
-                        tracker_not_working_torrents.append(torrent)
-
-            logger.info(f"初筛共有{len(temp_invalid_torrents)}个无效做种")
-            # 第二轮筛选出tracker有正常工作种子而当前种子未工作的，避免因临时关站或tracker失效导致误删的问题
+            # 单次遍历tracker，筛选出失效做种及tracker未工作的做种
+            classifier = TrackerClassifier(error_msgs=self._error_msg + custom_msgs, more_logs=self._more_logs)
+            invalid_torrents, temp_invalid_count, tracker_not_working_torrents = classifier.classify(all_torrents)
+
+            logger.info(f"初筛共有{temp_invalid_count}个无效做种")
             # 失效做种但通过种子分类排除的种子
             invalid_torrents_exclude_categories = []
             # 失效做种但通过种子标签排除的种子
@@ -399,57 +370,50 @@ class CleanInvalidSeed(_PluginBase):
             # 将invalid_torrents基本信息保存起来，在种子被删除后依然可以打印这些信息
             invalid_torrent_tuple_list = []
             deleted_torrent_tuple_list = []
-            for torrent in temp_invalid_torrents:
-                trackers = torrent.trackers
-                for tracker in trackers:
-                    if tracker.get("tier") == -1:
-                        continue
-                    tracker_domian = StringUtils.get_url_netloc((tracker.get("url")))[1]
-                    if tracker_domian in working_tracker_set:
-                        # tracker是正常的，说明该种子是无效的
-                        invalid_torrent_tuple_list.append(
+            for torrent, tracker_domian, tracker_msg in invalid_torrents:
+                # tracker是正常的，说明该种子是无效的
+                invalid_torrent_tuple_list.append(
+                    (
+                        torrent.name,
+                        torrent.category,
+                        torrent.tags,
+                        torrent.size,
+                        tracker_domian,
+                        tracker_msg,
+                    )
+                )
+                if self._delete_invalid_torrents or self._label_only:
+                    # 检查种子分类和标签是否排除
+                    is_excluded = False
+                    if torrent.category in exclude_categories:
+                        is_excluded = True
+                        invalid_torrents_exclude_categories.append(torrent)
+                    torrent_labels = [
+                        tag.strip() for tag in torrent.tags.split(",")
+                    ]
+                    for label in torrent_labels:
+                        if label in exclude_labels:
+                            is_excluded = True
+                            invalid_torrents_exclude_labels.append(torrent)
+                    if not is_excluded:
+                        if self._label_only:
+                            # 仅标记
+                            downloader_obj.set_torrents_tag(ids=torrent.get("hash"), tags=[
+                                self._label if self._label != "" else "无效做种"])
+                        else:
+                            # 只删除种子不删除文件，以防其它站点辅种
+                            downloader_obj.delete_torrents(False, torrent.get("hash"))
+                        # 标记已处理种子信息
+                        deleted_torrent_tuple_list.append(
                             (
                                 torrent.name,
                                 torrent.category,
                                 torrent.tags,
                                 torrent.size,
                                 tracker_domian,
-                                tracker.msg,
+                                tracker_msg,
                             )
                         )
-                        if self._delete_invalid_torrents or self._label_only:
-                            # 检查种子分类和标签是否排除
-                            is_excluded = False
-                            if torrent.category in exclude_categories:
-                                is_excluded = True
-                                invalid_torrents_exclude_categories.append(torrent)
-                            torrent_labels = [
-                                tag.strip() for tag in torrent.tags.split(",")
-                            ]
-                            for label in torrent_labels:
-                                if label in exclude_labels:
-                                    is_excluded = True
-                                    invalid_torrents_exclude_labels.append(torrent)
-                            if not is_excluded:
-                                if self._label_only:
-                                    # 仅标记
-                                    downloader_obj.set_torrents_tag(ids=torrent.get("hash"), tags=[
-                                        self._label if self._label != "" else "无效做种"])
-                                else:
-                                    # 只删除种子不删除文件，以防其它站点辅种
-                                    downloader_obj.delete_torrents(False, torrent.get("hash"))
-                                # 标记已处理种子信息
-                                deleted_torrent_tuple_list.append(
-                                    (
-                                        torrent.name,
-                                        torrent.category,
-                                        torrent.tags,
-                                        torrent.size,
-                                        tracker_domian,
-                                        tracker.msg,
-                                    )
-                                )
-                        break
             invalid_msg = f"检测到{len(invalid_torrent_tuple_list)}个失效做种\n"
             tracker_not_working_msg = f"检测到{len(tracker_not_working_torrents)}个tracker未工作做种，请检查种子状态\n"
 
@@ -472,35 +436,17 @@ class CleanInvalidSeed(_PluginBase):
 
             for index in range(len(tracker_not_working_torrents)):
                 torrent = tracker_not_working_torrents[index]
-                trackers = torrent.trackers
-                tracker_msg = ""
-                for tracker in trackers:
-                    if tracker.get("tier") == -1:
-                        continue
-                    tracker_domian = StringUtils.get_url_netloc((tracker.get("url")))[1]
-                    tracker_msg += f" {tracker_domian}：{tracker.msg} "
+                tracker_msg = classifier.format_trackers(torrent)
                 tracker_not_working_msg += f"{index + 1}. {torrent.name}，分类：{torrent.category}，标签：{torrent.tags}, 大小：{StringUtils.str_filesize(torrent.size)}，Trackers: {tracker_msg}\n"
 
             for index in range(len(invalid_torrents_exclude_categories)):
                 torrent = invalid_torrents_exclude_categories[index]
-                trackers = torrent.trackers
-                tracker_msg = ""
-                for tracker in trackers:
-                    if tracker.get("tier") == -1:
-                        continue
-                    tracker_domian = StringUtils.get_url_netloc((tracker.get("url")))[1]
-                    tracker_msg += f" {tracker_domian}：{tracker.msg} "
+                tracker_msg = classifier.format_trackers(torrent)
                 exclude_categories_msg += f"{index + 1}. {torrent.name}，分类：{torrent.category}，标签：{torrent.tags}, 大小：{StringUtils.str_filesize(torrent.size)}，Trackers: {tracker_msg}\n"
 
             for index in range(len(invalid_torrents_exclude_labels)):
                 torrent = invalid_torrents_exclude_labels[index]
-                trackers = torrent.trackers
-                tracker_msg = ""
-                for tracker in trackers:
-                    if tracker.get("tier") == -1:
-                        continue
-                    tracker_domian = StringUtils.get_url_netloc((tracker.get("url")))[1]
-                    tracker_msg += f" {tracker_domian}：{tracker.msg} "
+                tracker_msg = classifier.format_trackers(torrent)
                 exclude_labels_msg += f"{index + 1}. {torrent.name}，分类：{torrent.category}，标签：{torrent.tags}, 大小：{StringUtils.str_filesize(torrent.size)}，Trackers: {tracker_msg}\n"
 
             for index in range(len(deleted_torrent_tuple_list)):
@@ -587,12 +533,12 @@ class CleanInvalidSeed(_PluginBase):
             mp_path, qb_path = path.split(":")
             source_path_map[mp_path] = qb_path
             source_paths.append(mp_path)
-        # 所有做种源文件路径
-        content_path_set = set()
-        for torrent in all_torrents:
-            content_path_set.add(torrent.content_path)
+        # 所有做种源文件路径索引
+        content_path_index = ContentPathIndex(torrent.content_path for torrent in all_torrents)
 
         message = "检测未做种无效源文件：\n"
+        # 未做种的无效源文件
+        invalid_files: List[Path] = []
         for source_path_str in source_paths:
             source_path = Path(source_path_str)
             # 判断source_path是否存在
@@ -621,22 +567,20 @@ class CleanInvalidSeed(_PluginBase):
                 qb_path = (str(source_file)).replace(
                     source_path_str, source_path_map[source_path_str]
                 )
-                # todo: 优化性能
-                is_exist = False
-                for content_path in content_path_set:
-                    if qb_path in content_path:
-                        is_exist = True
-                        break
-
-                if not is_exist:
-                    deleted_file_cnt += 1
-                    message += f"{deleted_file_cnt}. {str(source_file)}\n"
-                    total_size += self.get_size(source_file)
-                    if self._delete_invalid_files:
-                        if source_file.is_file():
-                            source_file.unlink()
-                        elif source_file.is_dir():
-                            shutil.rmtree(source_file)
+                if not content_path_index.contains(qb_path):
+                    invalid_files.append(source_file)
+
+        # 并行统计无效源文件大小
+        file_sizes = get_tree_sizes(invalid_files)
+        for source_file in invalid_files:
+            deleted_file_cnt += 1
+            message += f"{deleted_file_cnt}. {str(source_file)}\n"
+            total_size += file_sizes.get(source_file, 0)
+            if self._delete_invalid_files:
+                if source_file.is_file():
+                    source_file.unlink()
+                elif source_file.is_dir():
+                    shutil.rmtree(source_file)
 
         message += f"检测到{deleted_file_cnt}个未做种的无效源文件，共占用{StringUtils.str_filesize(total_size)}空间。\n"
         if self._delete_invalid_files:
@@ -653,14 +597,7 @@ class CleanInvalidSeed(_PluginBase):
 
     @staticmethod
     def get_size(path: Path):
-        total_size = 0
-        if path.is_file():
-            return path.stat().st_size
-        # rglob 方法用于递归遍历所有文件和目录
-        for entry in path.rglob("*"):
-            if entry.is_file():
-                total_size += entry.stat().st_size
-        return total_size
+        return get_tree_size(str(path))
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         return [
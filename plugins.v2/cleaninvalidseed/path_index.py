@@ -0,0 +1,79 @@
+import os
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+
+class ContentPathIndex:
+    """
+    做种源文件路径索引，将路径排序后通过二分查找判断是否存在以指定路径开头的做种路径，
+    未命中时再按子串匹配，与原逐个判断 `path in content_path` 的结果一致
+    """
+
+    def __init__(self, content_paths: Iterable[str]):
+        self._paths: List[str] = sorted({path for path in content_paths if path})
+        # 以换行符连接所有路径，子串匹配只需一次查找
+        self._joined = "\n".join(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def contains_prefix(self, prefix: str) -> bool:
+        """
+        是否存在以 prefix 开头的做种路径
+        """
+        index = bisect_left(self._paths, prefix)
+        return index < len(self._paths) and self._paths[index].startswith(prefix)
+
+    def contains(self, path: str) -> bool:
+        """
+        是否存在包含 path 的做种路径，优先按前缀查找，未命中时回退为子串匹配
+        """
+        if not path:
+            return False
+        if self.contains_prefix(path):
+            return True
+        if "\n" in path:
+            return any(path in content_path for content_path in self._paths)
+        return path in self._joined
+
+
+def get_tree_size(path: str) -> int:
+    """
+    使用 os.scandir 统计文件或目录的总大小，不跟随符号链接
+    """
+    try:
+        if not os.path.isdir(path) or os.path.islink(path):
+            return os.stat(path, follow_symlinks=False).st_size
+    except OSError:
+        return 0
+    total_size = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total_size
+
+
+def get_tree_sizes(paths: List[Path], workers: int = 4) -> Dict[Path, int]:
+    """
+    并行统计多个文件或目录的大小
+    """
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths)),
+                            thread_name_prefix="CleanInvalidSeed-Size") as executor:
+        sizes = executor.map(lambda path: get_tree_size(str(path)), paths)
+        return dict(zip(paths, sizes))
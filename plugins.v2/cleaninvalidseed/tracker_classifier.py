@@ -0,0 +1,87 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple
+
+from app.log import logger
+from app.utils.string import StringUtils
+
+
+@lru_cache(maxsize=8192)
+def get_tracker_domain(url: str) -> str:
+    """
+    获取tracker地址的域名，同一地址只解析一次
+    """
+    return StringUtils.get_url_netloc(url)[1]
+
+
+class TrackerClassifier:
+    """
+    单次遍历种子的tracker，筛选失效做种及tracker未工作的做种
+    """
+
+    def __init__(self, error_msgs: Iterable[str], more_logs: bool = False):
+        """
+        :param error_msgs: 判定为失效做种的tracker错误信息
+        :param more_logs: 是否输出每个tracker的处理日志
+        """
+        self._error_msgs = frozenset(error_msgs)
+        self._more_logs = more_logs
+
+    def classify(self, torrents: List[Any]) -> Tuple[List[Tuple[Any, str, str]], int, List[Any]]:
+        """
+        筛选种子
+        :return: (失效做种及其命中的 (种子, tracker域名, tracker信息), 初筛无效做种数, tracker未工作的做种)
+        """
+        working_tracker_set = set()
+        # 初筛无效的种子及其 tracker (域名, 信息)
+        temp_invalid_torrents: List[Tuple[Any, List[Tuple[str, str]]]] = []
+        # tracker未工作，但暂时不能判定为失效做种，需人工判断
+        tracker_not_working_torrents = []
+        for torrent in torrents:
+            is_invalid = True
+            is_tracker_working = False
+            tracker_infos = []
+            for tracker in torrent.trackers:
+                if tracker.get("tier") == -1:
+                    continue
+                tracker_domian = get_tracker_domain(tracker.get("url"))
+                status = tracker.get("status")
+                msg = tracker.get("msg")
+                # 有一个tracker工作即为有效做种
+                if status == 2 or status == 3:
+                    is_tracker_working = True
+
+                if not (status == 4 and msg in self._error_msgs):
+                    is_invalid = False
+                    working_tracker_set.add(tracker_domian)
+                tracker_infos.append((tracker_domian, msg))
+
+                if self._more_logs:
+                    logger.info(
+                        f"处理 [{torrent.name}] tracker [{tracker_domian}]: 分类: [{torrent.category}], 标签: [{torrent.tags}], 状态: [{status}], msg: [{msg}], is_invalid: [{is_invalid}], is_working: [{is_tracker_working}]")
+            if is_invalid:
+                temp_invalid_torrents.append((torrent, tracker_infos))
+            elif not is_tracker_working:
+                # 排除已暂停的种子
+                if not torrent.state_enum.is_paused:
+                    tracker_not_working_torrents.append(torrent)
+
+        # tracker有正常工作种子而当前种子未工作的，避免因临时关站或tracker失效导致误删的问题
+        invalid_torrents = []
+        for torrent, tracker_infos in temp_invalid_torrents:
+            for tracker_domian, msg in tracker_infos:
+                if tracker_domian in working_tracker_set:
+                    invalid_torrents.append((torrent, tracker_domian, msg))
+                    break
+        return invalid_torrents, len(temp_invalid_torrents), tracker_not_working_torrents
+
+    @staticmethod
+    def format_trackers(torrent: Any) -> str:
+        """
+        拼接种子各tracker的域名及信息
+        """
+        tracker_msg = ""
+        for tracker in torrent.trackers:
+            if tracker.get("tier") == -1:
+                continue
+            tracker_msg += f" {get_tracker_domain(tracker.get('url'))}：{tracker.get('msg')} "
+        return tracker_msg
@@ -5,6 +5,7 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from threading import Event
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pytz
@@ -21,6 +22,8 @@ from app.helper.sites import SitesHelper
 from app.helper.torrent import TorrentHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.crossseed.rate_limiter import AdaptiveChunkSize, TokenBucket
+from app.plugins.crossseed.torrent_index import LocalTorrentIndex
 from app.schemas import NotificationType, ServiceInfo
 from app.schemas.types import EventType
 from app.utils.string import StringUtils
@@ -138,10 +141,12 @@ class CrossSeedHelper(object):
     @staticmethod
     def get_target_torrent(
             site: CSSiteConfig,
-            pieces_hash_set: List[str]
+            pieces_hash_set: List[str],
+            session: Optional[requests.Session] = None
     ) -> Tuple[Optional[List[TorInfo]], Optional[str]]:
         """
         返回pieces_hash对应的种子信息，包括站点id,pieces_hash,种子id
+        请求间隔由调用方控制
         """
         headers = {
             "Content-Type": "application/json",
@@ -151,7 +156,7 @@ class CrossSeedHelper(object):
         data = {"passkey": site.passkey, "pieces_hash": pieces_hash_set}
         remote_torrent_infos = []
         try:
-            response = requests.post(
+            response = (session or requests).post(
                 site.get_api_url(),
                 headers=headers,
                 json=data,
@@ -165,7 +170,6 @@ class CrossSeedHelper(object):
                     remote_torrent_infos.append(
                         TorInfo.remote(site.name, pieces_hash, torrent_id)
                     )
-            time.sleep(site.query_gap)
         except requests.exceptions.RequestException as e:
             return None, f"站点{site.name}请求失败：{e}"
         return remote_torrent_infos, None
@@ -179,7 +183,7 @@ class CrossSeed(_PluginBase):
     # 插件图标
     plugin_icon = "qingwa.png"
     # 插件版本
-    plugin_version = "3.0.1"
+    plugin_version = "3.0.5"
     # 插件作者
     plugin_author = "233@qingwa"
     # 作者主页
@@ -220,6 +224,8 @@ class CrossSeed(_PluginBase):
     _permanent_error_caches = []
     _torrentpaths = []
     _site_cs_infos = []
+    # 本地种子文件索引
+    _torrent_index: Optional[LocalTorrentIndex] = None
     # 辅种计数
     total = 0
     realtotal = 0
@@ -321,6 +327,9 @@ class CrossSeed(_PluginBase):
         # 启动定时任务 & 立即运行一次
         if self.get_state() or self._onlyonce:
             self.cross_helper = CrossSeedHelper()
+            self._torrent_index = LocalTorrentIndex(index_file=self.get_data_path() / "torrent_index.json")
+            if self._clearcache:
+                self._torrent_index.clear()
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
 
             if self._onlyonce:
@@ -784,6 +793,11 @@ class CrossSeed(_PluginBase):
             else:
                 logger.info(f"下载器 {downloader} 没有已完成种子")
                 continue
+            # 批量为种子文件建立索引，未变化的种子文件不再重复解析
+            if self._torrent_index:
+                self._torrent_index.prefetch(
+                    str(Path(self._torrentpaths[idx]) / f"{self.__get_hash(torrent, service.type)}.torrent")
+                    for torrent in torrents)
             hash_strs = []
             for torrent in torrents:
                 if self._event.is_set():
@@ -817,7 +831,7 @@ class CrossSeed(_PluginBase):
 
                 # 读取种子文件具体信息
                 if not torrent_info:
-                    torrent_info, err = self.cross_helper.get_local_torrent_info(torrent_path)
+                    torrent_info, err = self.__get_local_torrent_info(torrent_path)
                     if not torrent_info:
                         logger.error(f"未能读取到种子文件具体信息：{torrent_path} {err}")
                         continue
@@ -884,6 +898,8 @@ class CrossSeed(_PluginBase):
                 logger.info("没有需要辅种的种子")
         # 保存缓存
         self.__update_config()
+        if self._torrent_index:
+            self._torrent_index.save()
         # 发送消息
         if self._notify:
             if self.success or self.fail:
@@ -899,6 +915,20 @@ class CrossSeed(_PluginBase):
                 )
         logger.info("辅种任务执行完成")
 
+    def __get_local_torrent_info(self, torrent_path: Path) -> Tuple[Optional[TorInfo], str]:
+        """
+        从索引中读取种子文件信息，索引不可用时直接解析种子文件
+        """
+        if not self._torrent_index:
+            return self.cross_helper.get_local_torrent_info(torrent_path)
+        entry = self._torrent_index.get(str(torrent_path))
+        if not entry:
+            return self.cross_helper.get_local_torrent_info(torrent_path)
+        torrent_info = TorInfo.local(torrent_path=str(torrent_path), info_hash=entry.get("info_hash"),
+                                     pieces_hash=entry.get("pieces_hash"))
+        torrent_info.torrent_announce = entry.get("announce")
+        return torrent_info, ""
+
     def check_recheck(self):
         """
         定时检查下载器中种子是否校验完成，校验完成且完整的自动开始辅种
@@ -971,35 +1001,27 @@ class CrossSeed(_PluginBase):
         logger.info(f"去重后，总共需要辅种查询的种子数：{len(pieces_hash_set)}")
         pieces_hashes = list(pieces_hash_set)
 
-        # 分站点逐个批次辅种
-        # 逐个站点查询可辅种数据
-        chunk_size = 100
+        # 各站点并发查询可辅种数据，汇总后再逐个站点添加下载任务
+        site_configs = []
         for site_config in self._site_cs_infos:
             # 检查站点是否已经停用
             db_site = SiteOper().get(site_config.id)
             if db_site and not db_site.is_active:
                 logger.info(f"站点{site_config.name}已停用，跳过辅种")
                 continue
-            remote_tors: List[TorInfo] = []
-            total_size = len(pieces_hashes)
-            for i in range(0, len(pieces_hashes), chunk_size):
-                if self._event.is_set():
-                    logger.info("辅种服务停止")
-                    return
-                # 切片操作
-                chunk = pieces_hashes[i:i + chunk_size]
-                # 处理分组
-                chunk_tors, err_msg = self.cross_helper.get_target_torrent(site_config, chunk)
-                if not chunk_tors and err_msg:
-                    logger.info(
-                        f"查询站点{site_config.name}可辅种的信息出错 {err_msg},进度={i + 1}/{total_size}"
-                    )
-                else:
-                    logger.info(
-                        f"站点{site_config.name}本批次的可辅种/查询数={len(chunk_tors)}/{len(chunk)},进度={i + 1}/{total_size}"
-                    )
-                    remote_tors = remote_tors + chunk_tors
+            site_configs.append(site_config)
+        if not site_configs:
+            return
+
+        with ThreadPoolExecutor(max_workers=len(site_configs), thread_name_prefix="CrossSeed-Query") as executor:
+            site_remote_tors = list(executor.map(
+                lambda config: self.__query_site_torrents(site_config=config, pieces_hashes=pieces_hashes),
+                site_configs))
+        if self._event.is_set():
+            logger.info("辅种服务停止")
+            return
 
+        for site_config, remote_tors in zip(site_configs, site_remote_tors):
             logger.info(f"站点{site_config.name}返回可以辅种的种子总数为{len(remote_tors)}")
 
             # 去除已经下载过的种子
@@ -1038,6 +1060,42 @@ class CrossSeed(_PluginBase):
 
         logger.info(f"下载器 {service.name} 辅种完成")
 
+    def __query_site_torrents(self, site_config: CSSiteConfig, pieces_hashes: List[str]) -> List[TorInfo]:
+        """
+        分批查询站点可辅种的种子，使用独立的令牌桶限速及会话，批次大小根据响应耗时自适应调整
+        """
+        remote_tors: List[TorInfo] = []
+        limiter = TokenBucket(rate=1 / max(site_config.query_gap, 0.1))
+        chunk_size = AdaptiveChunkSize()
+        total_size = len(pieces_hashes)
+        i = 0
+        with requests.Session() as session:
+            while i < total_size:
+                if not limiter.acquire(stop_event=self._event):
+                    return remote_tors
+                # 切片操作
+                chunk = pieces_hashes[i:i + chunk_size.size]
+                # 处理分组
+                start_time = time.perf_counter()
+                try:
+                    chunk_tors, err_msg = self.cross_helper.get_target_torrent(site_config, chunk, session=session)
+                except Exception as e:
+                    chunk_tors, err_msg = None, f"站点{site_config.name}响应解析失败：{e}"
+                latency = time.perf_counter() - start_time
+                if not chunk_tors and err_msg:
+                    logger.info(
+                        f"查询站点{site_config.name}可辅种的信息出错 {err_msg},进度={i + 1}/{total_size}"
+                    )
+                else:
+                    logger.info(
+                        f"站点{site_config.name}本批次的可辅种/查询数={len(chunk_tors)}/{len(chunk)},"
+                        f"进度={i + 1}/{total_size},耗时={latency:.2f}s"
+                    )
+                    remote_tors = remote_tors + chunk_tors
+                i += len(chunk)
+                chunk_size.update(latency=latency, success=not err_msg)
+        return remote_tors
+
     @staticmethod
     def __download(service: ServiceInfo, content: Union[bytes, str],
                    save_path: str) -> Optional[str]:
@@ -0,0 +1,68 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    令牌桶限速器，每个站点独立使用，控制辅种查询的请求频率
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        :param rate: 每秒生成的令牌数
+        :param capacity: 令牌桶容量，即允许的突发请求数
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        获取一个令牌，令牌不足时等待，等待期间收到停止信号时返回 False
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self._rate
+            if stop_event:
+                if stop_event.wait(wait_time):
+                    return False
+            else:
+                time.sleep(wait_time)
+
+
+class AdaptiveChunkSize:
+    """
+    根据响应耗时自适应调整每批次查询的数量，响应较快时逐步增大，响应较慢或失败时减半
+    """
+
+    def __init__(self, initial: int = 100, minimum: int = 20, maximum: int = 100,
+                 target_latency: float = 3.0):
+        """
+        :param initial: 初始批次大小
+        :param minimum: 最小批次大小
+        :param maximum: 最大批次大小
+        :param target_latency: 期望的单次响应耗时（秒）
+        """
+        self._minimum = minimum
+        self._maximum = maximum
+        self._target_latency = target_latency
+        self.size = max(minimum, min(initial, maximum))
+
+    def update(self, latency: float, success: bool = True) -> int:
+        """
+        根据本次请求结果更新批次大小
+        """
+        if not success or latency > self._target_latency:
+            self.size = max(self._minimum, self.size // 2)
+        elif latency < self._target_latency / 2:
+            self.size = min(self._maximum, self.size + max(self._minimum // 2, 1))
+        return self.size
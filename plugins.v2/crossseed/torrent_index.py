@@ -0,0 +1,212 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bencode import bdecode, bencode
+
+from app.log import logger
+
+
+def parse_torrent_hashes(torrent_path: str) -> Tuple[str, str, Optional[str]]:
+    """
+    解析种子文件，返回 (info_hash, pieces_hash, announce)
+    在进程池的子进程中执行，需保持为模块级函数且仅依赖可序列化的参数
+    """
+    with open(torrent_path, "rb") as f:
+        torrent = bdecode(f.read())
+    info = torrent["info"]
+    announce = torrent.get("announce")
+    if isinstance(announce, bytes):
+        announce = announce.decode("utf-8", errors="ignore")
+    return hashlib.sha1(bencode(info)).hexdigest(), hashlib.sha1(info["pieces"]).hexdigest(), announce
+
+
+def build_index_entry(stat: os.stat_result, hashes: Tuple[str, str, Optional[str]]) -> dict:
+    """
+    根据文件状态及解析结果生成索引数据
+    """
+    info_hash, pieces_hash, announce = hashes
+    return {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "info_hash": info_hash,
+        "pieces_hash": pieces_hash,
+        "announce": announce
+    }
+
+
+def parse_torrent_file(torrent_path: str) -> Tuple[str, Optional[dict], Optional[str]]:
+    """
+    解析种子文件，返回 (路径, 索引数据, 错误信息)
+    """
+    try:
+        stat = os.stat(torrent_path)
+        return torrent_path, build_index_entry(stat, parse_torrent_hashes(torrent_path)), None
+    except Exception as err:
+        return torrent_path, None, str(err)
+
+
+class LocalTorrentIndex:
+    """
+    本地种子文件索引，以 (路径, 大小, 修改时间) 判断文件是否变化，未变化的种子文件无需重复解析
+    """
+
+    def __init__(self, index_file: Path, workers: int = None, pool_threshold: int = 200):
+        """
+        :param index_file: 索引文件路径
+        :param workers: 冷启动时解析种子文件的进程数，默认为 CPU 核数
+        :param pool_threshold: 待解析的种子文件超过该数量时才使用进程池
+        """
+        self._index_file = index_file
+        self._workers = min(workers or os.cpu_count() or 1, 8)
+        self._pool_threshold = pool_threshold
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self.__load()
+
+    def __load(self):
+        if not self._index_file.exists():
+            return
+        try:
+            with open(self._index_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if isinstance(entries, dict):
+                self._entries = entries
+        except Exception as e:
+            logger.error(f"读取种子索引文件 {self._index_file} 失败，将重新建立索引，错误详情: {e}")
+
+    def __is_fresh(self, torrent_path: str) -> Optional[bool]:
+        """
+        判断索引是否有效，种子文件不存在时返回 None
+        """
+        try:
+            stat = os.stat(torrent_path)
+        except OSError:
+            return None
+        entry = self._entries.get(torrent_path)
+        return bool(entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns)
+
+    def __parse_in_pool(self, executor: Executor, missing: List[str]) -> List[Tuple[str, Optional[dict], Optional[str]]]:
+        """
+        在线程池或进程池中解析种子文件，文件状态在主进程中获取
+        """
+        stats: Dict[str, os.stat_result] = {}
+        for torrent_path in missing:
+            try:
+                stats[torrent_path] = os.stat(torrent_path)
+            except OSError:
+                continue
+        futures = {torrent_path: executor.submit(parse_torrent_hashes, torrent_path) for torrent_path in stats}
+        results = []
+        for torrent_path in missing:
+            future = futures.get(torrent_path)
+            if not future:
+                results.append((torrent_path, None, "种子文件不存在"))
+                continue
+            try:
+                results.append((torrent_path, build_index_entry(stats[torrent_path], future.result()), None))
+            except BrokenExecutor:
+                raise
+            except Exception as err:
+                results.append((torrent_path, None, str(err)))
+        return results
+
+    def __parse_all(self, missing: List[str]) -> List[Tuple[str, Optional[dict], Optional[str]]]:
+        """
+        解析种子文件，数量较多时使用进程池并行解析，进程池不可用时改用线程池
+        """
+        if len(missing) < self._pool_threshold or self._workers <= 1:
+            return [parse_torrent_file(torrent_path) for torrent_path in missing]
+        try:
+            # 使用 spawn 启动子进程：fork 多线程的主程序可能导致子进程死锁
+            with ProcessPoolExecutor(max_workers=self._workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                return self.__parse_in_pool(executor, missing)
+        except Exception as e:
+            logger.warn(f"种子文件解析进程池不可用：{str(e)}，改用线程池")
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="CrossSeed-Index") as executor:
+            return self.__parse_in_pool(executor, missing)
+
+    def prefetch(self, torrent_paths: Iterable[str]):
+        """
+        为种子文件建立索引，仅解析新增或发生变化的文件，数量较多时使用进程池并行读取及计算hash
+        """
+        missing: List[str] = []
+        with self._lock:
+            for torrent_path in torrent_paths:
+                torrent_path = str(torrent_path)
+                fresh = self.__is_fresh(torrent_path)
+                if fresh is None:
+                    continue
+                if not fresh:
+                    missing.append(torrent_path)
+        if not missing:
+            return
+
+        logger.info(f"需要建立索引的种子文件数：{len(missing)}")
+        results = self.__parse_all(missing)
+
+        failed = 0
+        with self._lock:
+            for torrent_path, entry, err in results:
+                if entry:
+                    self._entries[torrent_path] = entry
+                    self._dirty = True
+                else:
+                    failed += 1
+                    logger.debug(f"解析种子文件 {torrent_path} 失败：{err}")
+        logger.info(f"种子文件索引建立完成，成功 {len(missing) - failed} 个，失败 {failed} 个")
+
+    def get(self, torrent_path: str) -> Optional[dict]:
+        """
+        获取种子文件的索引数据，索引不存在或已失效时重新解析
+        """
+        torrent_path = str(torrent_path)
+        with self._lock:
+            fresh = self.__is_fresh(torrent_path)
+            if fresh is None:
+                return None
+            if fresh:
+                return self._entries[torrent_path]
+        _, entry, _ = parse_torrent_file(torrent_path)
+        if entry:
+            with self._lock:
+                self._entries[torrent_path] = entry
+                self._dirty = True
+        return entry
+
+    def save(self):
+        """
+        清理种子文件已不存在的索引并保存到文件
+        下载器离线或未获取到种子列表时，其种子文件仍然存在，索引会被保留
+        """
+        with self._lock:
+            stale = [torrent_path for torrent_path in self._entries if not os.path.exists(torrent_path)]
+            for torrent_path in stale:
+                del self._entries[torrent_path]
+            self._dirty = self._dirty or bool(stale)
+            if not self._dirty:
+                return
+            try:
+                self._index_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self._index_file.with_suffix(".tmp")
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp_file, self._index_file)
+                self._dirty = False
+            except Exception as e:
+                logger.error(f"保存种子索引文件 {self._index_file} 失败，错误详情: {e}")
+
+    def clear(self):
+        """
+        清空索引
+        """
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
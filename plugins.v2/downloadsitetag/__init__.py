@@ -10,14 +10,13 @@ from apscheduler.triggers.cron import CronTrigger
 from app.core.config import settings
 from app.core.context import Context
 from app.core.event import eventmanager, Event
-from app.db.downloadhistory_oper import DownloadHistoryOper
 from app.db.models.downloadhistory import DownloadHistory
 from app.helper.downloader import DownloaderHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.downloadsitetag.tag_helper import fetch_histories, TrackerSiteResolver, TorrentInfoBatch
 from app.schemas import ServiceInfo
 from app.schemas.types import EventType, MediaType
-from app.utils.string import StringUtils
 
 
 class DownloadSiteTag(_PluginBase):
@@ -28,7 +27,7 @@ class DownloadSiteTag(_PluginBase):
     # 插件图标
     plugin_icon = "Youtube-dl_B.png"
     # 插件版本
-    plugin_version = "2.2"
+    plugin_version = "2.3"
     # 插件作者
     plugin_author = "叮叮当"
     # 作者主页
@@ -208,6 +207,10 @@ class DownloadSiteTag(_PluginBase):
             "agsvpt.trackers.work": "agsvpt.com",
             "tracker.cinefiles.info": "audiences.me",
         }
+        # tracker对应站点, 所有下载器共用
+        site_resolver = TrackerSiteResolver(tracker_mappings)
+        # tmdbid对应的genre_ids, 避免同一剧集重复查询
+        genre_cache: Dict[int, Optional[list]] = {}
         for service in self.service_infos.values():
             downloader = service.name
             downloader_obj = service.instance
@@ -224,13 +227,17 @@ class DownloadSiteTag(_PluginBase):
             # 按添加时间进行排序, 时间靠前的按大小和名称加入处理历史, 判定为原始种子, 其他为辅种
             torrents = self._torrents_sort(torrents=torrents, dl_type=service.type)
             logger.info(f"{self.LOG_TAG}下载器 {downloader} 分析种子信息中 ...")
-            downloadhis = DownloadHistoryOper()
-            siteshelper = SitesHelper()
+            # 批量查询所有种子的下载历史
+            histories = fetch_histories(self._get_hash(torrent=torrent, dl_type=service.type)
+                                        for torrent in torrents)
+            # 待写入下载器的标签与分类
+            batch = TorrentInfoBatch(service=service, log_tag=self.LOG_TAG)
             for torrent in torrents:
                 try:
                     if self._event.is_set():
                         logger.info(
                             f"{self.LOG_TAG}停止服务")
+                        batch.flush()
                         return
                     # 获取已处理种子的key (size, name)
                     _key = self._torrent_key(torrent=torrent, dl_type=service.type)
@@ -242,7 +249,7 @@ class DownloadSiteTag(_PluginBase):
                     torrent_tags = self._get_label(torrent=torrent, dl_type=service.type)
                     torrent_cat = self._get_category(torrent=torrent, dl_type=service.type)
                     # 提取种子hash对应的下载历史
-                    history: DownloadHistory = downloadhis.get_by_hash(_hash)
+                    history: DownloadHistory = histories.get(_hash)
                     if not history:
                         # 如果找到已处理种子的历史, 表明当前种子是辅种, 否则创建一个空DownloadHistory
                         if _key and _key in dispose_history:
@@ -261,18 +268,9 @@ class DownloadSiteTag(_PluginBase):
                     # 如果站点名称为空, 尝试通过trackers识别
                     elif not history.torrent_site:
                         trackers = self._get_trackers(torrent=torrent, dl_type=service.type)
-                        for tracker in trackers:
-                            # 检查tracker是否包含特定的关键字，并进行相应的映射
-                            for key, mapped_domain in tracker_mappings.items():
-                                if key in tracker:
-                                    domain = mapped_domain
-                                    break
-                            else:
-                                domain = StringUtils.get_url_domain(tracker)
-                            site_info = siteshelper.get_indexer(domain)
-                            if site_info:
-                                history.torrent_site = site_info.get("name")
-                                break
+                        site_name = site_resolver.get_site(trackers)
+                        if site_name:
+                            history.torrent_site = site_name
                         # 如果通过tracker还是无法获取站点名称, 且tmdbid, type, title都是空的, 那么跳过当前种子
                         if not history.torrent_site and not history.tmdbid and not history.type and not history.title:
                             continue
@@ -292,10 +290,14 @@ class DownloadSiteTag(_PluginBase):
                         # 因允许tmdbid为空时运行到此, 因此需要判断tmdbid不为空
                         history_type = MediaType(history.type) if history.type else None
                         if history.tmdbid and history_type == MediaType.TV:
-                            # tmdb_id获取tmdb信息
-                            tmdb_info = self.chain.tmdb_info(mtype=history_type, tmdbid=history.tmdbid)
-                            if tmdb_info:
-                                genre_ids = tmdb_info.get("genre_ids")
+                            if history.tmdbid in genre_cache:
+                                genre_ids = genre_cache[history.tmdbid]
+                            else:
+                                # tmdb_id获取tmdb信息
+                                tmdb_info = self.chain.tmdb_info(mtype=history_type, tmdbid=history.tmdbid)
+                                if tmdb_info:
+                                    genre_ids = tmdb_info.get("genre_ids")
+                                genre_cache[history.tmdbid] = genre_ids
                         _cat = self._genre_ids_get_cat(history.type, genre_ids)
 
                     # 去除种子已经存在的标签
@@ -307,12 +309,14 @@ class DownloadSiteTag(_PluginBase):
                     # 判断当前种子是否不需要修改
                     if not _cat and not _tags:
                         continue
-                    # 执行通用方法, 设置种子标签与分类
-                    self._set_torrent_info(service=service, _hash=_hash, _torrent=torrent, _tags=_tags, _cat=_cat,
-                                           _original_tags=torrent_tags)
+                    # 加入待写入列表, 相同的标签与分类合并设置
+                    batch.add(_hash=_hash, _tags=_tags, _cat=_cat, _original_tags=torrent_tags)
                 except Exception as e:
                     logger.error(
                         f"{self.LOG_TAG}分析种子信息时发生了错误: {str(e)}")
+            if len(batch):
+                logger.info(f"{self.LOG_TAG}下载器 {downloader} 批量设置标签与分类 ...")
+            batch.flush()
 
         logger.info(f"{self.LOG_TAG}执行完成")
 
@@ -0,0 +1,134 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.db import SessionFactory
+from app.db.downloadhistory_oper import DownloadHistoryOper
+from app.db.models.downloadhistory import DownloadHistory
+from app.helper.sites import SitesHelper
+from app.log import logger
+from app.utils.string import StringUtils
+
+
+def fetch_histories(hashes: Iterable[str], chunk_size: int = 500) -> Dict[str, DownloadHistory]:
+    """
+    按种子hash批量查询下载历史，同一hash存在多条记录时与 get_by_hash 一致取最新的一条
+    """
+    hashes = [_hash for _hash in set(hashes) if _hash]
+    histories: Dict[str, DownloadHistory] = {}
+    if not hashes:
+        return histories
+    try:
+        with SessionFactory() as db:
+            for i in range(0, len(hashes), chunk_size):
+                rows = db.query(DownloadHistory) \
+                    .filter(DownloadHistory.download_hash.in_(hashes[i:i + chunk_size])) \
+                    .order_by(DownloadHistory.date.asc()) \
+                    .all()
+                for row in rows:
+                    histories[row.download_hash] = row
+    except Exception as e:
+        logger.warn(f"批量查询下载历史失败：{str(e)}，改为逐条查询")
+        downloadhis = DownloadHistoryOper()
+        for _hash in hashes:
+            history = downloadhis.get_by_hash(_hash)
+            if history:
+                histories[_hash] = history
+    return histories
+
+
+class TrackerSiteResolver:
+    """
+    tracker地址到站点名称的映射，结果按LRU缓存，同一次执行的所有下载器共用
+    """
+
+    def __init__(self, tracker_mappings: Dict[str, str], maxsize: int = 4096):
+        self._tracker_mappings = tracker_mappings
+        self._siteshelper = SitesHelper()
+        self.resolve = lru_cache(maxsize=maxsize)(self.__resolve)
+
+    def __resolve(self, tracker: str) -> Optional[str]:
+        # 检查tracker是否包含特定的关键字，并进行相应的映射
+        for key, mapped_domain in self._tracker_mappings.items():
+            if key in tracker:
+                domain = mapped_domain
+                break
+        else:
+            domain = StringUtils.get_url_domain(tracker)
+        site_info = self._siteshelper.get_indexer(domain)
+        return site_info.get("name") if site_info else None
+
+    def get_site(self, trackers: List[str]) -> Optional[str]:
+        """
+        依次识别trackers，返回第一个匹配的站点名称
+        """
+        for tracker in trackers:
+            site_name = self.resolve(tracker)
+            if site_name:
+                return site_name
+        return None
+
+
+class TorrentInfoBatch:
+    """
+    汇总同一下载器需要设置的标签与分类，相同的标签或分类合并为一次下载器调用
+    """
+
+    def __init__(self, service: Any, log_tag: str = "", chunk_size: int = 200):
+        self._service = service
+        self._log_tag = log_tag
+        self._chunk_size = chunk_size
+        # 标签 -> 种子hash
+        self._tags: Dict[Tuple[str, ...], List[str]] = {}
+        # 分类 -> 种子hash
+        self._cats: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(hashs) for hashs in self._tags.values()) + sum(len(hashs) for hashs in self._cats.values())
+
+    def add(self, _hash: str, _tags: List[str] = None, _cat: str = None, _original_tags: List[str] = None):
+        """
+        加入待设置的种子
+        """
+        if _tags:
+            # tr设置标签会覆盖原有标签, 因此需要合并原始标签
+            if self._service.type != "qbittorrent" and _original_tags:
+                _tags = list(set(_original_tags).union(set(_tags)))
+            self._tags.setdefault(tuple(sorted(_tags)), []).append(_hash)
+        # 分类 <tr暂不支持>
+        if _cat and self._service.type == "qbittorrent":
+            self._cats.setdefault(_cat, []).append(_hash)
+        logger.warn(
+            f"{self._log_tag}下载器: {self._service.name} 种子id: {_hash} {('  标签: ' + ','.join(_tags)) if _tags else ''} {('  分类: ' + _cat) if _cat else ''}")
+
+    def __chunks(self, hashs: List[str]):
+        for i in range(0, len(hashs), self._chunk_size):
+            yield hashs[i:i + self._chunk_size]
+
+    def flush(self):
+        """
+        批量写入标签与分类
+        """
+        downloader_obj = self._service.instance
+        for tags, hashs in self._tags.items():
+            for ids in self.__chunks(hashs):
+                try:
+                    if self._service.type == "qbittorrent":
+                        downloader_obj.set_torrents_tag(ids=ids, tags=list(tags))
+                    else:
+                        downloader_obj.set_torrent_tag(ids=ids, tags=list(tags))
+                except Exception as e:
+                    logger.error(f"{self._log_tag}下载器 {self._service.name} 批量设置标签 {','.join(tags)} 失败：{str(e)}")
+        for cat, hashs in self._cats.items():
+            for ids in self.__chunks(hashs):
+                # 尝试设置种子分类, 如果失败, 则创建再设置一遍
+                try:
+                    downloader_obj.qbc.torrents_set_category(category=cat, torrent_hashes=ids)
+                except Exception as e:
+                    logger.warn(f"下载器 {self._service.name} 设置分类 {cat} 失败：{str(e)}, 尝试创建分类再设置 ...")
+                    try:
+                        downloader_obj.qbc.torrents_createCategory(name=cat)
+                        downloader_obj.qbc.torrents_set_category(category=cat, torrent_hashes=ids)
+                    except Exception as err:
+                        logger.error(f"{self._log_tag}下载器 {self._service.name} 批量设置分类 {cat} 失败：{str(err)}")
+        self._tags.clear()
+        self._cats.clear()
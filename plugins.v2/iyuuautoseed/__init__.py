@@ -1,6 +1,9 @@
+import json
 import os
 import re
 from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Event
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -9,16 +12,22 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from lxml import etree
 from ruamel.yaml import CommentedMap
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.event import eventmanager
+from app.db import db_query, db_update
+from app.db.models import PluginData
 from app.db.site_oper import SiteOper
 from app.helper.downloader import DownloaderHelper
 from app.helper.sites import SitesHelper
 from app.helper.torrent import TorrentHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.iyuuautoseed.hash_cache import BoundedHashCache
 from app.plugins.iyuuautoseed.iyuu_helper import IyuuHelper
+from app.plugins.iyuuautoseed.reseed_pipeline import SiteConcurrencyLimiter, SiteFetchStats
+from app.plugins.iyuuautoseed.seed_cache import SEED_QUERY_CACHE_KEY, SeedQueryCache
 from app.schemas import NotificationType, ServiceInfo
 from app.schemas.types import EventType
 from app.utils.http import RequestUtils
@@ -33,7 +42,7 @@ class IYUUAutoSeed(_PluginBase):
     # 插件图标
     plugin_icon = "IYUU.png"
     # 插件版本
-    plugin_version = "2.14"
+    plugin_version = "2.20"
     # 插件作者
     plugin_author = "jxxghp,CKun"
     # 作者主页
@@ -69,6 +78,14 @@ class IYUUAutoSeed(_PluginBase):
     _size = None
     _clearcache = False
     _auto_start = False
+    # 增量辅种，有效期内查询过的种子不再请求IYUU
+    _incremental = False
+    # 查询结果有效期（小时）
+    _cache_ttl = 24
+    # 全量辅种间隔（天），为0时不进行全量辅种
+    _full_sweep_days = 7
+    # 辅种查询结果缓存
+    _seed_cache: Optional[SeedQueryCache] = None
     # 退出事件
     _event = Event()
     # 种子链接xpaths
@@ -82,11 +99,21 @@ class IYUUAutoSeed(_PluginBase):
     _recheck_torrents = {}
     _is_recheck_running = False
     # 辅种缓存，出错的种子不再重复辅种，可清除
-    _error_caches = []
+    _error_caches = BoundedHashCache()
     # 辅种缓存，辅种成功的种子，可清除
-    _success_caches = []
+    _success_caches = BoundedHashCache()
     # 辅种缓存，出错的种子不再重复辅种，且无法清除。种子被删除404等情况
-    _permanent_error_caches = []
+    _permanent_error_caches = BoundedHashCache()
+    # 并发获取种子文件的最大线程数
+    _fetch_workers = 8
+    # 单个站点并发获取种子文件的最大数量
+    _fetch_per_site = 2
+    # 辅种缓存容量上限，超过后淘汰最早的记录
+    _cache_maxsize = 50000
+    # 辅种历史，Hash -> 历史记录，首次使用时从数据库批量加载
+    _seed_histories: Optional[Dict[str, list]] = None
+    # 待保存的辅种历史Hash
+    _dirty_histories = set()
     # 辅种计数
     total = 0
     realtotal = 0
@@ -117,9 +144,26 @@ class IYUUAutoSeed(_PluginBase):
             self._addhosttotag = config.get("addhosttotag")
             self._size = float(config.get("size")) if config.get("size") else 0
             self._clearcache = config.get("clearcache")
-            self._permanent_error_caches = [] if self._clearcache else config.get("permanent_error_caches") or []
-            self._error_caches = [] if self._clearcache else config.get("error_caches") or []
-            self._success_caches = [] if self._clearcache else config.get("success_caches") or []
+            self._incremental = config.get("incremental")
+            # 未配置或配置无效时默认24小时
+            try:
+                self._cache_ttl = float(config.get("cache_ttl")) if config.get("cache_ttl") else 24
+            except (TypeError, ValueError):
+                self._cache_ttl = 24
+            # 未配置时默认7天，明确配置为0时不全量查询
+            full_sweep_days = config.get("full_sweep_days")
+            try:
+                self._full_sweep_days = float(full_sweep_days) if full_sweep_days not in (None, "") else 7
+            except (TypeError, ValueError):
+                self._full_sweep_days = 7
+            self._permanent_error_caches = BoundedHashCache(
+                None if self._clearcache else config.get("permanent_error_caches"), maxsize=self._cache_maxsize)
+            self._error_caches = BoundedHashCache(
+                None if self._clearcache else config.get("error_caches"), maxsize=self._cache_maxsize)
+            self._success_caches = BoundedHashCache(
+                None if self._clearcache else config.get("success_caches"), maxsize=self._cache_maxsize)
+            self._seed_histories = None
+            self._dirty_histories = set()
 
             # 过滤掉已删除的站点
             all_sites = [site.id for site in SiteOper().list_order_by_pri()] + [site.get("id") for site in
@@ -133,6 +177,9 @@ class IYUUAutoSeed(_PluginBase):
         # 启动定时任务 & 立即运行一次
         if self.get_state() or self._onlyonce:
             self.iyuu_helper = IyuuHelper(token=self._token)
+            self._seed_cache = SeedQueryCache(plugin=self, ttl=self._cache_ttl) if self._incremental else None
+            if self._clearcache and self._seed_cache:
+                self._seed_cache.clear()
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
 
             if self._onlyonce:
@@ -584,6 +631,61 @@ class IYUUAutoSeed(_PluginBase):
                             }
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'incremental',
+                                            'label': '增量辅种',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'cache_ttl',
+                                            'label': '查询结果有效期（小时）',
+                                            'placeholder': '增量辅种时，有效期内的种子不再查询IYUU'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'full_sweep_days',
+                                            'label': '全量辅种间隔（天）',
+                                            'placeholder': '增量辅种时定期全量查询一次，0为不全量查询'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'props': {
@@ -648,7 +750,10 @@ class IYUUAutoSeed(_PluginBase):
             "nolabels": "",
             "labelsafterseed": "",
             "categoryafterseed": "",
-            "size": ""
+            "size": "",
+            "incremental": False,
+            "cache_ttl": 24,
+            "full_sweep_days": 7
         }
 
     def get_page(self) -> List[dict]:
@@ -674,9 +779,12 @@ class IYUUAutoSeed(_PluginBase):
             "auto_category": self._auto_category,
             "auto_start": self._auto_start,
             "size": self._size,
-            "success_caches": self._success_caches,
-            "error_caches": self._error_caches,
-            "permanent_error_caches": self._permanent_error_caches
+            "incremental": self._incremental,
+            "cache_ttl": self._cache_ttl,
+            "full_sweep_days": self._full_sweep_days,
+            "success_caches": self._success_caches.to_list(),
+            "error_caches": self._error_caches.to_list(),
+            "permanent_error_caches": self._permanent_error_caches.to_list()
         })
 
     def auto_seed(self):
@@ -694,6 +802,10 @@ class IYUUAutoSeed(_PluginBase):
         self.exist = 0
         self.fail = 0
         self.cached = 0
+        # 增量辅种时定期忽略缓存进行全量查询
+        full_sweep = bool(self._seed_cache and self._seed_cache.need_full_sweep(self._full_sweep_days))
+        if full_sweep:
+            logger.info("已到达全量辅种间隔，本次查询全部种子")
         # 扫描下载器辅种
         for service in self.service_infos.values():
             downloader = service.name
@@ -753,6 +865,18 @@ class IYUUAutoSeed(_PluginBase):
                 })
             if hash_strs:
                 logger.info(f"总共需要辅种的种子数：{len(hash_strs)}")
+                # 增量辅种时，有效期内查询过的种子直接使用缓存的查询结果
+                if self._seed_cache and not full_sweep:
+                    cached_seeds, query_hashs = self._seed_cache.split([item.get("hash") for item in hash_strs])
+                    query_hashs = set(query_hashs)
+                    if cached_seeds:
+                        logger.info(f"增量辅种，使用缓存查询结果的种子数：{len(cached_seeds)}，"
+                                    f"需要查询IYUU的种子数：{len(query_hashs)}")
+                        self.__seed_torrents(hash_strs=[item for item in hash_strs
+                                                        if item.get("hash") in cached_seeds],
+                                             service=service,
+                                             cached_seeds=cached_seeds)
+                    hash_strs = [item for item in hash_strs if item.get("hash") in query_hashs]
                 # 分组处理，减少IYUU Api请求次数
                 chunk_size = 200
                 for i in range(0, len(hash_strs), chunk_size):
@@ -768,6 +892,10 @@ class IYUUAutoSeed(_PluginBase):
 
         # 保存缓存
         self.__update_config()
+        if self._seed_cache:
+            if full_sweep:
+                self._seed_cache.mark_full_sweep()
+            self._seed_cache.save()
         # 发送消息
         if self._notify:
             if self.success or self.fail:
@@ -838,15 +966,18 @@ class IYUUAutoSeed(_PluginBase):
             logger.info(f"下载器 {downloader} 中没有需要检查的校验任务，清空待处理列表 ...")
             self._recheck_torrents[downloader] = []
 
-    def __seed_torrents(self, hash_strs: list, service: ServiceInfo):
+    def __seed_torrents(self, hash_strs: list, service: ServiceInfo, cached_seeds: Optional[dict] = None):
         """
         执行一批种子的辅种
+        :param cached_seeds: 缓存的查询结果，存在时不再请求IYUU
         """
         if not hash_strs:
             return
-        logger.info(f"下载器 {service.name} 开始查询辅种，数量：{len(hash_strs)} ...")
+        logger.info(f"下载器 {service.name} 开始{'处理缓存的' if cached_seeds is not None else '查询'}辅种，"
+                    f"数量：{len(hash_strs)} ...")
         # 下载器中的Hashs
         hashs = [item.get("hash") for item in hash_strs]
+        hash_set = set(hashs)
         # 每个Hash的保存目录
         save_paths = {}
         save_category = {}
@@ -854,7 +985,12 @@ class IYUUAutoSeed(_PluginBase):
             save_paths[item.get("hash")] = item.get("save_path")
             save_category[item.get("hash")] = item.get("category")
         # 查询可辅种数据
-        seed_list, msg = self.iyuu_helper.get_seed_info(hashs)
+        if cached_seeds is not None:
+            seed_list, msg = {hash_str: seed_info for hash_str, seed_info in cached_seeds.items() if seed_info}, ""
+        else:
+            seed_list, msg = self.iyuu_helper.get_seed_info(list(hashs))
+            if isinstance(seed_list, dict) and self._seed_cache:
+                self._seed_cache.put(hashs=hashs, seed_list=seed_list)
         if not isinstance(seed_list, dict):
             # 判断辅种异常是否是由于Token未认证导致的，由于没有解决接口，只能从返回值来判断
             if self._token and msg == '请求缺少token':
@@ -864,6 +1000,10 @@ class IYUUAutoSeed(_PluginBase):
             return
         else:
             logger.info(f"IYUU返回可辅种数：{len(seed_list)}")
+        # 待获取的辅种任务
+        seed_tasks = []
+        # 已加入任务的种子，避免同一批次重复辅种
+        queued_hashs = set()
         # 遍历
         for current_hash, seed_info in seed_list.items():
             if not seed_info:
@@ -872,9 +1012,6 @@ class IYUUAutoSeed(_PluginBase):
             if not isinstance(seed_torrents, list):
                 seed_torrents = [seed_torrents]
 
-            # 本次辅种成功的种子
-            success_torrents = []
-
             for seed in seed_torrents:
                 if not seed:
                     continue
@@ -882,7 +1019,7 @@ class IYUUAutoSeed(_PluginBase):
                     continue
                 if not seed.get("sid") or not seed.get("info_hash"):
                     continue
-                if seed.get("info_hash") in hashs:
+                if seed.get("info_hash") in hash_set or seed.get("info_hash") in queued_hashs:
                     logger.info(f"{seed.get('info_hash')} 已在下载器中，跳过 ...")
                     continue
                 if seed.get("info_hash") in self._success_caches:
@@ -892,25 +1029,30 @@ class IYUUAutoSeed(_PluginBase):
                     logger.info(f"种子 {seed.get('info_hash')} 辅种失败且已缓存，跳过 ...")
                     continue
                 # 添加任务 如果配置了主辅分离使用辅种下载器
-                if self._auto_downloader:
-                    success = self.__download_torrent(seed=seed,
-                                                      service=self.auto_service_info,
-                                                      save_path=save_paths.get(current_hash),
-                                                      save_category=save_category.get(current_hash))
-                else:
-                    success = self.__download_torrent(seed=seed,
-                                                      service=service,
-                                                      save_path=save_paths.get(current_hash),
-                                                      save_category=save_category.get(current_hash))
-                if success:
-                    success_torrents.append(seed.get("info_hash"))
-
-            # 辅种成功的去重放入历史
-            if len(success_torrents) > 0:
-                self.__save_history(current_hash=current_hash,
-                                    downloader=service.name,
-                                    success_torrents=success_torrents)
+                seed_task = self.__prepare_seed_task(seed=seed,
+                                                     service=self.auto_service_info if self._auto_downloader
+                                                     else service)
+                if not seed_task:
+                    continue
+                seed_task.update({
+                    "current_hash": current_hash,
+                    "save_path": save_paths.get(current_hash),
+                    "save_category": save_category.get(current_hash)
+                })
+                seed_tasks.append(seed_task)
+                queued_hashs.add(seed.get("info_hash"))
+
+        # 并发获取种子文件，依次添加到下载器
+        success_torrents = self.__run_seed_tasks(seed_tasks)
+
+        # 辅种成功的去重放入历史
+        for current_hash, torrents in success_torrents.items():
+            self.__save_history(current_hash=current_hash,
+                                downloader=service.name,
+                                success_torrents=torrents)
 
+        # 每批次统一保存辅种历史
+        self.__flush_histories()
         logger.info(f"下载器 {service.name} 辅种完成")
 
     def __save_history(self, current_hash: str, downloader: str, success_torrents: []):
@@ -934,7 +1076,7 @@ class IYUUAutoSeed(_PluginBase):
         """
         try:
             # 查询当前Hash的辅种历史
-            seed_history = self.get_data(key=current_hash) or []
+            seed_history = self.__get_seed_histories().get(current_hash) or []
 
             new_history = True
             if len(seed_history) > 0:
@@ -959,12 +1101,85 @@ class IYUUAutoSeed(_PluginBase):
                     "torrents": list(set(success_torrents))
                 })
 
-            # 保存历史
-            self.save_data(key=current_hash,
-                           value=seed_history)
+            # 暂存历史，每批次统一保存
+            self._seed_histories[current_hash] = seed_history
+            self._dirty_histories.add(current_hash)
         except Exception as e:
             print(str(e))
 
+    @staticmethod
+    @db_query
+    def __query_histories(plugin_id: str, db: Session = None) -> List[PluginData]:
+        """
+        查询全部辅种历史，不加载查询结果缓存等其它数据
+        """
+        return db.query(PluginData).filter(PluginData.plugin_id == plugin_id,
+                                           PluginData.key != SEED_QUERY_CACHE_KEY).all()
+
+    @staticmethod
+    @db_update
+    def __update_histories(plugin_id: str, histories: Dict[str, list], chunk_size: int = 500, db: Session = None):
+        """
+        在同一个数据库会话中批量写入辅种历史，与 save_data 写入相同的格式
+        """
+        keys = list(histories)
+        existing: Dict[str, PluginData] = {}
+        for i in range(0, len(keys), chunk_size):
+            rows = db.query(PluginData) \
+                .filter(PluginData.plugin_id == plugin_id, PluginData.key.in_(keys[i:i + chunk_size])) \
+                .all()
+            for row in rows:
+                existing[row.key] = row
+        for key, value in histories.items():
+            row = existing.get(key)
+            if row:
+                row.value = value
+            else:
+                db.add(PluginData(plugin_id=plugin_id, key=key, value=value))
+
+    def __get_seed_histories(self) -> Dict[str, list]:
+        """
+        批量加载全部辅种历史
+        """
+        if self._seed_histories is None:
+            self._seed_histories = {}
+            try:
+                rows = self.__query_histories(self.__class__.__name__)
+            except Exception as e:
+                logger.warn(f"批量查询辅种历史失败：{str(e)}，改为读取全部插件数据")
+                rows = [plugin_data for plugin_data in self.get_data() or []
+                        if plugin_data.key != SEED_QUERY_CACHE_KEY]
+            for plugin_data in rows:
+                value = plugin_data.value
+                if isinstance(value, str):
+                    try:
+                        value = json.loads(value)
+                    except Exception:
+                        continue
+                if isinstance(value, list):
+                    self._seed_histories[plugin_data.key] = value
+        return self._seed_histories
+
+    def __flush_histories(self):
+        """
+        保存发生变化的辅种历史
+        """
+        if not self._dirty_histories:
+            return
+        histories = {current_hash: self._seed_histories.get(current_hash) or []
+                     for current_hash in self._dirty_histories}
+        try:
+            self.__update_histories(self.__class__.__name__, histories)
+        except Exception as e:
+            logger.warn(f"批量保存辅种历史失败：{str(e)}，改为逐条保存")
+            for current_hash, history in histories.items():
+                try:
+                    self.save_data(key=current_hash, value=history)
+                except Exception as err:
+                    logger.error(f"保存辅种历史 {current_hash} 失败：{str(err)}")
+        logger.debug(f"已保存辅种历史 {len(self._dirty_histories)} 条")
+        self._dirty_histories = set()
+
     def __download(self, service: ServiceInfo, content: bytes,
                    save_path: str, save_category: str, site_name: str) -> Optional[str]:
 
@@ -1012,24 +1227,15 @@ class IYUUAutoSeed(_PluginBase):
         logger.error(f"不支持的下载器：{service.type}")
         return None
 
-    def __download_torrent(self, seed: dict, service: ServiceInfo, save_path: str, save_category: str):
+    def __prepare_seed_task(self, seed: dict, service: ServiceInfo) -> Optional[dict]:
         """
-        下载种子
+        检查辅种种子对应的站点、是否已在下载器中及站点流控，通过检查时返回辅种任务
         torrent: {
                     "sid": 3,
                     "torrent_id": 377467,
                     "info_hash": "a444850638e7a6f6220e2efdde94099c53358159"
                 }
         """
-
-        def __is_special_site(url):
-            """
-            判断是否为特殊站点（是否需要添加https）
-            """
-            if "hdsky.me" in url:
-                return False
-            return True
-
         self.total += 1
         # 获取种子站点及下载地址模板
         site_url, download_page = self.iyuu_helper.get_torrent_url(seed.get("sid"))
@@ -1038,7 +1244,7 @@ class IYUUAutoSeed(_PluginBase):
             self._error_caches.append(seed.get("info_hash"))
             self.fail += 1
             self.cached += 1
-            return False
+            return None
         # 查询站点
         site_domain = StringUtils.get_url_domain(site_url)
         # 站点信息
@@ -1046,50 +1252,131 @@ class IYUUAutoSeed(_PluginBase):
         site_info = sites_helper.get_indexer(site_domain)
         if not site_info or not site_info.get('url'):
             logger.debug(f"没有维护种子对应的站点：{site_url}")
-            return False
+            return None
         if self._sites and site_info.get('id') not in self._sites:
             logger.info("当前站点不在选择的辅种站点范围，跳过 ...")
-            return False
+            return None
         self.realtotal += 1
         # 查询hash值是否已经在下载器中
-        downloader_obj = service.instance
-        torrent_info, _ = downloader_obj.get_torrents(ids=[seed.get("info_hash")])
+        torrent_info, _ = service.instance.get_torrents(ids=[seed.get("info_hash")])
         if torrent_info:
             logger.info(f"{seed.get('info_hash')} 已在下载器中，跳过 ...")
             self.exist += 1
-            return False
+            return None
         # 站点流控
         check, checkmsg = sites_helper.check(site_domain)
         if check:
             logger.warn(checkmsg)
             self.fail += 1
-            return False
+            return None
+        return {
+            "seed": seed,
+            "service": service,
+            "site_info": site_info,
+            "download_page": download_page
+        }
+
+    def __run_seed_tasks(self, seed_tasks: List[dict]) -> Dict[str, List[str]]:
+        """
+        辅种流水线：并发获取种子文件（按站点限制并发数），获取完成的种子依次添加到下载器
+        :return: 源种子Hash -> 辅种成功的种子Hash
+        """
+        success_torrents: Dict[str, List[str]] = {}
+        if not seed_tasks:
+            return success_torrents
+
+        logger.info(f"开始获取辅种种子文件，数量：{len(seed_tasks)} ...")
+        limiter = SiteConcurrencyLimiter(per_site=self._fetch_per_site)
+        stats = SiteFetchStats()
+
+        def fetch(task: dict) -> dict:
+            site_name = task["site_info"].get("name")
+            with limiter.get(site_name):
+                if self._event.is_set():
+                    return task
+                start_time = time.perf_counter()
+                self.__fetch_seed_torrent(task)
+                stats.record(site=site_name, seconds=time.perf_counter() - start_time,
+                             success=bool(task.get("content")))
+            return task
+
+        with ThreadPoolExecutor(max_workers=min(self._fetch_workers, len(seed_tasks)),
+                                thread_name_prefix="IYUUAutoSeed-Fetch") as executor:
+            futures = [executor.submit(fetch, task) for task in seed_tasks]
+            for future in as_completed(futures):
+                if self._event.is_set():
+                    logger.info(f"辅种服务停止")
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                try:
+                    task = future.result()
+                except Exception as e:
+                    logger.error(f"获取辅种种子文件失败：{str(e)}")
+                    continue
+                if self.__add_seed_task(task):
+                    success_torrents.setdefault(task["current_hash"], []).append(task["seed"].get("info_hash"))
+
+        for line in stats.summary():
+            logger.info(f"辅种种子文件获取统计，{line}")
+        return success_torrents
+
+    def __fetch_seed_torrent(self, task: dict):
+        """
+        获取种子下载链接并下载种子文件，结果写入任务中，在工作线程中执行
+        """
+
+        def __is_special_site(url):
+            """
+            判断是否为特殊站点（是否需要添加https）
+            """
+            if "hdsky.me" in url:
+                return False
+            return True
+
+        site_info = task["site_info"]
         # 下载种子
-        torrent_url = self.__get_download_url(seed=seed,
+        torrent_url = self.__get_download_url(seed=task["seed"],
                                               site=site_info,
-                                              base_url=download_page)
+                                              base_url=task["download_page"])
         if not torrent_url:
-            # 加入失败缓存
-            self._error_caches.append(seed.get("info_hash"))
-            self.fail += 1
-            self.cached += 1
-            return False
+            return
         # 强制使用Https
         if __is_special_site(torrent_url):
             if "?" in torrent_url:
                 torrent_url += "&https=1"
             else:
                 torrent_url += "?https=1"
+        task["torrent_url"] = torrent_url
         # 下载种子文件
         _, content, _, _, error_msg = TorrentHelper().download_torrent(
             url=torrent_url,
             cookie=site_info.get("cookie"),
             ua=site_info.get("ua") or settings.USER_AGENT,
             proxy=site_info.get("proxy"))
+        task["content"] = content
+        task["error_msg"] = error_msg
+
+    def __add_seed_task(self, task: dict) -> bool:
+        """
+        将已获取的种子文件添加到下载器
+        """
+        seed = task["seed"]
+        service: ServiceInfo = task["service"]
+        site_info = task["site_info"]
+        torrent_url = task.get("torrent_url")
+        if not torrent_url:
+            # 加入失败缓存
+            self._error_caches.append(seed.get("info_hash"))
+            self.fail += 1
+            self.cached += 1
+            return False
+        content = task.get("content")
         if not content:
             # 下载失败
             self.fail += 1
             # 加入失败缓存
+            error_msg = task.get("error_msg")
             if error_msg and ('无法打开链接' in error_msg or '触发站点流控' in error_msg):
                 self._error_caches.append(seed.get("info_hash"))
             else:
@@ -1101,8 +1388,8 @@ class IYUUAutoSeed(_PluginBase):
         logger.info(f"添加下载任务：{torrent_url} ...")
         download_id = self.__download(service=service,
                                       content=content,
-                                      save_path=save_path,
-                                      save_category=save_category,
+                                      save_path=task.get("save_path"),
+                                      save_category=task.get("save_category"),
                                       site_name=site_info.get("name"))
         if not download_id:
             # 下载失败
@@ -1122,7 +1409,7 @@ class IYUUAutoSeed(_PluginBase):
                         logger.info(f"{download_id} 跳过校验，请自行检查手动开始任务...")
                 else:
                     # 开始校验种子
-                    downloader_obj.recheck_torrents(ids=[download_id])
+                    service.instance.recheck_torrents(ids=[download_id])
                     self.__add_recheck_torrents(service, download_id)
             else:
                 self.__add_recheck_torrents(service, download_id)
@@ -0,0 +1,52 @@
+from typing import Iterable, Iterator, List, Optional
+
+
+class BoundedHashCache:
+    """
+    有容量上限的种子Hash缓存，成员判断为 O(1)，超过容量时淘汰最早加入的Hash
+    """
+
+    def __init__(self, hashs: Optional[Iterable[str]] = None, maxsize: int = 50000):
+        """
+        :param hashs: 初始Hash，按加入顺序排列
+        :param maxsize: 缓存容量上限
+        """
+        self._maxsize = maxsize
+        # 使用字典保存以保持加入顺序
+        self._hashs = dict.fromkeys(hashs or [])
+        self.__evict()
+
+    def __contains__(self, hash_str: str) -> bool:
+        return hash_str in self._hashs
+
+    def __len__(self) -> int:
+        return len(self._hashs)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._hashs)
+
+    def __evict(self):
+        overflow = len(self._hashs) - self._maxsize
+        if overflow <= 0:
+            return
+        for hash_str in list(self._hashs)[:overflow]:
+            del self._hashs[hash_str]
+
+    def append(self, hash_str: str):
+        """
+        加入Hash，已存在时移动到最新位置
+        """
+        if not hash_str:
+            return
+        self._hashs.pop(hash_str, None)
+        self._hashs[hash_str] = None
+        self.__evict()
+
+    def clear(self):
+        self._hashs.clear()
+
+    def to_list(self) -> List[str]:
+        """
+        转换为列表用于保存配置
+        """
+        return list(self._hashs)
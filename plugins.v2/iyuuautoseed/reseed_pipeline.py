@@ -0,0 +1,50 @@
+import threading
+from typing import Dict, List
+
+
+class SiteConcurrencyLimiter:
+    """
+    按站点限制并发获取种子的数量
+    """
+
+    def __init__(self, per_site: int = 2):
+        self._per_site = per_site
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+
+    def get(self, site: str) -> threading.Semaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(site)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self._per_site)
+                self._semaphores[site] = semaphore
+            return semaphore
+
+
+class SiteFetchStats:
+    """
+    按站点统计获取种子的次数、失败次数及耗时
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 站点 -> [次数, 失败次数, 总耗时, 最大耗时]
+        self._stats: Dict[str, List[float]] = {}
+
+    def record(self, site: str, seconds: float, success: bool):
+        with self._lock:
+            stat = self._stats.setdefault(site, [0, 0, 0.0, 0.0])
+            stat[0] += 1
+            if not success:
+                stat[1] += 1
+            stat[2] += seconds
+            stat[3] = max(stat[3], seconds)
+
+    def summary(self) -> List[str]:
+        """
+        输出各站点的统计信息
+        """
+        with self._lock:
+            return [f"{site}：获取 {int(count)} 个，失败 {int(failed)} 个，"
+                    f"平均耗时 {total / count:.2f} 秒，最大耗时 {peak:.2f} 秒"
+                    for site, (count, failed, total, peak) in self._stats.items() if count]
@@ -0,0 +1,100 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.log import logger
+
+# 查询结果缓存在插件数据中的存储键
+SEED_QUERY_CACHE_KEY = "seed_query_cache"
+
+
+class SeedQueryCache:
+    """
+    IYUU辅种查询结果缓存，按种子Hash保存查询结果，有效期内的Hash不再重复请求IYUU
+    """
+
+    def __init__(self, plugin: Any, ttl: float, key: str = SEED_QUERY_CACHE_KEY):
+        """
+        :param plugin: 插件实例，用于调用 get_data/save_data
+        :param ttl: 查询结果有效期（小时）
+        :param key: 插件数据存储键
+        """
+        self._plugin = plugin
+        self._ttl = ttl * 3600
+        self._key = key
+        # Hash -> [查询时间, 查询结果]
+        self._entries: Optional[Dict[str, list]] = None
+        # 最近一次全量查询的时间
+        self._last_full_sweep = 0
+        self._dirty = False
+
+    def __load(self):
+        if self._entries is not None:
+            return
+        data = self._plugin.get_data(key=self._key) or {}
+        self._entries = data.get("entries") or {}
+        self._last_full_sweep = data.get("last_full_sweep") or 0
+
+    def split(self, hashs: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        区分有效期内已查询过的Hash及需要查询的Hash
+        :return: (已缓存的查询结果, 需要查询的Hash)
+        """
+        self.__load()
+        expire_time = time.time() - self._ttl
+        cached, missing = {}, []
+        for hash_str in hashs:
+            entry = self._entries.get(hash_str)
+            if entry and entry[0] >= expire_time:
+                cached[hash_str] = entry[1]
+            else:
+                missing.append(hash_str)
+        return cached, missing
+
+    def put(self, hashs: List[str], seed_list: Dict[str, Any]):
+        """
+        保存一批Hash的查询结果，没有返回可辅种数据的Hash同样缓存，避免重复查询
+        """
+        self.__load()
+        now = time.time()
+        for hash_str in hashs:
+            self._entries[hash_str] = [now, seed_list.get(hash_str)]
+        self._dirty = True
+
+    def need_full_sweep(self, interval_days: float) -> bool:
+        """
+        判断是否需要忽略缓存进行一次全量查询
+        """
+        if not interval_days:
+            return False
+        self.__load()
+        return time.time() - self._last_full_sweep >= interval_days * 86400
+
+    def mark_full_sweep(self):
+        self.__load()
+        self._last_full_sweep = time.time()
+        self._dirty = True
+
+    def save(self):
+        """
+        清理过期的查询结果并保存
+        """
+        if self._entries is None:
+            return
+        expire_time = time.time() - self._ttl
+        expired = [hash_str for hash_str, entry in self._entries.items() if entry[0] < expire_time]
+        for hash_str in expired:
+            del self._entries[hash_str]
+        if not self._dirty and not expired:
+            return
+        self._plugin.save_data(key=self._key, value={
+            "entries": self._entries,
+            "last_full_sweep": self._last_full_sweep
+        })
+        self._dirty = False
+        logger.debug(f"IYUU辅种查询缓存已保存，共 {len(self._entries)} 条，清理过期 {len(expired)} 条")
+
+    def clear(self):
+        self._entries = {}
+        self._last_full_sweep = 0
+        self._dirty = True
+        self.save()
@@ -44,7 +44,7 @@ class LexiAnnot(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/wumode/LexiAnnot/refs/heads/master/LexiAnnot.png"
     # 插件版本
-    plugin_version = "1.0"
+    plugin_version = "1.1"
     # 插件作者
     plugin_author = "wumode"
     # 作者主页
@@ -78,6 +78,7 @@ class LexiAnnot(_PluginBase):
     _accent_color = ''
     _font_scaling = ''
     _opacity = ''
+    _workers = 1
 
     # 插件数据
     _lexicon_version = ''
@@ -90,7 +91,7 @@ class LexiAnnot(_PluginBase):
     _spacy_model_name = "en_core_web_sm"
     _scheduler: Optional[BackgroundScheduler] = None
     _nlp = None
-    _worker_thread = None
+    _worker_threads: List[threading.Thread] = []
     _task_queue = None
     _shutdown_event = None
     _client = None
@@ -100,6 +101,12 @@ class LexiAnnot(_PluginBase):
     _gemini_available = False
     _accent_color_rgb = None
     _color_alpha = 0
+    # spaCy 批量分词参数，标注只需要词性与词形还原，依存分析与命名实体识别不参与计算
+    _spacy_batch_size = 256
+    _spacy_disabled_pipes = ('parser', 'ner')
+    _nlp_lock = threading.Lock()
+    _processing_lock = threading.Lock()
+    _processing: set = set()
 
     def init_plugin(self, config=None):
         self._task_queue = queue.Queue()
@@ -127,6 +134,7 @@ class LexiAnnot(_PluginBase):
             self._accent_color = config.get("accent_color")
             self._font_scaling = config.get("font_scaling")
             self._opacity = config.get("opacity")
+            self._workers = LexiAnnot.__to_int(config.get("workers"), 1)
 
             self._accent_color_rgb = LexiAnnot.hex_to_rgb(self._accent_color) or (255, 255, 0)
             self._color_alpha = int(self._opacity) if self._opacity and len(self._opacity) else 0
@@ -162,8 +170,12 @@ class LexiAnnot(_PluginBase):
                     logger.warn(f"未提供GEMINI APIKEY")
                     self._gemini_available = False
             self._shutdown_event = threading.Event()
-            self._worker_thread = threading.Thread(target=self.__process_tasks, daemon=True)
-            self._worker_thread.start()
+            self._processing = set()
+            self._worker_threads = []
+            for i in range(self._workers):
+                worker_thread = threading.Thread(target=self.__process_tasks, name=f"LexiAnnot-{i}", daemon=True)
+                worker_thread.start()
+                self._worker_threads.append(worker_thread)
             if self._onlyonce:
                 for file_path in self._custom_files.split("\n"):
                     if not file_path:
@@ -593,6 +605,7 @@ class LexiAnnot(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
+                                    'md': 9
                                 },
                                 'content': [
                                     {
@@ -604,6 +617,26 @@ class LexiAnnot(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'workers',
+                                            'label': '并行处理文件数',
+                                            'type': 'number',
+                                            'placeholder': 1,
+                                            'min': 1,
+                                            'hint': '同时处理的视频文件数量，启用Gemini时会相应增加请求频率'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -693,6 +726,7 @@ class LexiAnnot(_PluginBase):
             "accent_color": '',
             "font_scaling": '1',
             "opacity": '0',
+            "workers": 1,
         }
 
     def get_api(self) -> List[Dict[str, Any]]:
@@ -721,13 +755,16 @@ class LexiAnnot(_PluginBase):
         """
         关闭插件
         """
-        if self._worker_thread and self._worker_thread.is_alive():
-            logger.debug("🔻 Stopping existing worker thread...")
+        alive_threads = [t for t in self._worker_threads if t.is_alive()]
+        if alive_threads:
+            logger.debug(f"🔻 Stopping {len(alive_threads)} existing worker thread(s)...")
             self._shutdown_event.set()
-            self._worker_thread.join()
-            logger.debug("✅ Existing worker thread stopped.")
+            for worker_thread in alive_threads:
+                worker_thread.join()
+            logger.debug("✅ Existing worker threads stopped.")
         else:
             logger.debug("ℹ️ No running worker thread to stop.")
+        self._worker_threads = []
 
     def add_media_file(self, path: str):
         """
@@ -760,7 +797,8 @@ class LexiAnnot(_PluginBase):
                             'custom_files': self._custom_files,
                             'accent_color': self._accent_color,
                             'font_scaling': self._font_scaling,
-                            'opacity': self._opacity
+                            'opacity': self._opacity,
+                            'workers': self._workers
                             })
 
     def __process_tasks(self):
@@ -773,7 +811,19 @@ class LexiAnnot(_PluginBase):
                 task = self._task_queue.get(timeout=1)  # 最多等待1秒
                 if task is None:
                     continue
-                self.__process_file(task)
+                # 同一文件同时只由一个线程处理
+                with self._processing_lock:
+                    if task in self._processing:
+                        logger.info(f"文件 {task} 正在处理中, 跳过")
+                        continue
+                    self._processing.add(task)
+                try:
+                    self.__process_file(task)
+                except Exception as e:
+                    logger.error(f"处理文件 {task} 出错: {e}")
+                finally:
+                    with self._processing_lock:
+                        self._processing.discard(task)
             except queue.Empty:
                 continue
         logger.debug("🛑 Worker received shutdown signal, exiting...")
@@ -799,7 +849,11 @@ class LexiAnnot(_PluginBase):
                               mtype=NotificationType.Plugin,
                               text=f"{message}")
         ffmpeg_path = self._ffmpeg_path if self._ffmpeg_path else 'ffmpeg'
+        # 各阶段耗时
+        timings: Dict[str, float] = {}
+        stage_start = time.perf_counter()
         embedded_subtitles = LexiAnnot.__extract_subtitles_by_lang(path, 'en', ffmpeg_path)
+        timings['extract'] = time.perf_counter() - stage_start
         ret_message = ''
         if embedded_subtitles:
             logger.info(f'提取到 {len(embedded_subtitles)} 条英语文本字幕')
@@ -810,15 +864,17 @@ class LexiAnnot(_PluginBase):
                 if embedded_subtitle.get('codec_id') == 'S_TEXT/UTF8':
                     ass_subtitle = LexiAnnot.set_srt_style(ass_subtitle)
                 ass_subtitle = self.__set_style(ass_subtitle)
-                ass_subtitle = self.process_subtitles(ass_subtitle)
+                ass_subtitle = self.process_subtitles(ass_subtitle, timings=timings)
                 if self._shutdown_event.is_set():
                     return
                 if ass_subtitle:
+                    stage_start = time.perf_counter()
                     try:
                         ass_subtitle.save(str(subtitle))
                         ret_message = f"字幕已保存：{str(subtitle)}"
                     except Exception as e:
                         logger.error(f"字幕文件 {subtitle} 保存失败, {e}")
+                    timings['save'] = time.perf_counter() - stage_start
                     break
                 else:
                     logger.info(f"处理字幕{embedded_subtitle['codec_id']}-{embedded_subtitle['stream_id']}失败")
@@ -826,6 +882,7 @@ class LexiAnnot(_PluginBase):
             logger.warn(f"未能在{path}中找到可提取的英文字幕")
         if not ret_message:
             ret_message= f"未能在{path}中找到可提取的英文字幕"
+        logger.info(f"⏱️ {path} 耗时: " + LexiAnnot.format_timings(timings))
         logger.info(f"✅ Finished: {path}")
         if self._send_notify:
             self.post_message(title=f"【{self.plugin_name}】",
@@ -975,6 +1032,27 @@ class LexiAnnot(_PluginBase):
             return min(all_cefr)
         return None
 
+    @staticmethod
+    def format_timings(timings: Dict[str, float]) -> str:
+        """
+        格式化各阶段耗时
+        """
+        stage_names = {
+            'extract': '提取',
+            'tokenize': '分词',
+            'lookup': '查词',
+            'translate': '翻译',
+            'save': '保存'
+        }
+        return ', '.join(f"{name} {timings.get(stage, 0):.2f}s" for stage, name in stage_names.items())
+
+    @staticmethod
+    def __to_int(value: Any, default: int, minimum: int = 1) -> int:
+        try:
+            return max(int(value), minimum)
+        except (TypeError, ValueError):
+            return default
+
     @staticmethod
     def format_duration(ms):
         total_seconds, milliseconds = divmod(ms, 1000)
@@ -1327,22 +1405,34 @@ class LexiAnnot(_PluginBase):
             logger.warning(f"Failed to reconstruct tasks: {str(e)}")
             return tasks
 
-    def __process_by_ai(self, lines_to_process: List[Dict[str, Any]], cefr_lexicon, swear_words, coca20k_lexicon):
+    def __tokenize(self, texts: List[str]) -> List[Any]:
+        """
+        使用 nlp.pipe 批量分词，并关闭标注用不到的管道组件
+        """
+        disabled = [name for name in self._spacy_disabled_pipes if name in self._nlp.pipe_names]
+        # spaCy 模型实例在多线程间共享，分词阶段串行执行
+        with self._nlp_lock:
+            return list(self._nlp.pipe(texts, batch_size=self._spacy_batch_size, disable=disabled))
+
+    def __process_by_ai(self, lines_to_process: List[Dict[str, Any]], cefr_lexicon, swear_words, coca20k_lexicon,
+                        timings: Optional[Dict[str, float]] = None):
         simple_vocabulary = list(filter(lambda x:x<self._annot_level, ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']))
         patterns = [r'\d+th|\d?1st|\d?2nd']
         compiled_patterns = [re.compile(p) for p in patterns]
         model_temperature = float(self._model_temperature) if self._model_temperature else 0.3
         logger.info(f"通过spaCy分词...")
-        vocabulary_trans_instruction = '''You are an expert translator. You will be given a list of English words along with their context, formatted as JSON. For each entry, provide the most appropriate translation in Simplified Chinese based on the context.
-    Only complete the `Chinese` field. Do not include pinyin, explanations, or any additional information.'''
+        if timings is None:
+            timings = {}
         # 使用nlp分词
-        for line_data in lines_to_process:
+        stage_start = time.perf_counter()
+        texts = [line_data.get('raw_subtitle').replace('\n', ' ') for line_data in lines_to_process]
+        docs = self.__tokenize(texts)
+        timings['tokenize'] = time.perf_counter() - stage_start
+        stage_start = time.perf_counter()
+        for line_data, text, doc in zip(lines_to_process, texts, docs):
             if self._shutdown_event.is_set():
                 return lines_to_process
-            text_raw = line_data.get('raw_subtitle')
-            text = text_raw.replace('\n', ' ')
             new_vocab = []
-            doc = self._nlp(text)
             last_end_pos = 0
             lemma_to_query = []
             for token in doc:
@@ -1376,6 +1466,16 @@ class LexiAnnot(_PluginBase):
                                   'pos': token.pos_, 'cefr': cefr, 'Chinese': '', 'phonetics': phonetics,
                                   'pos_defs': pos_defs})
             line_data['new_vocab'] = new_vocab
+        timings['lookup'] = time.perf_counter() - stage_start
+        stage_start = time.perf_counter()
+        try:
+            return self.__translate(lines_to_process, model_temperature)
+        finally:
+            timings['translate'] = time.perf_counter() - stage_start
+
+    def __translate(self, lines_to_process: List[Dict[str, Any]], model_temperature: float):
+        vocabulary_trans_instruction = '''You are an expert translator. You will be given a list of English words along with their context, formatted as JSON. For each entry, provide the most appropriate translation in Simplified Chinese based on the context.
+    Only complete the `Chinese` field. Do not include pinyin, explanations, or any additional information.'''
         # 查询词汇翻译
         task_bulk: List[Union[VocabularyTranslationTask|DialogueTranslationTask]] = []
         i = 0
@@ -1472,9 +1572,10 @@ class LexiAnnot(_PluginBase):
             i += self._context_window
         return lines_to_process
 
-    def process_subtitles(self, ass_file: SSAFile) -> Optional[SSAFile]:
+    def process_subtitles(self, ass_file: SSAFile, timings: Optional[Dict[str, float]] = None) -> Optional[SSAFile]:
         """
         处理字幕内容，标记词汇并添加翻译。
+        :param timings: 记录分词、查词、翻译各阶段耗时
         """
         lang = 'en'
         cefr_lexicon = self._cefr_lexicon
@@ -1510,7 +1611,8 @@ class LexiAnnot(_PluginBase):
             lines_to_process.append(line_data)
             main_dialogue[index] = dialogue
             index += 1
-        lines_to_process = self.__process_by_ai(lines_to_process, cefr_lexicon, swear_words, coca20k_lexicon)
+        lines_to_process = self.__process_by_ai(lines_to_process, cefr_lexicon, swear_words, coca20k_lexicon,
+                                                timings=timings)
 
         # 在原字幕添加标注
         main_style_fs = ass_file.styles[main_style].fontsize
@@ -1,4 +1,5 @@
 import gc
+import time
 import warnings
 from datetime import datetime, timedelta
 from threading import Lock
@@ -6,11 +7,13 @@ from typing import Optional, Any, List, Dict, Tuple
 
 import pytz
 from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy.orm import Session
 
 from app import schemas
 from app.chain.site import SiteChain
 from app.core.config import settings
 from app.core.event import eventmanager, Event
+from app.db import db_query
 from app.db.models.siteuserdata import SiteUserData
 from app.db.site_oper import SiteOper
 from app.helper.sites import SitesHelper
@@ -32,7 +35,7 @@ class SiteStatistic(_PluginBase):
     # 插件图标
     plugin_icon = "statistic.png"
     # 插件版本
-    plugin_version = "1.8"
+    plugin_version = "2.0"
     # 插件作者
     plugin_author = "lightolly,jxxghp"
     # 作者主页
@@ -50,11 +53,18 @@ class SiteStatistic(_PluginBase):
     _dashboard_type: str = "today"
     _notify_type = ""
     _scheduler = None
+    # 统计数据缓存
+    _data_cache: Optional[Tuple[str, List[SiteUserData], List[SiteUserData]]] = None
+    _data_cache_time: float = 0
+    # 统计数据缓存有效期（秒）
+    _data_cache_ttl: int = 60
 
     def init_plugin(self, config: dict = None):
 
         # 停止现有任务
         self.stop_service()
+        # 清空统计数据缓存
+        self._data_cache = None
 
         # 配置
         if config:
@@ -210,8 +220,8 @@ class SiteStatistic(_PluginBase):
             return
         if event.event_data.get('site_id') != "*":
             return
-        # 获取站点数据
-        today, today_data, yesterday_data = self.__get_data()
+        # 获取站点数据，站点刷新后数据已变化，不使用缓存
+        today, today_data, yesterday_data = self.__get_data(force=True)
         # 转换为字典
         today_data_dict = {data.name: data for data in today_data}
         yesterday_data_dict = {data.name: data for data in yesterday_data}
@@ -273,45 +283,86 @@ class SiteStatistic(_PluginBase):
             self.post_message(mtype=NotificationType.SiteMessage,
                               title="站点数据统计", text="\n".join(sorted_messages))
 
+    def __get_data(self, force: bool = False) -> Tuple[str, List[SiteUserData], List[SiteUserData]]:
+        """
+        获取站点统计数据，短时间内的多次调用（仪表板、详情页、消息）共用同一份结果
+        :param force: 是否忽略缓存重新查询
+        """
+        with lock:
+            now = time.time()
+            if not force and self._data_cache is not None \
+                    and now - self._data_cache_time < self._data_cache_ttl:
+                return self._data_cache
+            self._data_cache = self.__query_data()
+            self._data_cache_time = now
+            return self._data_cache
+
     @staticmethod
-    def __get_data() -> Tuple[str, List[SiteUserData], List[SiteUserData]]:
+    @db_query
+    def __query_userdata_by_days(days: List[str], db: Session = None) -> List[SiteUserData]:
+        """
+        一次查询多个日期的站点数据
+        """
+        return db.query(SiteUserData).filter(SiteUserData.updated_day.in_(days)).all()
+
+    def __get_userdata_by_days(self, siteoper: SiteOper, days: List[str]) -> Dict[Tuple[str, str], SiteUserData]:
+        """
+        查询指定日期的站点数据，按 (站点名称, 日期) 索引
+        """
+        userdata_index: Dict[Tuple[str, str], SiteUserData] = {}
+        if not days:
+            return userdata_index
+        try:
+            # 复用 SiteOper 的数据库会话
+            rows = self.__query_userdata_by_days(days, db=getattr(siteoper, "_db", None))
+        except Exception as e:
+            logger.warn(f"批量查询站点数据失败：{str(e)}，改为按日查询")
+            rows = []
+            for day in days:
+                rows.extend(siteoper.get_userdata_by_date(day) or [])
+        for data in rows:
+            userdata_index[(data.name, data.updated_day)] = data
+        return userdata_index
+
+    def __query_data(self) -> Tuple[str, List[SiteUserData], List[SiteUserData]]:
         """
         获取最近一次统计的日期、最近一次统计的站点数据、上一次的站点数据
         如果上一次某个站点数据缺失，则 fallback 到该站点之前最近有数据的日期
         """
         # 优化：只获取最近的站点数据，而不是所有历史数据
-        latest_data: List[SiteUserData] = SiteOper().get_userdata_latest()
+        siteoper = SiteOper()
+        latest_data: List[SiteUserData] = siteoper.get_userdata_latest()
         if not latest_data:
             return "", [], []
 
         # 获取最新日期（用于显示）
         latest_day = max(data.updated_day for data in latest_data)
-        
+
         # 按上传量降序排序
         latest_data.sort(key=lambda x: x.upload or 0, reverse=True)
 
+        # 各站点最近统计日期不同，只查询每个站点实际需要的前1~7天，停用或长期未更新的站点不会扩大查询范围
+        needed_days = set()
+        for data in latest_data:
+            current_day = datetime.strptime(data.updated_day, "%Y-%m-%d")
+            needed_days.update((current_day - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(1, 8))
+        userdata_index = self.__get_userdata_by_days(siteoper, sorted(needed_days))
+
         # 为每个站点查找对应的前一天数据
         previous_data = []
         for current_site in latest_data:
             site_name = current_site.name
-            current_day = current_site.updated_day
-            
-            # 计算该站点的前一天日期
-            previous_day_str = (datetime.strptime(current_day, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
-            
-            # 获取前一天的数据
-            previous_data_list = SiteOper().get_userdata_by_date(previous_day_str)
-            previous_by_site = {data.name: data for data in previous_data_list}
-            site_prev = previous_by_site.get(site_name)
-            
+            current_day = datetime.strptime(current_site.updated_day, "%Y-%m-%d")
+
+            # 前一天的数据
+            site_prev = userdata_index.get((site_name, (current_day - timedelta(days=1)).strftime("%Y-%m-%d")))
+
             # 如果前一天没有该站点数据，尝试查找更早的数据
             if not site_prev or site_prev.err_msg:
-                # 最多回溯7天，避免查询过多历史数据
+                # 最多回溯7天
                 for i in range(2, 8):
-                    fallback_date = (datetime.strptime(current_day, "%Y-%m-%d") - timedelta(days=i)).strftime("%Y-%m-%d")
-                    fallback_data_list = SiteOper().get_userdata_by_date(fallback_date)
-                    fallback_by_site = {data.name: data for data in fallback_data_list}
-                    candidate = fallback_by_site.get(site_name)
+                    fallback_date = (current_day - timedelta(days=i)).strftime("%Y-%m-%d")
+                    candidate = userdata_index.get((site_name, fallback_date))
                     if candidate and not candidate.err_msg:
                         site_prev = candidate
                         break
@@ -319,9 +370,6 @@ class SiteStatistic(_PluginBase):
             if site_prev:
                 previous_data.append(site_prev)
 
-        # 清理垃圾
-        gc.collect()
-
         return latest_day, latest_data, previous_data
 
     @staticmethod
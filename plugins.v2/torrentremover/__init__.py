@@ -1,6 +1,4 @@
-import re
 import threading
-import time
 from datetime import datetime, timedelta
 from typing import List, Tuple, Dict, Any, Optional
 
@@ -12,6 +10,7 @@ from app.core.config import settings
 from app.helper.downloader import DownloaderHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.torrentremover.remove_rule import RemoveRule
 from app.schemas import NotificationType, ServiceInfo
 from app.utils.string import StringUtils
 
@@ -26,7 +25,7 @@ class TorrentRemover(_PluginBase):
     # 插件图标
     plugin_icon = "delete.jpg"
     # 插件版本
-    plugin_version = "2.2"
+    plugin_version = "2.3"
     # 插件作者
     plugin_author = "jxxghp"
     # 作者主页
@@ -60,6 +59,8 @@ class TorrentRemover(_PluginBase):
     _errorkeywords = None
     _torrentstates = None
     _torrentcategorys = None
+    # 每次调用下载器接口处理的种子数量
+    _batchsize = 100
 
     def init_plugin(self, config: dict = None):
 
@@ -82,6 +83,10 @@ class TorrentRemover(_PluginBase):
             self._errorkeywords = config.get("errorkeywords") or ""
             self._torrentstates = config.get("torrentstates") or ""
             self._torrentcategorys = config.get("torrentcategorys") or ""
+            try:
+                self._batchsize = max(int(config.get("batchsize") or 100), 1)
+            except ValueError:
+                self._batchsize = 100
 
         self.stop_service()
 
@@ -114,8 +119,8 @@ class TorrentRemover(_PluginBase):
                     "trackerkeywords": self._trackerkeywords,
                     "errorkeywords": self._errorkeywords,
                     "torrentstates": self._torrentstates,
-                    "torrentcategorys": self._torrentcategorys
-
+                    "torrentcategorys": self._torrentcategorys,
+                    "batchsize": self._batchsize
                 })
                 if self._scheduler.get_jobs():
                     # 启动服务
@@ -425,6 +430,22 @@ class TorrentRemover(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'batchsize',
+                                            'label': '批量处理数量',
+                                            'placeholder': '每次调用下载器处理的种子数，默认100'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -562,7 +583,8 @@ class TorrentRemover(_PluginBase):
             "trackerkeywords": "",
             "errorkeywords": "",
             "torrentstates": "",
-            "torrentcategorys": ""
+            "torrentcategorys": "",
+            "batchsize": 100
         }
 
     def get_page(self) -> List[dict]:
@@ -626,6 +648,14 @@ class TorrentRemover(_PluginBase):
         """
         定时删除下载器中的下载任务
         """
+        actions = {
+            "pause": ("暂停", "暂停种子"),
+            "delete": ("删除", "删除种子"),
+            "deletefile": ("删除", "删除种子及文件"),
+        }
+        if self._action not in actions:
+            return
+        action_name, log_name = actions[self._action]
         for downloader in self._downloaders:
             try:
                 with lock:
@@ -634,49 +664,26 @@ class TorrentRemover(_PluginBase):
                     logger.info(f"自动删种任务 获取符合处理条件种子数 {len(torrents)}")
                     # 下载器
                     downlader_obj = self.__get_downloader(downloader)
-                    if self._action == "pause":
-                        message_text = f"{downloader.title()} 共暂停{len(torrents)}个种子"
-                        for torrent in torrents:
-                            if self._event.is_set():
-                                logger.info(f"自动删种服务停止")
-                                return
-                            text_item = f"{torrent.get('name')} " \
-                                        f"来自站点：{torrent.get('site')} " \
-                                        f"大小：{StringUtils.str_filesize(torrent.get('size'))}"
-                            # 暂停种子
-                            downlader_obj.stop_torrents(ids=[torrent.get("id")])
-                            logger.info(f"自动删种任务 暂停种子：{text_item}")
-                            message_text = f"{message_text}\n{text_item}"
-                    elif self._action == "delete":
-                        message_text = f"{downloader.title()} 共删除{len(torrents)}个种子"
-                        for torrent in torrents:
-                            if self._event.is_set():
-                                logger.info(f"自动删种服务停止")
-                                return
+                    message_text = f"{downloader.title()} 共{action_name}{len(torrents)}个种子" \
+                                   f"{'及文件' if self._action == 'deletefile' else ''}"
+                    # 分批处理，减少下载器接口调用次数
+                    for i in range(0, len(torrents), self._batchsize):
+                        if self._event.is_set():
+                            logger.info(f"自动删种服务停止")
+                            return
+                        chunk = torrents[i:i + self._batchsize]
+                        ids = [torrent.get("id") for torrent in chunk]
+                        if self._action == "pause":
+                            downlader_obj.stop_torrents(ids=ids)
+                        else:
+                            downlader_obj.delete_torrents(delete_file=self._action == "deletefile",
+                                                          ids=ids)
+                        for torrent in chunk:
                             text_item = f"{torrent.get('name')} " \
                                         f"来自站点：{torrent.get('site')} " \
                                         f"大小：{StringUtils.str_filesize(torrent.get('size'))}"
-                            # 删除种子
-                            downlader_obj.delete_torrents(delete_file=False,
-                                                          ids=[torrent.get("id")])
-                            logger.info(f"自动删种任务 删除种子：{text_item}")
+                            logger.info(f"自动删种任务 {log_name}：{text_item}")
                             message_text = f"{message_text}\n{text_item}"
-                    elif self._action == "deletefile":
-                        message_text = f"{downloader.title()} 共删除{len(torrents)}个种子及文件"
-                        for torrent in torrents:
-                            if self._event.is_set():
-                                logger.info(f"自动删种服务停止")
-                                return
-                            text_item = f"{torrent.get('name')} " \
-                                        f"来自站点：{torrent.get('site')} " \
-                                        f"大小：{StringUtils.str_filesize(torrent.get('size'))}"
-                            # 删除种子
-                            downlader_obj.delete_torrents(delete_file=True,
-                                                          ids=[torrent.get("id")])
-                            logger.info(f"自动删种任务 删除种子及文件：{text_item}")
-                            message_text = f"{message_text}\n{text_item}"
-                    else:
-                        continue
                     if torrents and message_text and self._notify:
                         self.post_message(
                             mtype=NotificationType.SiteMessage,
@@ -686,102 +693,10 @@ class TorrentRemover(_PluginBase):
             except Exception as e:
                 logger.error(f"自动删种任务异常：{str(e)}")
 
-    def __get_qb_torrent(self, torrent: Any) -> Optional[dict]:
-        """
-        检查QB下载任务是否符合条件
-        """
-        # 完成时间
-        date_done = torrent.completion_on if torrent.completion_on > 0 else torrent.added_on
-        # 现在时间
-        date_now = int(time.mktime(datetime.now().timetuple()))
-        # 做种时间
-        torrent_seeding_time = date_now - date_done if date_done else 0
-        # 平均上传速度
-        torrent_upload_avs = torrent.uploaded / torrent_seeding_time if torrent_seeding_time else 0
-        # 大小 单位：GB
-        sizes = self._size.split('-') if self._size else []
-        minsize = float(sizes[0]) * 1024 * 1024 * 1024 if sizes else 0
-        maxsize = float(sizes[-1]) * 1024 * 1024 * 1024 if sizes else 0
-        # 分享率
-        if self._ratio and torrent.ratio <= float(self._ratio):
-            return None
-        # 做种时间 单位：小时
-        if self._time and torrent_seeding_time <= float(self._time) * 3600:
-            return None
-        # 文件大小
-        if self._size and (torrent.size >= int(maxsize) or torrent.size <= int(minsize)):
-            return None
-        if self._upspeed and torrent_upload_avs >= float(self._upspeed) * 1024:
-            return None
-        if self._pathkeywords and not re.findall(self._pathkeywords, torrent.save_path, re.I):
-            return None
-        if self._trackerkeywords and not re.findall(self._trackerkeywords, torrent.tracker, re.I):
-            return None
-        if self._torrentstates and torrent.state not in self._torrentstates:
-            return None
-        if self._torrentcategorys and (not torrent.category or torrent.category not in self._torrentcategorys):
-            return None
-        return {
-            "id": torrent.hash,
-            "name": torrent.name,
-            "site": StringUtils.get_url_sld(torrent.tracker),
-            "size": torrent.size
-        }
-
-    def __get_tr_torrent(self, torrent: Any) -> Optional[dict]:
-        """
-        检查TR下载任务是否符合条件
-        """
-        # 完成时间
-        date_done = torrent.date_done or torrent.date_added
-        # 现在时间
-        date_now = int(time.mktime(datetime.now().timetuple()))
-        # 做种时间
-        torrent_seeding_time = date_now - int(time.mktime(date_done.timetuple())) if date_done else 0
-        # 上传量
-        torrent_uploaded = torrent.ratio * torrent.total_size
-        # 平均上传速茺
-        torrent_upload_avs = torrent_uploaded / torrent_seeding_time if torrent_seeding_time else 0
-        # 大小 单位：GB
-        sizes = self._size.split('-') if self._size else []
-        minsize = float(sizes[0]) * 1024 * 1024 * 1024 if sizes else 0
-        maxsize = float(sizes[-1]) * 1024 * 1024 * 1024 if sizes else 0
-        # 分享率
-        if self._ratio and torrent.ratio <= float(self._ratio):
-            return None
-        if self._time and torrent_seeding_time <= float(self._time) * 3600:
-            return None
-        if self._size and (torrent.total_size >= int(maxsize) or torrent.total_size <= int(minsize)):
-            return None
-        if self._upspeed and torrent_upload_avs >= float(self._upspeed) * 1024:
-            return None
-        if self._pathkeywords and not re.findall(self._pathkeywords, torrent.download_dir, re.I):
-            return None
-        if self._trackerkeywords:
-            if not torrent.trackers:
-                return None
-            else:
-                tacker_key_flag = False
-                for tracker in torrent.trackers:
-                    if re.findall(self._trackerkeywords, tracker.get("announce", ""), re.I):
-                        tacker_key_flag = True
-                        break
-                if not tacker_key_flag:
-                    return None
-        if self._errorkeywords and not re.findall(self._errorkeywords, torrent.error_string, re.I):
-            return None
-        return {
-            "id": torrent.hashString,
-            "name": torrent.name,
-            "site": torrent.trackers[0].get("sitename") if torrent.trackers else "",
-            "size": torrent.total_size
-        }
-
     def get_remove_torrents(self, downloader: str):
         """
         获取自动删种任务种子
         """
-        remove_torrents = []
         # 下载器对象
         downloader_obj = self.__get_downloader(downloader)
         downloader_config = self.__get_downloader_config(downloader)
@@ -796,45 +711,19 @@ class TorrentRemover(_PluginBase):
         torrents, error_flag = downloader_obj.get_torrents(tags=tags or None)
         if error_flag:
             return []
-        # 处理种子
-        for torrent in torrents:
-            if downloader_config.type == "qbittorrent":
-                item = self.__get_qb_torrent(torrent)
-            else:
-                item = self.__get_tr_torrent(torrent)
-            if not item:
-                continue
-            remove_torrents.append(item)
+        # 删种条件只构建一次，批量筛选种子
+        rule = RemoveRule(size=self._size,
+                          ratio=self._ratio,
+                          seeding_time=self._time,
+                          upspeed=self._upspeed,
+                          pathkeywords=self._pathkeywords,
+                          trackerkeywords=self._trackerkeywords,
+                          errorkeywords=self._errorkeywords,
+                          torrentstates=self._torrentstates,
+                          torrentcategorys=self._torrentcategorys)
+        is_qb = downloader_config.type == "qbittorrent"
+        remove_torrents = rule.filter(torrents, is_qb=is_qb)
         # 处理辅种
         if self._samedata and remove_torrents:
-            remove_ids = [t.get("id") for t in remove_torrents]
-            remove_torrents_plus = []
-            for remove_torrent in remove_torrents:
-                name = remove_torrent.get("name")
-                size = remove_torrent.get("size")
-                for torrent in torrents:
-                    if downloader_config.type == "qbittorrent":
-                        plus_id = torrent.hash
-                        plus_name = torrent.name
-                        plus_size = torrent.size
-                        plus_site = StringUtils.get_url_sld(torrent.tracker)
-                    else:
-                        plus_id = torrent.hashString
-                        plus_name = torrent.name
-                        plus_size = torrent.total_size
-                        plus_site = torrent.trackers[0].get("sitename") if torrent.trackers else ""
-                    # 比对名称和大小
-                    if plus_name == name \
-                            and plus_size == size \
-                            and plus_id not in remove_ids:
-                        remove_torrents_plus.append(
-                            {
-                                "id": plus_id,
-                                "name": plus_name,
-                                "site": plus_site,
-                                "size": plus_size
-                            }
-                        )
-            if remove_torrents_plus:
-                remove_torrents.extend(remove_torrents_plus)
+            remove_torrents.extend(RemoveRule.same_data(torrents, remove_torrents, is_qb=is_qb))
         return remove_torrents
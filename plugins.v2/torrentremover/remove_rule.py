@@ -0,0 +1,143 @@
+import re
+import time
+from datetime import datetime
+from typing import Any, List, Optional, Pattern
+
+from app.utils.string import StringUtils
+
+
+class RemoveRule:
+    """
+    自动删种条件，每次运行时根据配置构建一次，预先解析数值并编译正则表达式
+    """
+
+    def __init__(self, size: str = None, ratio: str = None, seeding_time: str = None, upspeed: str = None,
+                 pathkeywords: str = None, trackerkeywords: str = None, errorkeywords: str = None,
+                 torrentstates: str = None, torrentcategorys: str = None):
+        # 大小 单位：GB
+        sizes = size.split('-') if size else []
+        self.has_size = bool(size)
+        self.minsize = int(float(sizes[0]) * 1024 * 1024 * 1024) if sizes else 0
+        self.maxsize = int(float(sizes[-1]) * 1024 * 1024 * 1024) if sizes else 0
+        # 分享率
+        self.ratio = float(ratio) if ratio else None
+        # 做种时间 单位：小时
+        self.seeding_time = float(seeding_time) * 3600 if seeding_time else None
+        # 平均上传速度 单位：KB/s
+        self.upspeed = float(upspeed) * 1024 if upspeed else None
+        # 关键字
+        self.path_re = self.__compile(pathkeywords)
+        self.tracker_re = self.__compile(trackerkeywords)
+        self.error_re = self.__compile(errorkeywords)
+        self.torrentstates = torrentstates
+        self.torrentcategorys = torrentcategorys
+        # 现在时间，同一批种子使用同一时间
+        self.date_now = int(time.mktime(datetime.now().timetuple()))
+
+    @staticmethod
+    def __compile(pattern: str) -> Optional[Pattern]:
+        return re.compile(pattern, re.I) if pattern else None
+
+    def __check_common(self, ratio: float, seeding_time: int, size: int, upload_avs: float) -> bool:
+        """
+        检查分享率、做种时间、大小及平均上传速度
+        """
+        if self.ratio is not None and ratio <= self.ratio:
+            return False
+        if self.seeding_time is not None and seeding_time <= self.seeding_time:
+            return False
+        if self.has_size and (size >= self.maxsize or size <= self.minsize):
+            return False
+        if self.upspeed is not None and upload_avs >= self.upspeed:
+            return False
+        return True
+
+    def match_qb(self, torrent: Any) -> Optional[dict]:
+        """
+        检查QB下载任务是否符合条件
+        """
+        # 完成时间
+        date_done = torrent.completion_on if torrent.completion_on > 0 else torrent.added_on
+        # 做种时间
+        torrent_seeding_time = self.date_now - date_done if date_done else 0
+        # 平均上传速度
+        torrent_upload_avs = torrent.uploaded / torrent_seeding_time if torrent_seeding_time else 0
+        if not self.__check_common(torrent.ratio, torrent_seeding_time, torrent.size, torrent_upload_avs):
+            return None
+        if self.path_re and not self.path_re.search(torrent.save_path):
+            return None
+        if self.tracker_re and not self.tracker_re.search(torrent.tracker):
+            return None
+        if self.torrentstates and torrent.state not in self.torrentstates:
+            return None
+        if self.torrentcategorys and (not torrent.category or torrent.category not in self.torrentcategorys):
+            return None
+        return self.qb_item(torrent)
+
+    def match_tr(self, torrent: Any) -> Optional[dict]:
+        """
+        检查TR下载任务是否符合条件
+        """
+        # 完成时间
+        date_done = torrent.date_done or torrent.date_added
+        # 做种时间
+        torrent_seeding_time = self.date_now - int(time.mktime(date_done.timetuple())) if date_done else 0
+        # 上传量
+        torrent_uploaded = torrent.ratio * torrent.total_size
+        # 平均上传速度
+        torrent_upload_avs = torrent_uploaded / torrent_seeding_time if torrent_seeding_time else 0
+        if not self.__check_common(torrent.ratio, torrent_seeding_time, torrent.total_size, torrent_upload_avs):
+            return None
+        if self.path_re and not self.path_re.search(torrent.download_dir):
+            return None
+        if self.tracker_re:
+            if not torrent.trackers:
+                return None
+            if not any(self.tracker_re.search(tracker.get("announce", "")) for tracker in torrent.trackers):
+                return None
+        if self.error_re and not self.error_re.search(torrent.error_string):
+            return None
+        return self.tr_item(torrent)
+
+    @staticmethod
+    def qb_item(torrent: Any) -> dict:
+        return {
+            "id": torrent.hash,
+            "name": torrent.name,
+            "site": StringUtils.get_url_sld(torrent.tracker),
+            "size": torrent.size
+        }
+
+    @staticmethod
+    def tr_item(torrent: Any) -> dict:
+        return {
+            "id": torrent.hashString,
+            "name": torrent.name,
+            "site": torrent.trackers[0].get("sitename") if torrent.trackers else "",
+            "size": torrent.total_size
+        }
+
+    def filter(self, torrents: List[Any], is_qb: bool) -> List[dict]:
+        """
+        批量筛选符合条件的下载任务
+        """
+        match = self.match_qb if is_qb else self.match_tr
+        return [item for item in map(match, torrents) if item]
+
+    @staticmethod
+    def same_data(torrents: List[Any], remove_torrents: List[dict], is_qb: bool) -> List[dict]:
+        """
+        按名称和大小查找待删除任务的辅种
+        """
+        remove_ids = {t.get("id") for t in remove_torrents}
+        remove_keys = {(t.get("name"), t.get("size")) for t in remove_torrents}
+        to_item = RemoveRule.qb_item if is_qb else RemoveRule.tr_item
+        remove_torrents_plus = []
+        for torrent in torrents:
+            plus_id = torrent.hash if is_qb else torrent.hashString
+            if plus_id in remove_ids:
+                continue
+            key = (torrent.name, torrent.size if is_qb else torrent.total_size)
+            if key in remove_keys:
+                remove_torrents_plus.append(to_item(torrent))
+        return remove_torrents_plus
@@ -1,3 +1,4 @@
+import copy
 import datetime
 import re
 import shutil
@@ -21,17 +22,19 @@ from app.core.config import settings
 from app.core.context import MediaInfo
 from app.core.event import eventmanager, Event
 from app.core.metainfo import MetaInfoPath
+from app.db import SessionFactory
 from app.db.downloadhistory_oper import DownloadHistoryOper
+from app.db.models.transferhistory import TransferHistory
 from app.db.transferhistory_oper import TransferHistoryOper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.dirmonitor.event_filter import EventCoalescer, ExcludeMatcher
+from app.plugins.dirmonitor.pipeline import FilePipeline, KeyedLock, SharedResultCache
 from app.schemas import NotificationType, TransferInfo
 from app.schemas.types import EventType, MediaType, SystemConfigKey
 from app.utils.string import StringUtils
 from app.utils.system import SystemUtils
 
-lock = threading.Lock()
-
 
 class FileMonitorHandler(FileSystemEventHandler):
     """
@@ -60,7 +63,7 @@ class DirMonitor(_PluginBase):
     # 插件图标
     plugin_icon = "directory.png"
     # 插件版本
-    plugin_version = "2.4"
+    plugin_version = "2.8"
     # 插件作者
     plugin_author = "jxxghp"
     # 作者主页
@@ -98,6 +101,27 @@ class DirMonitor(_PluginBase):
     # 存储源目录转移方式
     _transferconf: Dict[str, Optional[str]] = {}
     _medias = {}
+    _medias_lock = threading.Lock()
+    # 并发处理文件数
+    _workers: int = 4
+    # 文件处理线程池
+    _pipeline: Optional[FilePipeline] = None
+    # 同一源文件同时只处理一次
+    _file_lock = KeyedLock()
+    # 同一目标媒体目录串行转移
+    _target_lock = KeyedLock()
+    # 同一媒体（标题、季）共用识别结果及剧集信息
+    _media_cache = SharedResultCache(ttl=600)
+    _episodes_cache = SharedResultCache(ttl=600)
+    # 文件事件去抖合并
+    _coalescer: Optional[EventCoalescer] = None
+    # 文件最后一次事件后等待的时间（秒）
+    _debounce: float = 3
+    # 过滤关键字
+    _exclude_matcher: Optional[ExcludeMatcher] = None
+    # 整理屏蔽词及其编译结果
+    _transfer_exclude_words: Optional[tuple] = None
+    _transfer_exclude_matcher: Optional[ExcludeMatcher] = None
     # 退出事件
     _event = threading.Event()
 
@@ -124,11 +148,25 @@ class DirMonitor(_PluginBase):
             self._cron = config.get("cron")
             self._size = config.get("size") or 0
             self._scrape = config.get("scrape") or False
+            try:
+                self._workers = max(int(config.get("workers") or 4), 1)
+            except ValueError:
+                self._workers = 4
 
         # 停止现有任务
         self.stop_service()
 
+        # 编译过滤关键字
+        self._exclude_matcher = ExcludeMatcher(keywords=self._exclude_keywords.split("\n"))
+        self._transfer_exclude_words = None
+
         if self._enabled or self._onlyonce:
+            # 文件处理线程池
+            self._pipeline = FilePipeline(handler=self.__handle_file, workers=self._workers)
+            # 文件事件去抖合并
+            if self._enabled:
+                self._coalescer = EventCoalescer(callback=self.__handle_events, delay=self._debounce,
+                                                 name="DirMonitor-Events")
             # 定时服务管理器
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
             # 追加入库消息统一发送服务
@@ -242,7 +280,8 @@ class DirMonitor(_PluginBase):
             "interval": self._interval,
             "cron": self._cron,
             "size": self._size,
-            "scrape": self._scrape
+            "scrape": self._scrape,
+            "workers": self._workers
         })
 
     @eventmanager.register(EventType.PluginAction)
@@ -267,11 +306,19 @@ class DirMonitor(_PluginBase):
         立即运行一次，全量同步目录中所有文件
         """
         logger.info("开始全量同步监控目录 ...")
+        futures = []
         # 遍历所有监控目录
         for mon_path in self._dirconf.keys():
             # 遍历目录下所有文件
-            for file_path in SystemUtils.list_files(Path(mon_path), settings.RMT_MEDIAEXT):
-                self.__handle_file(event_path=str(file_path), mon_path=mon_path)
+            file_paths = [str(file_path) for file_path in
+                          SystemUtils.list_files(Path(mon_path), settings.RMT_MEDIAEXT)]
+            # 批量排除已整理过的文件，其余提交到线程池并发处理
+            transferred = self.__get_transferred(file_paths)
+            for file_path in file_paths:
+                if file_path in transferred:
+                    continue
+                futures.append(self.__submit_file(event_path=file_path, mon_path=mon_path))
+        FilePipeline.wait(futures)
         logger.info("全量同步监控目录完成！")
 
     def event_handler(self, event, mon_path: str, text: str, event_path: str):
@@ -285,7 +332,102 @@ class DirMonitor(_PluginBase):
         if not event.is_directory:
             # 文件发生变化
             logger.debug("文件%s：%s" % (text, event_path))
-            self.__handle_file(event_path=event_path, mon_path=mon_path)
+            if not self._coalescer:
+                self.__submit_file(event_path=event_path, mon_path=mon_path)
+                return
+            # 文件被重命名时，原路径无需再处理
+            if event.event_type == "moved":
+                self._coalescer.discard(event.src_path)
+            self._coalescer.push(event_path, mon_path)
+
+    def __handle_events(self, events: List[Tuple[str, str]]):
+        """
+        批量处理去抖后的文件事件，已整理过的文件一次查询排除
+        :param events: [(文件路径, 监控目录)]
+        """
+        transferred = self.__get_transferred([event_path for event_path, _ in events])
+        for event_path, mon_path in events:
+            if event_path in transferred:
+                logger.debug("文件已处理过：%s" % event_path)
+                continue
+            self.__submit_file(event_path=event_path, mon_path=mon_path)
+        if self._coalescer:
+            logger.debug(f"目录监控事件统计：{self._coalescer.stats()}")
+
+    def __get_transferred(self, paths: List[str], chunk_size: int = 500) -> set:
+        """
+        批量查询已存在整理历史的源文件
+        """
+        transferred = set()
+        if not paths:
+            return transferred
+        try:
+            with SessionFactory() as db:
+                for i in range(0, len(paths), chunk_size):
+                    rows = db.query(TransferHistory.src) \
+                        .filter(TransferHistory.src.in_(paths[i:i + chunk_size])) \
+                        .all()
+                    transferred.update(row[0] for row in rows)
+        except Exception as e:
+            logger.warn(f"批量查询整理历史失败：{str(e)}，改为逐条查询")
+            transferred = {path for path in paths if self.transferhis.get_by_src(path)}
+        return transferred
+
+    def __get_transfer_exclude_matcher(self) -> ExcludeMatcher:
+        """
+        获取整理屏蔽词匹配器，屏蔽词发生变化时重新编译
+        """
+        words = tuple(self.systemconfig.get(SystemConfigKey.TransferExcludeWords) or [])
+        if self._transfer_exclude_matcher is None or words != self._transfer_exclude_words:
+            self._transfer_exclude_matcher = ExcludeMatcher(ignorecase_keywords=words)
+            self._transfer_exclude_words = words
+        return self._transfer_exclude_matcher
+
+    def __submit_file(self, event_path: str, mon_path: str):
+        """
+        提交文件到线程池处理，线程池未启动时直接处理
+        """
+        if self._pipeline:
+            return self._pipeline.submit(event_path, mon_path)
+        self.__handle_file(event_path=event_path, mon_path=mon_path)
+        return None
+
+    def __recognize_media(self, file_meta: MetaInfoPath, download_history: Any) -> Optional[MediaInfo]:
+        """
+        识别媒体信息并更新媒体图片，同一媒体的多个文件共用一次识别结果
+        """
+        if download_history and download_history.tmdbid:
+            key = ("tmdb", download_history.type, download_history.tmdbid, download_history.doubanid)
+
+            def __recognize():
+                return self.mediaChain.recognize_media(mtype=MediaType(download_history.type),
+                                                       tmdbid=download_history.tmdbid,
+                                                       doubanid=download_history.doubanid)
+        else:
+            # 路径中可能指定了 tmdbid/doubanid，同名文件指定的媒体不同时不能共用识别结果
+            key = ("meta", file_meta.name, file_meta.year, file_meta.type, file_meta.begin_season,
+                   file_meta.tmdbid, file_meta.doubanid)
+
+            def __recognize():
+                return self.mediaChain.recognize_by_meta(file_meta)
+
+        def __load():
+            mediainfo: MediaInfo = __recognize()
+            if not mediainfo:
+                return None
+            # 如果未开启新增已入库媒体是否跟随TMDB信息变化则根据tmdbid查询之前的title
+            if not settings.SCRAP_FOLLOW_TMDB:
+                transfer_history = self.transferhis.get_by_type_tmdbid(tmdbid=mediainfo.tmdb_id,
+                                                                       mtype=mediainfo.type.value)
+                if transfer_history:
+                    mediainfo.title = transfer_history.title
+            # 更新媒体图片
+            self.chain.obtain_images(mediainfo=mediainfo)
+            return mediainfo
+
+        mediainfo = self._media_cache.get_or_load(key, __load)
+        # 每个文件使用独立的副本，避免转移过程中相互影响
+        return copy.deepcopy(mediainfo) if mediainfo else None
 
     def __handle_file(self, event_path: str, mon_path: str):
         """
@@ -297,8 +439,13 @@ class DirMonitor(_PluginBase):
         try:
             if not file_path.exists():
                 return
-            # 全程加锁
-            with lock:
+            if self._event.is_set():
+                return
+            # 同一文件加锁，不同文件并发处理，蓝光原盘按目录加锁
+            lock_key = event_path
+            if re.search(r"BDMV[/\\]STREAM", event_path, re.IGNORECASE):
+                lock_key = event_path[:event_path.find("BDMV")]
+            with self._file_lock.lock(lock_key):
                 transfer_history = self.transferhis.get_by_src(event_path)
                 if transfer_history:
                     logger.debug("文件已处理过：%s" % event_path)
@@ -313,21 +460,17 @@ class DirMonitor(_PluginBase):
                     return
 
                 # 命中过滤关键字不处理
-                if self._exclude_keywords:
-                    for keyword in self._exclude_keywords.split("\n"):
-                        if keyword and re.findall(keyword, event_path):
-                            logger.info(f"{event_path} 命中过滤关键字 {keyword}，不处理")
-                            return
+                if self._exclude_matcher:
+                    keyword = self._exclude_matcher.match(event_path)
+                    if keyword:
+                        logger.info(f"{event_path} 命中过滤关键字 {keyword}，不处理")
+                        return
 
                 # 整理屏蔽词不处理
-                transfer_exclude_words = self.systemconfig.get(SystemConfigKey.TransferExcludeWords)
-                if transfer_exclude_words:
-                    for keyword in transfer_exclude_words:
-                        if not keyword:
-                            continue
-                        if keyword and re.search(r"%s" % keyword, event_path, re.IGNORECASE):
-                            logger.info(f"{event_path} 命中整理屏蔽词 {keyword}，不处理")
-                            return
+                keyword = self.__get_transfer_exclude_matcher().match(event_path)
+                if keyword:
+                    logger.info(f"{event_path} 命中整理屏蔽词 {keyword}，不处理")
+                    return
 
                 # 不是媒体文件不处理
                 if file_path.suffix.casefold() not in map(str.casefold, settings.RMT_MEDIAEXT):
@@ -377,12 +520,8 @@ class DirMonitor(_PluginBase):
                         download_history = self.downloadhis.get_by_hash(download_file.download_hash)
 
                 # 识别媒体信息
-                if download_history and download_history.tmdbid:
-                    mediainfo: MediaInfo = self.mediaChain.recognize_media(mtype=MediaType(download_history.type),
-                                                                           tmdbid=download_history.tmdbid,
-                                                                           doubanid=download_history.doubanid)
-                else:
-                    mediainfo: MediaInfo = self.mediaChain.recognize_by_meta(file_meta)
+                mediainfo: MediaInfo = self.__recognize_media(file_meta=file_meta,
+                                                              download_history=download_history)
                 if not mediainfo:
                     logger.warn(f'未识别到媒体信息，标题：{file_meta.name}')
                     # 新增转移成功历史记录
@@ -399,21 +538,14 @@ class DirMonitor(_PluginBase):
                         )
                     return
 
-                # 如果未开启新增已入库媒体是否跟随TMDB信息变化则根据tmdbid查询之前的title
-                if not settings.SCRAP_FOLLOW_TMDB:
-                    transfer_history = self.transferhis.get_by_type_tmdbid(tmdbid=mediainfo.tmdb_id,
-                                                                           mtype=mediainfo.type.value)
-                    if transfer_history:
-                        mediainfo.title = transfer_history.title
                 logger.info(f"{file_path.name} 识别为：{mediainfo.type.value} {mediainfo.title_year}")
 
-                # 更新媒体图片
-                self.chain.obtain_images(mediainfo=mediainfo)
-
-                # 获取集数据
+                # 获取集数据，同一季共用
                 if mediainfo.type == MediaType.TV:
-                    episodes_info = self.tmdbchain.tmdb_episodes(tmdbid=mediainfo.tmdb_id,
-                                                                 season=file_meta.begin_season or 1)
+                    season = file_meta.begin_season or 1
+                    episodes_info = self._episodes_cache.get_or_load(
+                        (mediainfo.tmdb_id, season),
+                        lambda: self.tmdbchain.tmdb_episodes(tmdbid=mediainfo.tmdb_id, season=season))
                 else:
                     episodes_info = None
 
@@ -422,24 +554,40 @@ class DirMonitor(_PluginBase):
                 if download_history:
                     download_hash = download_history.download_hash
 
-                # 转移
-                transferinfo: TransferInfo = self.chain.transfer(mediainfo=mediainfo,
-                                                                 path=file_path,
-                                                                 transfer_type=transfer_type,
-                                                                 target=target,
-                                                                 meta=file_meta,
-                                                                 episodes_info=episodes_info)
+                # 同一目标媒体目录的文件串行转移，不同媒体并发处理
+                target_key = (str(target), mediainfo.type, mediainfo.tmdb_id, file_meta.begin_season)
+                with self._target_lock.lock(target_key):
+                    # 转移
+                    transferinfo: TransferInfo = self.chain.transfer(mediainfo=mediainfo,
+                                                                     path=file_path,
+                                                                     transfer_type=transfer_type,
+                                                                     target=target,
+                                                                     meta=file_meta,
+                                                                     episodes_info=episodes_info)
+
+                    if not transferinfo:
+                        logger.error("文件转移模块运行失败")
+                        return
 
-                if not transferinfo:
-                    logger.error("文件转移模块运行失败")
-                    return
+                    if not transferinfo.success:
+                        # 判断是否转移后文件已存在，补充转移成功历史记录
+                        if transferinfo.target_path and transferinfo.target_path.exists():
+                            logger.info(f"{file_path.name} 目标文件已存在，补充转移成功历史记录")
+                            # 补充转移成功历史记录
+                            self.transferhis.add_success(
+                                src_path=file_path,
+                                mode=transfer_type,
+                                download_hash=download_hash,
+                                meta=file_meta,
+                                mediainfo=mediainfo,
+                                transferinfo=transferinfo
+                            )
+                            return
 
-                if not transferinfo.success:
-                    # 判断是否转移后文件已存在，补充转移成功历史记录
-                    if transferinfo.target_path and transferinfo.target_path.exists():
-                        logger.info(f"{file_path.name} 目标文件已存在，补充转移成功历史记录")
-                        # 补充转移成功历史记录
-                        self.transferhis.add_success(
+                        # 转移失败
+                        logger.warn(f"{file_path.name} 入库失败：{transferinfo.message}")
+                        # 新增转移失败历史记录
+                        self.transferhis.add_fail(
                             src_path=file_path,
                             mode=transfer_type,
                             download_hash=download_hash,
@@ -447,12 +595,17 @@ class DirMonitor(_PluginBase):
                             mediainfo=mediainfo,
                             transferinfo=transferinfo
                         )
+                        if self._notify:
+                            self.post_message(
+                                mtype=NotificationType.Manual,
+                                title=f"{mediainfo.title_year}{file_meta.season_episode} 入库失败！",
+                                text=f"原因：{transferinfo.message or '未知'}",
+                                image=mediainfo.get_message_image()
+                            )
                         return
 
-                    # 转移失败
-                    logger.warn(f"{file_path.name} 入库失败：{transferinfo.message}")
-                    # 新增转移失败历史记录
-                    self.transferhis.add_fail(
+                    # 新增转移成功历史记录
+                    self.transferhis.add_success(
                         src_path=file_path,
                         mode=transfer_type,
                         download_hash=download_hash,
@@ -460,30 +613,12 @@ class DirMonitor(_PluginBase):
                         mediainfo=mediainfo,
                         transferinfo=transferinfo
                     )
-                    if self._notify:
-                        self.post_message(
-                            mtype=NotificationType.Manual,
-                            title=f"{mediainfo.title_year}{file_meta.season_episode} 入库失败！",
-                            text=f"原因：{transferinfo.message or '未知'}",
-                            image=mediainfo.get_message_image()
-                        )
-                    return
 
-                # 新增转移成功历史记录
-                self.transferhis.add_success(
-                    src_path=file_path,
-                    mode=transfer_type,
-                    download_hash=download_hash,
-                    meta=file_meta,
-                    mediainfo=mediainfo,
-                    transferinfo=transferinfo
-                )
-
-                # 刮削单个文件
-                if self._scrape:
-                    self.chain.scrape_metadata(path=transferinfo.target_path,
-                                               mediainfo=mediainfo,
-                                               transfer_type=transfer_type)
+                    # 刮削单个文件
+                    if self._scrape:
+                        self.chain.scrape_metadata(path=transferinfo.target_path,
+                                                   mediainfo=mediainfo,
+                                                   transfer_type=transfer_type)
 
                 """
                 {
@@ -501,48 +636,49 @@ class DirMonitor(_PluginBase):
                 }
                 """
                 # 发送消息汇总
-                media_list = self._medias.get(mediainfo.title_year + " " + file_meta.season) or {}
-                if media_list:
-                    media_files = media_list.get("files") or []
-                    if media_files:
-                        file_exists = False
-                        for file in media_files:
-                            if str(file_path) == file.get("path"):
-                                file_exists = True
-                                break
-                        if not file_exists:
-                            media_files.append({
-                                "path": str(file_path),
-                                "mediainfo": mediainfo,
-                                "file_meta": file_meta,
-                                "transferinfo": transferinfo
-                            })
+                with self._medias_lock:
+                    media_list = self._medias.get(mediainfo.title_year + " " + file_meta.season) or {}
+                    if media_list:
+                        media_files = media_list.get("files") or []
+                        if media_files:
+                            file_exists = False
+                            for file in media_files:
+                                if str(file_path) == file.get("path"):
+                                    file_exists = True
+                                    break
+                            if not file_exists:
+                                media_files.append({
+                                    "path": str(file_path),
+                                    "mediainfo": mediainfo,
+                                    "file_meta": file_meta,
+                                    "transferinfo": transferinfo
+                                })
+                        else:
+                            media_files = [
+                                {
+                                    "path": str(file_path),
+                                    "mediainfo": mediainfo,
+                                    "file_meta": file_meta,
+                                    "transferinfo": transferinfo
+                                }
+                            ]
+                        media_list = {
+                            "files": media_files,
+                            "time": datetime.datetime.now()
+                        }
                     else:
-                        media_files = [
-                            {
-                                "path": str(file_path),
-                                "mediainfo": mediainfo,
-                                "file_meta": file_meta,
-                                "transferinfo": transferinfo
-                            }
-                        ]
-                    media_list = {
-                        "files": media_files,
-                        "time": datetime.datetime.now()
-                    }
-                else:
-                    media_list = {
-                        "files": [
-                            {
-                                "path": str(file_path),
-                                "mediainfo": mediainfo,
-                                "file_meta": file_meta,
-                                "transferinfo": transferinfo
-                            }
-                        ],
-                        "time": datetime.datetime.now()
-                    }
-                self._medias[mediainfo.title_year + " " + file_meta.season] = media_list
+                        media_list = {
+                            "files": [
+                                {
+                                    "path": str(file_path),
+                                    "mediainfo": mediainfo,
+                                    "file_meta": file_meta,
+                                    "transferinfo": transferinfo
+                                }
+                            ],
+                            "time": datetime.datetime.now()
+                        }
+                    self._medias[mediainfo.title_year + " " + file_meta.season] = media_list
 
                 # 广播事件
                 self.eventmanager.send_event(EventType.TransferComplete, {
@@ -569,65 +705,69 @@ class DirMonitor(_PluginBase):
         """
         定时检查是否有媒体处理完，发送统一消息
         """
+        # 清理过期的识别结果
+        self._media_cache.expire()
+        self._episodes_cache.expire()
         if not self._medias or not self._medias.keys():
             return
 
         # 遍历检查是否已刮削完，发送消息
-        for medis_title_year_season in list(self._medias.keys()):
-            media_list = self._medias.get(medis_title_year_season)
-            logger.info(f"开始处理媒体 {medis_title_year_season} 消息")
+        with self._medias_lock:
+            for medis_title_year_season in list(self._medias.keys()):
+                media_list = self._medias.get(medis_title_year_season)
+                logger.info(f"开始处理媒体 {medis_title_year_season} 消息")
 
-            if not media_list:
-                continue
+                if not media_list:
+                    continue
 
-            # 获取最后更新时间
-            last_update_time = media_list.get("time")
-            media_files = media_list.get("files")
-            if not last_update_time or not media_files:
-                continue
+                # 获取最后更新时间
+                last_update_time = media_list.get("time")
+                media_files = media_list.get("files")
+                if not last_update_time or not media_files:
+                    continue
 
-            transferinfo = media_files[0].get("transferinfo")
-            file_meta = media_files[0].get("file_meta")
-            mediainfo = media_files[0].get("mediainfo")
-            # 判断剧集最后更新时间距现在是已超过10秒或者电影，发送消息
-            if (datetime.datetime.now() - last_update_time).total_seconds() > int(self._interval) \
-                    or mediainfo.type == MediaType.MOVIE:
-                # 发送通知
-                if self._notify:
-
-                    # 汇总处理文件总大小
-                    total_size = 0
-                    file_count = 0
-
-                    # 剧集汇总
-                    episodes = []
-                    for file in media_files:
-                        transferinfo = file.get("transferinfo")
-                        total_size += transferinfo.total_size
-                        file_count += 1
-
-                        file_meta = file.get("file_meta")
-                        if file_meta and file_meta.begin_episode:
-                            episodes.append(file_meta.begin_episode)
-
-                    transferinfo.total_size = total_size
-                    # 汇总处理文件数量
-                    transferinfo.file_count = file_count
-
-                    # 剧集季集信息 S01 E01-E04 || S01 E01、E02、E04
-                    season_episode = None
-                    # 处理文件多，说明是剧集，显示季入库消息
-                    if mediainfo.type == MediaType.TV:
-                        # 季集文本
-                        season_episode = f"{file_meta.season} {StringUtils.format_ep(episodes)}"
-                    # 发送消息
-                    self.transferchian.send_transfer_message(meta=file_meta,
-                                                             mediainfo=mediainfo,
-                                                             transferinfo=transferinfo,
-                                                             season_episode=season_episode)
-                # 发送完消息，移出key
-                del self._medias[medis_title_year_season]
-                continue
+                transferinfo = media_files[0].get("transferinfo")
+                file_meta = media_files[0].get("file_meta")
+                mediainfo = media_files[0].get("mediainfo")
+                # 判断剧集最后更新时间距现在是已超过10秒或者电影，发送消息
+                if (datetime.datetime.now() - last_update_time).total_seconds() > int(self._interval) \
+                        or mediainfo.type == MediaType.MOVIE:
+                    # 发送通知
+                    if self._notify:
+
+                        # 汇总处理文件总大小
+                        total_size = 0
+                        file_count = 0
+
+                        # 剧集汇总
+                        episodes = []
+                        for file in media_files:
+                            transferinfo = file.get("transferinfo")
+                            total_size += transferinfo.total_size
+                            file_count += 1
+
+                            file_meta = file.get("file_meta")
+                            if file_meta and file_meta.begin_episode:
+                                episodes.append(file_meta.begin_episode)
+
+                        transferinfo.total_size = total_size
+                        # 汇总处理文件数量
+                        transferinfo.file_count = file_count
+
+                        # 剧集季集信息 S01 E01-E04 || S01 E01、E02、E04
+                        season_episode = None
+                        # 处理文件多，说明是剧集，显示季入库消息
+                        if mediainfo.type == MediaType.TV:
+                            # 季集文本
+                            season_episode = f"{file_meta.season} {StringUtils.format_ep(episodes)}"
+                        # 发送消息
+                        self.transferchian.send_transfer_message(meta=file_meta,
+                                                                 mediainfo=mediainfo,
+                                                                 transferinfo=transferinfo,
+                                                                 season_episode=season_episode)
+                    # 发送完消息，移出key
+                    del self._medias[medis_title_year_season]
+                    continue
 
     def get_state(self) -> bool:
         return self._enabled
@@ -655,6 +795,12 @@ class DirMonitor(_PluginBase):
             "methods": ["GET"],
             "summary": "目录监控同步",
             "description": "目录监控同步",
+        }, {
+            "path": "/event_stats",
+            "endpoint": self.event_stats,
+            "methods": ["GET"],
+            "summary": "目录监控事件统计",
+            "description": "查询收到、合并及已处理的文件事件数",
         }]
 
     def get_service(self) -> List[Dict[str, Any]]:
@@ -687,6 +833,16 @@ class DirMonitor(_PluginBase):
         self.sync_all()
         return schemas.Response(success=True)
 
+    def event_stats(self, apikey: str) -> schemas.Response:
+        """
+        API调用查询事件统计
+        """
+        if apikey != settings.API_TOKEN:
+            return schemas.Response(success=False, message="API密钥错误")
+        if not self._coalescer:
+            return schemas.Response(success=False, message="目录监控未启用")
+        return schemas.Response(success=True, data=self._coalescer.stats())
+
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         return [
             {
@@ -818,7 +974,7 @@ class DirMonitor(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 4
+                                    'md': 3
                                 },
                                 'content': [
                                     {
@@ -835,7 +991,7 @@ class DirMonitor(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 4
+                                    'md': 3
                                 },
                                 'content': [
                                     {
@@ -852,7 +1008,24 @@ class DirMonitor(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 4
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'workers',
+                                            'label': '并发处理文件数',
+                                            'placeholder': '4'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
                                 },
                                 'content': [
                                     {
@@ -990,7 +1163,8 @@ class DirMonitor(_PluginBase):
             "interval": 10,
             "cron": "",
             "size": 0,
-            "scrape": True
+            "scrape": True,
+            "workers": 4
         }
 
     def get_page(self) -> List[dict]:
@@ -1008,6 +1182,14 @@ class DirMonitor(_PluginBase):
                 except Exception as e:
                     print(str(e))
         self._observer = []
+        if self._coalescer:
+            self._coalescer.stop()
+            self._coalescer = None
+        if self._pipeline:
+            self._event.set()
+            self._pipeline.shutdown()
+            self._pipeline = None
+            self._event.clear()
         if self._scheduler:
             self._scheduler.remove_all_jobs()
             if self._scheduler.running:
@@ -0,0 +1,172 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from app.log import logger
+
+# 不能合并编译的写法：编号反向引用、条件分组、命名分组（合并后编号或名称会冲突）、全局内联标志
+_UNCOMBINABLE = re.compile(r"\\\d|\(\?\(|\(\?P[<=]|\(\?[aiLmsux]+\)")
+
+
+class ExcludeMatcher:
+    """
+    将过滤关键字合并编译为一个正则表达式，一次匹配即可判断是否命中及命中的关键字，
+    含反向引用、全局标志等无法合并的关键字单独匹配
+    """
+
+    def __init__(self, keywords: Iterable[str] = None, ignorecase_keywords: Iterable[str] = None):
+        """
+        :param keywords: 区分大小写的关键字
+        :param ignorecase_keywords: 忽略大小写的关键字
+        """
+        # 参与合并匹配的 (关键字, 单独编译的正则)
+        self._patterns: List[Tuple[str, Pattern]] = []
+        # 需要单独匹配的 (关键字, 正则)
+        self._separate: List[Tuple[str, Pattern]] = []
+        parts = []
+        for keyword, flags in [(k, 0) for k in keywords or []] + [(k, re.IGNORECASE) for k in ignorecase_keywords or []]:
+            if not keyword:
+                continue
+            try:
+                pattern = re.compile(keyword, flags)
+            except re.error as e:
+                logger.warn(f"过滤关键字 {keyword} 不是有效的正则表达式：{str(e)}")
+                continue
+            if _UNCOMBINABLE.search(keyword):
+                self._separate.append((keyword, pattern))
+                continue
+            # 使用命名分组记录命中的关键字
+            group = f"(?P<k{len(self._patterns)}>{keyword})"
+            parts.append(f"(?i:{group})" if flags else group)
+            self._patterns.append((keyword, pattern))
+        self._pattern: Optional[Pattern] = None
+        if parts:
+            try:
+                self._pattern = re.compile("|".join(parts))
+            except re.error as e:
+                # 仍无法合并时全部逐个匹配
+                logger.warn(f"过滤关键字合并编译失败：{str(e)}，改为逐个匹配")
+                self._separate = self._patterns + self._separate
+                self._patterns = []
+
+    def __bool__(self) -> bool:
+        return bool(self._patterns or self._separate)
+
+    def match(self, path: str) -> Optional[str]:
+        """
+        返回命中的关键字，未命中返回None
+        """
+        if self._pattern:
+            matched = self._pattern.search(path)
+            if matched:
+                if matched.lastgroup and matched.lastgroup[1:].isdigit():
+                    return self._patterns[int(matched.lastgroup[1:])][0]
+                return matched.group(0)
+        for keyword, pattern in self._separate:
+            if pattern.search(path):
+                return keyword
+        return None
+
+
+class EventCoalescer:
+    """
+    文件事件去抖合并：同一文件在静默期内的多次事件只处理一次，到期的事件按批回调
+    """
+
+    def __init__(self, callback: Callable[[List[Tuple[str, str]]], None],
+                 delay: float = 3, max_batch: int = 500, name: str = "EventCoalescer"):
+        """
+        :param callback: 批量处理回调，参数为 [(文件路径, 监控目录)]
+        :param delay: 静默时间（秒），文件最后一次事件后超过该时间才处理
+        :param max_batch: 单批最多处理的文件数
+        """
+        self._callback = callback
+        self._delay = delay
+        self._max_batch = max_batch
+        self._cond = threading.Condition()
+        # 文件路径 -> (监控目录, 最后事件时间)
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._stopped = False
+        self._received = 0
+        self._coalesced = 0
+        self._processed = 0
+        self._thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self._thread.start()
+
+    def push(self, path: str, mon_path: str):
+        """
+        加入文件事件，已在等待中的文件重新计时
+        """
+        with self._cond:
+            self._received += 1
+            if path in self._pending:
+                self._coalesced += 1
+            self._pending[path] = (mon_path, time.monotonic())
+            self._cond.notify()
+
+    def discard(self, path: str):
+        """
+        移除等待中的文件，如临时文件已被重命名
+        """
+        with self._cond:
+            if self._pending.pop(path, None):
+                self._coalesced += 1
+
+    def __take_ready(self) -> Tuple[List[Tuple[str, str]], Optional[float]]:
+        """
+        取出已到期的文件及下次检查需等待的时间
+        """
+        now = time.monotonic()
+        ready, wait_time = [], None
+        for path, (mon_path, last_time) in list(self._pending.items()):
+            remain = last_time + self._delay - now
+            if remain <= 0:
+                ready.append((path, mon_path))
+                del self._pending[path]
+                if len(ready) >= self._max_batch:
+                    wait_time = 0
+                    break
+            elif wait_time is None or remain < wait_time:
+                wait_time = remain
+        return ready, wait_time
+
+    def __run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    ready, wait_time = self.__take_ready()
+                    if ready:
+                        break
+                    self._cond.wait(timeout=wait_time)
+            try:
+                self._callback(ready)
+            except Exception as e:
+                logger.error(f"批量处理文件事件出错：{str(e)}")
+            with self._cond:
+                self._processed += len(ready)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        事件计数：收到、合并、已处理、等待中
+        """
+        with self._cond:
+            return {
+                "received": self._received,
+                "coalesced": self._coalesced,
+                "processed": self._processed,
+                "pending": len(self._pending)
+            }
+
+    def stop(self):
+        """
+        停止处理，丢弃等待中的事件
+        """
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=10)
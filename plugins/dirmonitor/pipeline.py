@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.log import logger
+
+
+class KeyedLock:
+    """
+    按键加锁，不同键之间互不阻塞，无人使用的锁自动回收
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 键 -> [锁, 引用计数]
+        self._locks: Dict[Hashable, list] = {}
+
+    @contextmanager
+    def lock(self, key: Hashable):
+        with self._lock:
+            item = self._locks.setdefault(key, [threading.Lock(), 0])
+            item[1] += 1
+        try:
+            with item[0]:
+                yield
+        finally:
+            with self._lock:
+                item[1] -= 1
+                if item[1] <= 0:
+                    self._locks.pop(key, None)
+
+
+class SharedResultCache:
+    """
+    有效期内共享的查询结果缓存，同一键同时只查询一次，其它线程等待并复用结果
+    """
+
+    def __init__(self, ttl: float = 600):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._keyed_lock = KeyedLock()
+        # 键 -> (缓存时间, 结果)
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def __get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            item = self._results.get(key)
+            if item and time.time() - item[0] < self._ttl:
+                return True, item[1]
+            return False, None
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        获取缓存结果，不存在时调用 loader 查询，查询结果为空时不缓存
+        """
+        found, value = self.__get(key)
+        if found:
+            return value
+        with self._keyed_lock.lock(key):
+            # 等待期间其它线程可能已查询完成
+            found, value = self.__get(key)
+            if found:
+                return value
+            value = loader()
+            if value:
+                with self._lock:
+                    self._results[key] = (time.time(), value)
+            return value
+
+    def expire(self):
+        """
+        清理过期的结果
+        """
+        now = time.time()
+        with self._lock:
+            for key in [key for key, item in self._results.items() if now - item[0] >= self._ttl]:
+                del self._results[key]
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+class FilePipeline:
+    """
+    文件处理线程池，同一文件排队期间不重复提交
+    """
+
+    def __init__(self, handler: Callable[[str, str], Any], workers: int = 4):
+        self._handler = handler
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="DirMonitor")
+
+    def __run(self, event_path: str, mon_path: str):
+        with self._lock:
+            self._pending.pop(event_path, None)
+        return self._handler(event_path, mon_path)
+
+    def submit(self, event_path: str, mon_path: str) -> Optional[Future]:
+        """
+        提交文件，文件已在队列中等待处理时直接返回原任务
+        """
+        with self._lock:
+            future = self._pending.get(event_path)
+            if future and not future.done():
+                return future
+            try:
+                future = self._executor.submit(self.__run, event_path, mon_path)
+            except RuntimeError as e:
+                # 线程池已关闭
+                logger.debug(f"提交文件处理任务失败：{str(e)}")
+                return None
+            self._pending[event_path] = future
+            return future
+
+    @staticmethod
+    def wait(futures: List[Optional[Future]]):
+        """
+        等待一批任务完成
+        """
+        futures = [future for future in futures if future]
+        if futures:
+            wait(futures)
+
+    def shutdown(self):
+        """
+        取消排队中的任务并等待执行中的任务结束
+        """
+        with self._lock:
+            self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,4 @@
 import datetime
-import re
 import threading
 import traceback
 from pathlib import Path
@@ -17,6 +16,8 @@ from app.core.config import settings
 from app.core.event import eventmanager, Event
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.linkmonitor.bulk_link import BulkLinker, LinkCheckpoint
+from app.plugins.linkmonitor.event_filter import EventCoalescer, ExcludeMatcher
 from app.schemas import NotificationType
 from app.schemas.types import EventType
 from app.utils.system import SystemUtils
@@ -51,7 +52,7 @@ class LinkMonitor(_PluginBase):
     # 插件图标
     plugin_icon = "Linkace_C.png"
     # 插件版本
-    plugin_version = "1.6"
+    plugin_version = "1.10"
     # 插件作者
     plugin_author = "jxxghp"
     # 作者主页
@@ -81,6 +82,16 @@ class LinkMonitor(_PluginBase):
     _dirconf: Dict[str, Optional[Path]] = {}
     # 存储源目录转移方式
     _transferconf: Dict[str, Optional[str]] = {}
+    # 文件事件去抖合并
+    _coalescer: Optional[EventCoalescer] = None
+    # 文件最后一次事件后等待的时间（秒）
+    _debounce: float = 3
+    # 过滤关键字
+    _exclude_matcher: Optional[ExcludeMatcher] = None
+    # 全量同步并发数
+    _bulk_workers: int = 8
+    # 同一设备上同时进行的链接数
+    _per_device: int = 4
     # 退出事件
     _event = threading.Event()
 
@@ -99,11 +110,22 @@ class LinkMonitor(_PluginBase):
             self._exclude_keywords = config.get("exclude_keywords") or ""
             self._cron = config.get("cron")
             self._size = config.get("size") or 0
+            try:
+                self._bulk_workers = max(int(config.get("bulk_workers") or 8), 1)
+            except ValueError:
+                self._bulk_workers = 8
 
         # 停止现有任务
         self.stop_service()
 
+        # 编译过滤关键字
+        self._exclude_matcher = ExcludeMatcher(keywords=self._exclude_keywords.split("\n"))
+
         if self._enabled or self._onlyonce:
+            # 文件事件去抖合并
+            if self._enabled:
+                self._coalescer = EventCoalescer(callback=self.__handle_events, delay=self._debounce,
+                                                 name="LinkMonitor-Events")
 
             # 读取目录配置
             monitor_dirs = self._monitor_dirs.split("\n")
@@ -203,7 +225,8 @@ class LinkMonitor(_PluginBase):
             "monitor_dirs": self._monitor_dirs,
             "exclude_keywords": self._exclude_keywords,
             "cron": self._cron,
-            "size": self._size
+            "size": self._size,
+            "bulk_workers": self._bulk_workers
         })
 
     @eventmanager.register(EventType.PluginAction)
@@ -229,12 +252,76 @@ class LinkMonitor(_PluginBase):
         """
         logger.info("开始全量实时硬链接 ...")
         # 遍历所有监控目录
-        for mon_path in self._dirconf.keys():
-            # 遍历目录下所有文件
-            for file_path in SystemUtils.list_files(Path(mon_path), ['.*']):
-                self.__handle_file(event_path=str(file_path), mon_path=mon_path)
+        for mon_path, target in self._dirconf.items():
+            if self._event.is_set():
+                logger.info("全量实时硬链接已停止")
+                return
+            if not target:
+                continue
+            try:
+                self.__bulk_link(mon_path=mon_path, target=target)
+            except Exception as e:
+                logger.error(f"{mon_path} 全量硬链接出错：{str(e)} - {traceback.format_exc()}")
         logger.info("全量实时硬链接完成！")
 
+    def __bulk_link(self, mon_path: str, target: Path):
+        """
+        批量硬链接一个监控目录：生成计划、创建目录、并发链接，支持断点续传
+        """
+        # 遍历目录下所有文件
+        files = []
+        # 无法判断转移方式的文件数，如扫描后被重命名或删除的临时文件
+        check_failed = 0
+        for file_path in SystemUtils.list_files(Path(mon_path), ['.*']):
+            try:
+                transfer_type = self.__get_transfer_type(event_path=str(file_path), file_path=file_path)
+            except Exception as e:
+                check_failed += 1
+                logger.warn(f"{file_path} 检查失败，跳过：{str(e)}")
+                continue
+            if transfer_type:
+                files.append((file_path, transfer_type))
+        checkpoint = LinkCheckpoint(checkpoint_dir=self.get_data_path(), mon_path=mon_path, target=target)
+        if len(checkpoint):
+            logger.info(f"{mon_path} 从上次中断处继续，已完成 {len(checkpoint)} 个文件")
+        # 生成计划
+        tasks, skipped = BulkLinker.plan(mon_path=mon_path, target=target, files=files, checkpoint=checkpoint)
+        logger.info(f"{mon_path} 共 {len(files)} 个文件，跳过 {skipped} 个，待处理 {len(tasks)} 个，"
+                    f"检查失败 {check_failed} 个")
+        if not tasks:
+            checkpoint.clear()
+            if self._notify and check_failed:
+                self.post_message(
+                    mtype=NotificationType.Manual,
+                    title=f"{mon_path} 全量硬链接完成！",
+                    text=f"目标目录：{target}\n成功：0 个，失败：{check_failed} 个"
+                )
+            return
+        # 一次性创建目标目录
+        BulkLinker.make_dirs(tasks)
+
+        def __on_done(task, state: bool, errmsg: str):
+            if state:
+                logger.debug(f"{task[0].name} 硬链接成功")
+            else:
+                logger.warn(f"{task[0].name} 硬链接失败：{errmsg}")
+
+        # 并发链接
+        linker = BulkLinker(workers=self._bulk_workers, per_device=self._per_device)
+        success, failed = linker.execute(tasks=tasks, stop_event=self._event,
+                                         checkpoint=checkpoint, on_done=__on_done)
+        failed += check_failed
+        logger.info(f"{mon_path} 全量硬链接完成，成功 {success} 个，失败 {failed} 个")
+        # 全部完成后清除断点，否则下次从断点继续
+        if not failed and not self._event.is_set():
+            checkpoint.clear()
+        if self._notify and (success or failed):
+            self.post_message(
+                mtype=NotificationType.Manual,
+                title=f"{mon_path} 全量硬链接完成！",
+                text=f"目标目录：{target}\n成功：{success} 个，失败：{failed} 个"
+            )
+
     def event_handler(self, event, mon_path: str, text: str, event_path: str):
         """
         处理文件变化
@@ -246,7 +333,25 @@ class LinkMonitor(_PluginBase):
         if not event.is_directory:
             # 文件发生变化
             logger.debug("文件%s：%s" % (text, event_path))
+            if not self._coalescer:
+                self.__handle_file(event_path=event_path, mon_path=mon_path)
+                return
+            # 文件被重命名时，原路径无需再处理
+            if event.event_type == "moved":
+                self._coalescer.discard(event.src_path)
+            self._coalescer.push(event_path, mon_path)
+
+    def __handle_events(self, events: List[Tuple[str, str]]):
+        """
+        批量处理去抖后的文件事件
+        :param events: [(文件路径, 监控目录)]
+        """
+        for event_path, mon_path in events:
+            if self._event.is_set():
+                return
             self.__handle_file(event_path=event_path, mon_path=mon_path)
+        if self._coalescer:
+            logger.debug(f"实时硬链接事件统计：{self._coalescer.stats()}")
 
     @staticmethod
     def _link_file(src_path: Path, mon_path: str,
@@ -277,6 +382,31 @@ class LinkMonitor(_PluginBase):
                 code, errmsg = SystemUtils.link(src_path, new_path)
             return True if code == 0 else False, errmsg
 
+    def __get_transfer_type(self, event_path: str, file_path: Path) -> Optional[str]:
+        """
+        检查文件是否需要处理，返回转移方式，不处理时返回None
+        """
+        # 回收站及隐藏的文件不处理
+        if event_path.find('/@Recycle/') != -1 \
+                or event_path.find('/#recycle/') != -1 \
+                or event_path.find('/.') != -1 \
+                or event_path.find('/@eaDir') != -1:
+            logger.debug(f"{event_path} 是回收站或隐藏的文件")
+            return None
+
+        # 命中过滤关键字不处理
+        if self._exclude_matcher:
+            keyword = self._exclude_matcher.match(event_path)
+            if keyword:
+                logger.info(f"{event_path} 命中过滤关键字 {keyword}，不处理")
+                return None
+
+        # 判断文件大小
+        if self._size and float(self._size) > 0 and file_path.stat().st_size < float(self._size) * 1024:
+            logger.info(f"{event_path} 文件大小小于最小文件大小，复制...")
+            return "copy"
+        return "link"
+
     def __handle_file(self, event_path: str, mon_path: str):
         """
         同步一个文件
@@ -290,28 +420,11 @@ class LinkMonitor(_PluginBase):
             # 全程加锁
             with lock:
 
-                # 回收站及隐藏的文件不处理
-                if event_path.find('/@Recycle/') != -1 \
-                        or event_path.find('/#recycle/') != -1 \
-                        or event_path.find('/.') != -1 \
-                        or event_path.find('/@eaDir') != -1:
-                    logger.debug(f"{event_path} 是回收站或隐藏的文件")
+                # 判断是否处理及转移方式
+                _transfer_type = self.__get_transfer_type(event_path=event_path, file_path=file_path)
+                if not _transfer_type:
                     return
 
-                # 命中过滤关键字不处理
-                if self._exclude_keywords:
-                    for keyword in self._exclude_keywords.split("\n"):
-                        if keyword and re.findall(keyword, event_path):
-                            logger.info(f"{event_path} 命中过滤关键字 {keyword}，不处理")
-                            return
-
-                # 判断文件大小
-                if self._size and float(self._size) > 0 and file_path.stat().st_size < float(self._size) * 1024:
-                    logger.info(f"{event_path} 文件大小小于最小文件大小，复制...")
-                    _transfer_type = "copy"
-                else:
-                    _transfer_type = "link"
-
                 # 查询转移目的目录
                 target: Path = self._dirconf.get(mon_path)
                 if not target:
@@ -371,6 +484,12 @@ class LinkMonitor(_PluginBase):
             "methods": ["GET"],
             "summary": "实时硬链接",
             "description": "实时硬链接",
+        }, {
+            "path": "/event_stats",
+            "endpoint": self.event_stats,
+            "methods": ["GET"],
+            "summary": "实时硬链接事件统计",
+            "description": "查询收到、合并及已处理的文件事件数",
         }]
 
     def get_service(self) -> List[Dict[str, Any]]:
@@ -402,6 +521,16 @@ class LinkMonitor(_PluginBase):
         self.sync_all()
         return schemas.Response(success=True)
 
+    def event_stats(self, apikey: str) -> schemas.Response:
+        """
+        API调用查询事件统计
+        """
+        if apikey != settings.API_TOKEN:
+            return schemas.Response(success=False, message="API密钥错误")
+        if not self._coalescer:
+            return schemas.Response(success=False, message="实时硬链接未启用")
+        return schemas.Response(success=True, data=self._coalescer.stats())
+
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         return [
             {
@@ -516,6 +645,23 @@ class LinkMonitor(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'bulk_workers',
+                                            'label': '全量同步并发数',
+                                            'placeholder': '8'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -596,7 +742,8 @@ class LinkMonitor(_PluginBase):
             "monitor_dirs": "",
             "exclude_keywords": "",
             "cron": "",
-            "size": ""
+            "size": "",
+            "bulk_workers": 8
         }
 
     def get_page(self) -> List[dict]:
@@ -614,6 +761,9 @@ class LinkMonitor(_PluginBase):
                 except Exception as e:
                     print(str(e))
         self._observer = []
+        if self._coalescer:
+            self._coalescer.stop()
+            self._coalescer = None
         if self._scheduler:
             self._scheduler.remove_all_jobs()
             if self._scheduler.running:
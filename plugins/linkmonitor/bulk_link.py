@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.log import logger
+from app.utils.system import SystemUtils
+
+# (源文件, 目标文件, 转移方式)
+LinkTask = Tuple[Path, Path, str]
+
+
+def list_existing_files(root: Path) -> Set[str]:
+    """
+    使用 os.scandir 一次性列出目标目录下已存在的文件，代替逐个文件判断是否存在
+    """
+    existing = set()
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            existing.add(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return existing
+
+
+class LinkCheckpoint:
+    """
+    全量硬链接进度断点，中断后再次运行时跳过已完成的文件
+    """
+
+    def __init__(self, checkpoint_dir: Path, mon_path: str, target: Path, save_every: int = 1000):
+        self._key = f"{mon_path}:{target}"
+        # 每个监控目录单独保存进度
+        self._checkpoint_file = checkpoint_dir / f"sync_{hashlib.md5(self._key.encode()).hexdigest()}.json"
+        self._save_every = save_every
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+        self._unsaved = 0
+        self.__load()
+
+    def __load(self):
+        if not self._checkpoint_file.exists():
+            return
+        try:
+            data = json.loads(self._checkpoint_file.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warn(f"读取硬链接进度失败：{str(e)}")
+            return
+        if data.get("key") == self._key:
+            self._done = set(data.get("done") or [])
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def __contains__(self, src: str) -> bool:
+        return src in self._done
+
+    def mark(self, src: str):
+        """
+        记录已完成的文件，每完成一定数量保存一次
+        """
+        with self._lock:
+            self._done.add(src)
+            self._unsaved += 1
+            if self._unsaved >= self._save_every:
+                self.__save()
+
+    def __save(self):
+        try:
+            self._checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._checkpoint_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps({"key": self._key, "done": list(self._done)},
+                                           ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_file, self._checkpoint_file)
+            self._unsaved = 0
+        except Exception as e:
+            logger.warn(f"保存硬链接进度失败：{str(e)}")
+
+    def save(self):
+        with self._lock:
+            if self._unsaved:
+                self.__save()
+
+    def clear(self):
+        """
+        全部完成后删除断点
+        """
+        with self._lock:
+            self._done.clear()
+            self._unsaved = 0
+            try:
+                self._checkpoint_file.unlink(missing_ok=True)
+            except Exception as e:
+                logger.warn(f"删除硬链接进度失败：{str(e)}")
+
+
+class BulkLinker:
+    """
+    全量硬链接：先生成目标文件计划并一次性创建目录，再由线程池按设备限制并发执行链接或复制
+    """
+
+    def __init__(self, workers: int = 8, per_device: int = 4):
+        self._workers = max(workers, 1)
+        self._per_device = max(per_device, 1)
+        self._device_lock = threading.Lock()
+        self._device_semaphores: Dict[int, threading.Semaphore] = {}
+
+    @staticmethod
+    def plan(mon_path: str, target: Path, files: Iterable[Tuple[Path, str]],
+             checkpoint: Optional[LinkCheckpoint] = None) -> Tuple[List[LinkTask], int]:
+        """
+        生成链接计划，排除目标已存在及断点中已完成的文件
+        :param files: [(源文件, 转移方式)]
+        :return: (待处理任务, 跳过的文件数)
+        """
+        existing = list_existing_files(target)
+        tasks, skipped = [], 0
+        for src_path, transfer_type in files:
+            if checkpoint is not None and str(src_path) in checkpoint:
+                skipped += 1
+                continue
+            try:
+                rel_path = src_path.relative_to(Path(mon_path))
+            except ValueError:
+                continue
+            new_path = target / rel_path
+            if str(new_path) in existing:
+                skipped += 1
+                continue
+            tasks.append((src_path, new_path, transfer_type))
+        return tasks, skipped
+
+    @staticmethod
+    def make_dirs(tasks: List[LinkTask]) -> int:
+        """
+        一次性创建计划中所有目标目录
+        """
+        dirs = sorted({str(new_path.parent) for _, new_path, _ in tasks})
+        created = 0
+        for dir_path in dirs:
+            try:
+                os.makedirs(dir_path, exist_ok=True)
+                created += 1
+            except OSError as e:
+                logger.error(f"创建目录 {dir_path} 失败：{str(e)}")
+        return created
+
+    def __device_semaphore(self, path: Path) -> threading.Semaphore:
+        try:
+            device = os.stat(path).st_dev
+        except OSError:
+            device = -1
+        with self._device_lock:
+            semaphore = self._device_semaphores.get(device)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self._per_device)
+                self._device_semaphores[device] = semaphore
+            return semaphore
+
+    def __execute_one(self, task: LinkTask, stop_event: threading.Event,
+                      checkpoint: Optional[LinkCheckpoint]) -> Tuple[LinkTask, bool, str]:
+        src_path, new_path, transfer_type = task
+        if stop_event.is_set():
+            return task, False, "任务已停止"
+        with self.__device_semaphore(src_path):
+            try:
+                if transfer_type == "copy":
+                    code, errmsg = SystemUtils.copy(src_path, new_path)
+                else:
+                    code, errmsg = SystemUtils.link(src_path, new_path)
+            except Exception as e:
+                code, errmsg = 1, str(e)
+        if code == 0 and checkpoint is not None:
+            checkpoint.mark(str(src_path))
+        return task, code == 0, errmsg
+
+    def execute(self, tasks: List[LinkTask], stop_event: threading.Event,
+                checkpoint: Optional[LinkCheckpoint] = None,
+                on_done: Callable[[LinkTask, bool, str], None] = None) -> Tuple[int, int]:
+        """
+        并发执行链接计划
+        :return: (成功数, 失败数)
+        """
+        success, failed = 0, 0
+        if not tasks:
+            return success, failed
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="LinkMonitor-Bulk") as executor:
+            for task, state, errmsg in executor.map(
+                    lambda t: self.__execute_one(t, stop_event, checkpoint), tasks):
+                if state:
+                    success += 1
+                else:
+                    failed += 1
+                if on_done:
+                    on_done(task, state, errmsg)
+        if checkpoint is not None:
+            checkpoint.save()
+        return success, failed
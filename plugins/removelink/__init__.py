@@ -3,13 +3,14 @@ import threading
 import time
 import traceback
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 from app.db.transferhistory_oper import TransferHistoryOper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.removelink.inode_index import InodeIndex, DirectoryScanner, IndexSnapshot
 from app.schemas import NotificationType
 from app.core.event import eventmanager
 from app.schemas.types import EventType
@@ -42,13 +43,16 @@ class FileMonitorHandler(FileSystemEventHandler):
         # 新增文件记录
         with state_lock:
             try:
-                self.sync.state_set[str(file_path)] = file_path.stat().st_ino
+                self.sync.state_index.add_file(str(file_path))
             except Exception as e:
                 logger.error(f"新增文件记录失败：{str(e)}")
 
     def on_moved(self, event):
         if event.is_directory:
             return
+        # 移除原路径记录
+        with state_lock:
+            self.sync.state_index.remove(str(event.src_path))
         file_path = Path(event.dest_path)
         if file_path.suffix in [".!qB", ".part", ".mp"]:
             return
@@ -60,7 +64,10 @@ class FileMonitorHandler(FileSystemEventHandler):
                     return
         # 新增文件记录
         with state_lock:
-            self.sync.state_set[str(file_path)] = file_path.stat().st_ino
+            try:
+                self.sync.state_index.add_file(str(file_path))
+            except Exception as e:
+                logger.error(f"新增文件记录失败：{str(e)}")
 
     def on_deleted(self, event):
         file_path = Path(event.src_path)
@@ -86,28 +93,27 @@ class FileMonitorHandler(FileSystemEventHandler):
         self.sync.handle_deleted(file_path)
 
 
-def updateState(monitor_dirs: List[str]):
+def updateState(monitor_dirs: List[str], snapshot: Optional[IndexSnapshot] = None) -> InodeIndex:
     """
     更新监控目录的文件列表
     """
     # 记录开始时间
     start_time = time.time()
-    state_set = {}
-    for mon_path in monitor_dirs:
-        for root, dirs, files in os.walk(mon_path):
-            for file in files:
-                file = Path(root) / file
-                if not file.exists():
-                    continue
-                # 记录文件inode
-                state_set[str(file)] = file.stat().st_ino
+    monitor_dirs = [mon_path for mon_path in monitor_dirs if mon_path]
+    # 读取快照，未变化的目录不再重新扫描文件
+    snapshot_dirs = snapshot.load(monitor_dirs) if snapshot else {}
+    dirs, entries = DirectoryScanner().scan(monitor_dirs, snapshot_dirs)
+    if snapshot:
+        snapshot.save(monitor_dirs, dirs)
+    state_index = InodeIndex()
+    state_index.update(entries)
     # 记录结束时间
     end_time = time.time()
     # 计算耗时
     elapsed_time = end_time - start_time
-    logger.info(f"更新文件列表完成，共计{len(state_set)}个文件，耗时：{elapsed_time}秒")
+    logger.info(f"更新文件列表完成，共计{len(state_index)}个文件，耗时：{elapsed_time}秒")
 
-    return state_set
+    return state_index
 
 
 class RemoveLink(_PluginBase):
@@ -118,7 +124,7 @@ class RemoveLink(_PluginBase):
     # 插件图标
     plugin_icon = "Ombi_A.png"
     # 插件版本
-    plugin_version = "2.2"
+    plugin_version = "2.3"
     # 插件作者
     plugin_author = "DzAvril"
     # 作者主页
@@ -139,9 +145,10 @@ class RemoveLink(_PluginBase):
     _delete_scrap_infos = False
     _delete_torrents = False
     _delete_history = False
+    _snapshot = False
     _observer = []
     # 监控目录的文件列表
-    state_set: Dict[str, int] = {}
+    state_index: InodeIndex = InodeIndex()
 
     def init_plugin(self, config: dict = None):
         logger.info(f"Hello, RemoveLink! config {config}")
@@ -154,6 +161,7 @@ class RemoveLink(_PluginBase):
             self._delete_scrap_infos = config.get("delete_scrap_infos")
             self._delete_torrents = config.get("delete_torrents")
             self._delete_history = config.get("delete_history")
+            self._snapshot = config.get("snapshot")
 
         # 停止现有任务
         self.stop_service()
@@ -182,8 +190,11 @@ class RemoveLink(_PluginBase):
                     logger.error(f"{mon_path} 启动目录监控失败：{err_msg}")
                     self.systemmessage.put(f"{mon_path} 启动目录监控失败：{err_msg}", title="清理硬链接")
             # 更新监控集合
+            snapshot = IndexSnapshot(self.get_data_path() / "state_snapshot.json")
+            if not self._snapshot:
+                snapshot.clear()
             with state_lock:
-                self.state_set = updateState(monitor_dirs)
+                self.state_index = updateState(monitor_dirs, snapshot if self._snapshot else None)
 
     def __update_config(self):
         """
@@ -242,6 +253,21 @@ class RemoveLink(_PluginBase):
                                     }
                                 ],
                             },
+                            {
+                                "component": "VCol",
+                                "props": {"cols": 12, "md": 4},
+                                "content": [
+                                    {
+                                        "component": "VSwitch",
+                                        "props": {
+                                            "model": "snapshot",
+                                            "label": "保存文件列表快照",
+                                            "hint": "重启时只重新扫描有变化的目录",
+                                            "persistent-hint": True,
+                                        },
+                                    }
+                                ],
+                            },
                         ],
                     },
                     {
@@ -410,6 +436,7 @@ class RemoveLink(_PluginBase):
             "notify": False,
             "monitor_dirs": "",
             "exclude_keywords": "",
+            "snapshot": False,
         }
 
     def get_page(self) -> List[dict]:
@@ -556,39 +583,37 @@ class RemoveLink(_PluginBase):
             # 删除历史记录
             self.delete_history(str(file_path))
             # 删除的文件inode
-            deleted_inode = self.state_set.get(str(file_path))
+            deleted_inode = self.state_index.remove(str(file_path))
             if not deleted_inode:
                 logger.info(f"文件 {file_path} 未在监控列表中，不处理")
                 return
-            else:
-                self.state_set.pop(str(file_path))
             try:
-                # 在current_set中查找与deleted_inode有相同inode的文件并删除
-                for path, inode in self.state_set.copy().items():
-                    if inode == deleted_inode:
-                        file = Path(path)
-                        if self.__is_excluded(file):
-                            logger.info(f"文件 {file} 在不删除目录中，不处理")
-                            continue
-                        # 删除硬链接文件
-                        logger.info(f"删除硬链接文件：{path}， inode: {inode}")
-                        file.unlink()
-                        # 清理刮削文件
-                        self.delete_scrap_infos(file_path)
-                        if self._delete_torrents:
-                            # 发送事件
-                            eventmanager.send_event(
-                                EventType.DownloadFileDeleted, {"src": str(file_path)}
-                            )
-                        # 删除历史记录
-                        self.delete_history(str(file_path))
-                        if self._notify:
-                            self.post_message(
-                                mtype=NotificationType.SiteMessage,
-                                title=f"【清理硬链接】",
-                                text=f"监控到删除源文件：[{file_path}]\n"
-                                     f"同步删除硬链接文件：[{path}]",
-                            )
+                # 通过inode索引查找与删除文件硬链接的文件并删除
+                for path in self.state_index.links(deleted_inode):
+                    file = Path(path)
+                    if self.__is_excluded(file):
+                        logger.info(f"文件 {file} 在不删除目录中，不处理")
+                        continue
+                    # 删除硬链接文件
+                    logger.info(f"删除硬链接文件：{path}， inode: {deleted_inode[1]}")
+                    file.unlink()
+                    self.state_index.remove(path)
+                    # 清理刮削文件
+                    self.delete_scrap_infos(file_path)
+                    if self._delete_torrents:
+                        # 发送事件
+                        eventmanager.send_event(
+                            EventType.DownloadFileDeleted, {"src": str(file_path)}
+                        )
+                    # 删除历史记录
+                    self.delete_history(str(file_path))
+                    if self._notify:
+                        self.post_message(
+                            mtype=NotificationType.SiteMessage,
+                            title=f"【清理硬链接】",
+                            text=f"监控到删除源文件：[{file_path}]\n"
+                                 f"同步删除硬链接文件：[{path}]",
+                        )
             except Exception as e:
                 logger.error(
                     "删除硬链接文件发生错误：%s - %s" % (str(e), traceback.format_exc())
@@ -0,0 +1,183 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.log import logger
+
+# 文件标识 (st_dev, st_ino)，硬链接只存在于同一设备内
+FileId = Tuple[int, int]
+
+
+class InodeIndex:
+    """
+    监控目录文件索引，维护 路径 -> inode 及 inode -> 路径集合 两个映射，
+    删除文件时可直接找到与其硬链接的其它文件
+    """
+
+    def __init__(self):
+        self._path_ids: Dict[str, FileId] = {}
+        self._id_paths: Dict[FileId, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._path_ids)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._path_ids
+
+    def add(self, path: str, file_id: FileId):
+        """
+        新增或更新文件记录
+        """
+        self.remove(path)
+        self._path_ids[path] = file_id
+        self._id_paths.setdefault(file_id, set()).add(path)
+
+    def add_file(self, path: str):
+        """
+        读取文件inode并新增记录
+        """
+        stat = os.stat(path)
+        self.add(path, (stat.st_dev, stat.st_ino))
+
+    def remove(self, path: str) -> Optional[FileId]:
+        """
+        删除文件记录，返回其inode
+        """
+        file_id = self._path_ids.pop(path, None)
+        if file_id is None:
+            return None
+        paths = self._id_paths.get(file_id)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self._id_paths[file_id]
+        return file_id
+
+    def links(self, file_id: FileId) -> List[str]:
+        """
+        与指定inode硬链接的所有文件
+        """
+        return list(self._id_paths.get(file_id, ()))
+
+    def update(self, entries: Dict[str, FileId]):
+        for path, file_id in entries.items():
+            self.add(path, file_id)
+
+
+class DirectoryScanner:
+    """
+    使用 os.scandir 并行扫描监控目录，按目录修改时间复用快照中未变化目录的文件记录
+    """
+
+    def __init__(self, workers: int = 8):
+        self._workers = max(workers, 1)
+
+    @staticmethod
+    def __scan_dir(path: str, snapshot: Optional[dict]) -> Tuple[str, Optional[dict], bool]:
+        """
+        扫描单个目录
+        :return: (目录, 目录信息, 是否复用快照)
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return path, None, False
+        # 目录内容未变化时直接复用快照
+        if snapshot and snapshot.get("mtime") == mtime:
+            return path, snapshot, True
+        subdirs, files = [], {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[entry.name] = [stat.st_dev, stat.st_ino]
+                    except OSError:
+                        continue
+        except OSError:
+            return path, None, False
+        return path, {"mtime": mtime, "subdirs": subdirs, "files": files}, False
+
+    def scan(self, monitor_dirs: List[str], snapshot: Optional[Dict[str, dict]] = None) \
+            -> Tuple[Dict[str, dict], Dict[str, FileId]]:
+        """
+        扫描监控目录
+        :param monitor_dirs: 监控目录
+        :param snapshot: 上次扫描的目录信息
+        :return: (目录信息, 文件路径 -> inode)
+        """
+        snapshot = snapshot or {}
+        dirs: Dict[str, dict] = {}
+        entries: Dict[str, FileId] = {}
+        reused = 0
+        pending = [str(Path(mon_path)) for mon_path in monitor_dirs if mon_path]
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="RemoveLink-Scan") as executor:
+            # 按层并行扫描，每层的子目录作为下一层的任务
+            while pending:
+                next_pending = []
+                for path, info, from_snapshot in executor.map(
+                        lambda p: self.__scan_dir(p, snapshot.get(p)), pending):
+                    if info is None or path in dirs:
+                        continue
+                    dirs[path] = info
+                    if from_snapshot:
+                        reused += 1
+                    for name, file_id in info.get("files", {}).items():
+                        entries[os.path.join(path, name)] = (file_id[0], file_id[1])
+                    next_pending.extend(os.path.join(path, name) for name in info.get("subdirs", []))
+                pending = next_pending
+        if reused:
+            logger.info(f"复用快照目录 {reused} 个，重新扫描目录 {len(dirs) - reused} 个")
+        return dirs, entries
+
+
+class IndexSnapshot:
+    """
+    目录扫描结果的磁盘快照，插件重启时只需重新扫描有变化的目录
+    """
+
+    def __init__(self, snapshot_file: Path):
+        self._snapshot_file = snapshot_file
+
+    def load(self, monitor_dirs: List[str]) -> Dict[str, dict]:
+        """
+        读取快照，监控目录发生变化时快照失效
+        """
+        if not self._snapshot_file.exists():
+            return {}
+        try:
+            data = json.loads(self._snapshot_file.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warn(f"读取文件列表快照失败：{str(e)}")
+            return {}
+        if data.get("monitor_dirs") != sorted(monitor_dirs):
+            return {}
+        return data.get("dirs") or {}
+
+    def save(self, monitor_dirs: List[str], dirs: Dict[str, dict]):
+        """
+        原子写入快照
+        """
+        try:
+            self._snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._snapshot_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps({
+                "monitor_dirs": sorted(monitor_dirs),
+                "saved_at": time.time(),
+                "dirs": dirs
+            }, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_file, self._snapshot_file)
+        except Exception as e:
+            logger.warn(f"保存文件列表快照失败：{str(e)}")
+
+    def clear(self):
+        try:
+            self._snapshot_file.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warn(f"删除文件列表快照失败：{str(e)}")